@@ -0,0 +1,273 @@
+"""Load-test harness for the Lazy God API.
+
+Simulated players drive the API concurrently: each one starts a run, then
+loops ``next`` → ``decision`` (or ``decisions`` for multi-event turns) until
+the run ends, and starts another until its run budget is spent.  By default
+the players talk to ``backend.main:app`` in-process through httpx's ASGI
+transport, which measures one worker's capacity without any network in the
+way; ``--base-url`` points them at a running server instead::
+
+    python -m backend.loadtest --players 50 --runs 4
+    python -m backend.loadtest --players 200 --base-url http://127.0.0.1:8000
+
+The report lists throughput, per-route latency percentiles, error codes and
+(in-process) the resident memory sampled while the test ran.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from core.memory import rss_mb
+from core.policies import DECISION_ORDER, POLICY_WEIGHTS
+
+CHOICES = tuple(decision.value for decision in DECISION_ORDER)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (which must be sorted)."""
+
+    if not samples:
+        return 0.0
+    rank = max(1, min(len(samples), round(pct / 100.0 * len(samples) + 0.5)))
+    return samples[rank - 1]
+
+
+@dataclass
+class LoadReport:
+    """Everything measured during one load test."""
+
+    players: int
+    duration: float = 0.0
+    runs_finished: int = 0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Counter = field(default_factory=Counter)
+    memory: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    def record(self, route: str, seconds: float, response: httpx.Response) -> None:
+        self.latencies[route].append(seconds)
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", "")
+            except ValueError:
+                detail = ""
+            self.errors[f"{route} {response.status_code} {detail}".rstrip()] += 1
+
+    def summary(self) -> dict:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            routes[route] = {
+                "count": len(ordered),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            }
+        total = self.requests
+        return {
+            "players": self.players,
+            "duration_s": round(self.duration, 3),
+            "requests": total,
+            "throughput_rps": round(total / self.duration, 1) if self.duration else 0.0,
+            "runs_finished": self.runs_finished,
+            "routes": routes,
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            "errors": dict(self.errors),
+            "memory_mb": [(round(at, 2), round(rss, 1)) for at, rss in self.memory],
+        }
+
+
+async def _timed(client: httpx.AsyncClient, report: LoadReport, route: str, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    report.record(route, time.perf_counter() - started, response)
+    return response
+
+
+async def play(
+    client: httpx.AsyncClient,
+    report: LoadReport,
+    rng: random.Random,
+    policy: str,
+    runs: int,
+    start_body: dict,
+    think_time: float = 0.0,
+) -> None:
+    """Play ``runs`` complete runs as one simulated player."""
+
+    weights = POLICY_WEIGHTS[policy]
+    for _ in range(runs):
+        response = await _timed(client, report, "POST /runs/start", "POST", "/runs/start", json=start_body)
+        if response.status_code != 200:
+            return
+        run_id = response.json()["run_id"]
+        while True:
+            response = await _timed(client, report, "POST /runs/{id}/next", "POST", f"/runs/{run_id}/next", json={})
+            if response.status_code != 200:
+                break
+            events = response.json()["events"]
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+            picks = rng.choices(CHOICES, weights=weights, k=len(events))
+            if len(events) == 1:
+                body = {"event_id": events[0]["id"], "choice": picks[0]}
+                response = await _timed(
+                    client, report, "POST /runs/{id}/decision", "POST", f"/runs/{run_id}/decision", json=body
+                )
+            else:
+                body = {"decisions": [{"event_id": e["id"], "choice": c} for e, c in zip(events, picks)]}
+                response = await _timed(
+                    client, report, "POST /runs/{id}/decisions", "POST", f"/runs/{run_id}/decisions", json=body
+                )
+            if response.status_code != 200:
+                break
+            if response.json()["state"]["run_status"] != "active":
+                report.runs_finished += 1
+                break
+        # Spectators poll state far more often than players act; one poll per run.
+        await _timed(client, report, "GET /runs/{id}/state", "GET", f"/runs/{run_id}/state")
+
+
+async def _sample_memory(report: LoadReport, started: float, interval: float) -> None:
+    while True:
+        report.memory.append((time.perf_counter() - started, rss_mb()))
+        await asyncio.sleep(interval)
+
+
+@contextmanager
+def _isolated_side_effects(directory: Path) -> Iterator[None]:
+    """Point the in-process app's profile and run archive at ``directory``."""
+
+    from . import main
+    from .profile_store import PROFILE_STORE
+    from .run_archive import RunArchive
+
+    saved = PROFILE_STORE.path, main.RUN_ARCHIVE
+    PROFILE_STORE.path = directory / "player_profile.json"
+    main.RUN_ARCHIVE = RunArchive(directory / "run_archive")
+    try:
+        yield
+    finally:
+        PROFILE_STORE.path, main.RUN_ARCHIVE = saved
+
+
+async def run_load_test(
+    players: int = 20,
+    runs: int = 2,
+    base_url: Optional[str] = None,
+    seed: int = 0,
+    turn_limit: int = 20,
+    world_size: int = 8,
+    events_per_turn: int = 1,
+    think_time: float = 0.0,
+    sample_interval: float = 0.5,
+) -> LoadReport:
+    """Drive the API with ``players`` concurrent simulated players."""
+
+    rng = random.Random(seed)
+    report = LoadReport(players=players)
+    start_body = {"turn_limit": turn_limit, "world_size": world_size, "events_per_turn": events_per_turn}
+    with tempfile.TemporaryDirectory(prefix="lazy_god_loadtest_") as scratch, ExitStack() as stack:
+        if base_url is None:
+            stack.enter_context(_isolated_side_effects(Path(scratch)))
+            from .main import app
+
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None)
+        else:
+            client = httpx.AsyncClient(base_url=base_url, timeout=None)
+        policies = list(POLICY_WEIGHTS)
+        started = time.perf_counter()
+        sampler = asyncio.create_task(_sample_memory(report, started, sample_interval)) if base_url is None else None
+        async with client:
+            await asyncio.gather(
+                *(
+                    play(
+                        client,
+                        report,
+                        random.Random(rng.random()),
+                        policies[player % len(policies)],
+                        runs,
+                        start_body,
+                        think_time,
+                    )
+                    for player in range(players)
+                )
+            )
+        report.duration = time.perf_counter() - started
+        if sampler is not None:
+            sampler.cancel()
+            report.memory.append((report.duration, rss_mb()))
+    return report
+
+
+def _print_report(summary: dict) -> None:
+    print(
+        f"{summary['players']} players, {summary['requests']} requests in {summary['duration_s']}s "
+        f"({summary['throughput_rps']} req/s), {summary['runs_finished']} runs finished"
+    )
+    print(f"{'route':<28}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for route, stats in summary["routes"].items():
+        print(
+            f"{route:<28}{stats['count']:>8}{stats['p50_ms']:>10}{stats['p90_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+    print(f"error rate: {summary['error_rate']:.2%}")
+    for error, count in sorted(summary["errors"].items(), key=lambda item: -item[1]):
+        print(f"  {count:>6}  {error}")
+    if summary["memory_mb"]:
+        first, last = summary["memory_mb"][0][1], summary["memory_mb"][-1][1]
+        peak = max(rss for _, rss in summary["memory_mb"])
+        print(f"memory: {first} MB -> {last} MB (peak {peak} MB)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=20, help="concurrent simulated players")
+    parser.add_argument("--runs", type=int, default=2, help="runs each player completes")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turn-limit", type=int, default=20)
+    parser.add_argument("--world-size", type=int, default=8)
+    parser.add_argument("--events-per-turn", type=int, default=1)
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds a player waits per turn")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    report = asyncio.run(
+        run_load_test(
+            players=args.players,
+            runs=args.runs,
+            base_url=args.base_url,
+            seed=args.seed,
+            turn_limit=args.turn_limit,
+            world_size=args.world_size,
+            events_per_turn=args.events_per_turn,
+            think_time=args.think_time,
+        )
+    )
+    summary = report.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        _print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,24 +9,37 @@ Run this server with uvicorn::
 
     uvicorn backend.main:app --reload
 
+Run endpoints answer in JSON unless the client's ``Accept`` header prefers
+the compact MessagePack layout described in :mod:`backend.wire`.
 """
 
 from __future__ import annotations
 
+import hmac
+import logging
+import os
+import struct
 import uuid
-from typing import Any, Dict, Optional
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from core.game import GameEngine
-from core.models import Decision
+from core.memory import TRACER, deep_sizeof, rss_mb
+from core.models import STATE_FIELDS, Decision
+from core.narrative import render
+from . import wire
 from .profile_store import PROFILE_STORE
+from .run_archive import RUN_ARCHIVE
 
 
 app = FastAPI(title="Lazy God API", version="0.2.0", description="Proof of concept for Lazy God game")
 
 engine = GameEngine()
+logger = logging.getLogger(__name__)
 
 
 class SessionManager:
@@ -55,14 +68,72 @@ class SessionManager:
     def clear(self, session_id: str) -> None:
         self._session_runs.pop(session_id, None)
 
+    def __len__(self) -> int:
+        return len(self._session_runs)
+
+    def run_ids(self) -> set:
+        return set(self._session_runs.values())
+
+    def memory_bytes(self) -> int:
+        return deep_sizeof(self._session_runs)
+
 
 sessions = SessionManager()
 
 
-def _serialize_state(state: Any) -> Dict[str, Any]:
+def _state_fields(
+    fields: Optional[str] = Query(default=None, description="Comma-separated GameState fields to include"),
+) -> Optional[List[str]]:
+    """Parse the ``fields`` projection shared by every endpoint returning state."""
+
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STATE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"UNKNOWN_FIELD: {', '.join(unknown)}")
+    return names
+
+
+def _wants_binary(accept: Optional[str] = Header(default=None)) -> bool:
+    """Content negotiation shared by the run endpoints: True selects :data:`wire.MEDIA_TYPE`."""
+
+    return wire.accepts_binary(accept)
+
+
+def _respond(body: BaseModel, binary: bool, state: Any) -> Response:
+    """Return ``body`` as JSON, or packed with ``state``'s nation order when ``binary``.
+
+    Either way the response varies with ``Accept``, so caches keep the two
+    formats apart.
+    """
+
+    if not binary:
+        return JSONResponse(content=body.model_dump(mode="json"), headers={"Vary": "Accept"})
+    return Response(
+        content=wire.encode(body.model_dump(), list(state.nations)),
+        media_type=wire.MEDIA_TYPE,
+        headers={"Vary": "Accept"},
+    )
+
+
+def _serialize_state(state: Any, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Return a dict representation that FastAPI can serialise."""
 
-    return state.to_dict()
+    return state.to_dict(fields)
+
+
+def _state_etag(state: Any, fields: Optional[List[str]] = None, binary: bool = False) -> str:
+    projection = f";{','.join(fields)}" if fields is not None else ""
+    encoding = ";msgpack" if binary else ""
+    return f'"{state.run_id}-{state.version}{projection}{encoding}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
 
 
 def _serialize_event(event: Any) -> Optional[Dict[str, Any]]:
@@ -71,20 +142,46 @@ def _serialize_event(event: Any) -> Optional[Dict[str, Any]]:
     return event.to_dict()
 
 
-def _pending_event_for_state(state: Any) -> Optional[Dict[str, Any]]:
-    if not state.events_log:
-        return None
-    event = state.events_log[-1]
-    if not event.resolved:
-        return _serialize_event(event)
-    return None
+def _archive_if_finished(state: Any) -> None:
+    """Add a finished run to the leaderboard archive.
+
+    Called once the response is built: the decision has already been applied,
+    so a failed archive write is logged rather than turned into a 500.
+    """
+
+    if state.run_status == "active":
+        return
+    try:
+        RUN_ARCHIVE.append(state, engine.decision_tape(state.run_id), engine.run_started_at.get(state.run_id, 0.0))
+    except (OSError, struct.error):
+        logger.exception("could not archive finished run %s", state.run_id)
+
+
+def _pending_for_state(state: Any) -> Dict[str, Any]:
+    """``pending_events``: every unresolved event of the current turn, oldest first.
+
+    ``pending_event`` keeps the last of them for single-event clients; a turn
+    with several needs all of ``pending_events`` for ``/decisions``.
+    """
+
+    pending: List[Dict[str, Any]] = []
+    for event in reversed(state.events_log):
+        if event.resolved:
+            break
+        pending.append(_serialize_event(event))
+    pending.reverse()
+    return {"pending_event": pending[-1] if pending else None, "pending_events": pending}
 
 
 class StartRunRequest(BaseModel):
     world_theme: str = "classic_fantasy"
     turn_limit: int = 20
     difficulty: str = "normal"
-    seed: int | None = Field(default=None, description="Optional deterministic seed")
+    seed: int | None = Field(default=None, ge=-(2**63), le=2**63 - 1, description="Optional deterministic seed")
+    world_size: int = Field(default=8, ge=2, le=50_000, description="Number of nations to generate")
+    events_per_turn: int = Field(default=1, ge=1, le=64, description="Concurrent events spawned each turn")
+    endless: bool = Field(default=False, description="Ignore turn_limit and archive old events to disk")
+    event_window: int = Field(default=50, ge=1, le=1_000, description="Resident events and quips in endless runs")
     session_id: str | None = Field(default=None, description="Existing session identifier")
     resume: bool = Field(default=True, description="Resume existing session when possible")
 
@@ -94,11 +191,16 @@ class StartRunResponse(BaseModel):
     session_id: str
     state: dict
     pending_event: Optional[dict]
+    pending_events: List[dict] = []
     profile_summary: dict
 
 
 @app.post("/runs/start", response_model=StartRunResponse)
-async def start_run(payload: StartRunRequest):
+async def start_run(
+    payload: StartRunRequest,
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
     session_id = payload.session_id
     existing_state = None
     if session_id:
@@ -106,13 +208,14 @@ async def start_run(payload: StartRunRequest):
         if run_id:
             existing_state = engine.get_state(run_id)
             if existing_state and payload.resume and existing_state.run_status == "active":
-                return StartRunResponse(
+                body = StartRunResponse(
                     run_id=existing_state.run_id,
                     session_id=session_id,
-                    state=_serialize_state(existing_state),
-                    pending_event=_pending_event_for_state(existing_state),
+                    state=_serialize_state(existing_state, fields),
+                    **_pending_for_state(existing_state),
                     profile_summary=PROFILE_STORE.get_summary(),
                 )
+                return _respond(body, binary, existing_state)
 
     state = engine.start_run(
         world_theme=payload.world_theme,
@@ -120,6 +223,10 @@ async def start_run(payload: StartRunRequest):
         difficulty=payload.difficulty,
         seed=payload.seed,
         profile_unlocks=PROFILE_STORE.unlocked_flags(),
+        world_size=payload.world_size,
+        events_per_turn=payload.events_per_turn,
+        endless=payload.endless,
+        event_window=payload.event_window,
     )
 
     if session_id:
@@ -127,19 +234,21 @@ async def start_run(payload: StartRunRequest):
     else:
         session_id = sessions.new_session(state.run_id)
 
-    return StartRunResponse(
+    body = StartRunResponse(
         run_id=state.run_id,
         session_id=session_id,
-        state=_serialize_state(state),
-        pending_event=_pending_event_for_state(state),
+        state=_serialize_state(state, fields),
+        **_pending_for_state(state),
         profile_summary=PROFILE_STORE.get_summary(),
     )
+    return _respond(body, binary, state)
 
 
 class NextEventResponse(BaseModel):
     run_id: str
     session_id: Optional[str]
     event: dict
+    events: List[dict]
     state: dict
 
 
@@ -148,32 +257,40 @@ class NextEventRequest(BaseModel):
 
 
 @app.post("/runs/{run_id}/next", response_model=NextEventResponse)
-async def next_event(run_id: str, payload: Optional[NextEventRequest] = None):
+async def next_event(
+    run_id: str,
+    payload: Optional[NextEventRequest] = None,
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
     resolved_run_id = run_id
     session_id = payload.session_id if payload else None
     if session_id:
         resolved = sessions.resolve_run_id(session_id)
         if resolved:
             resolved_run_id = resolved
-    event, error = engine.next_turn(resolved_run_id)
+    events, error = engine.next_events(resolved_run_id)
     if error:
         raise HTTPException(status_code=400, detail=error)
     state = engine.get_state(resolved_run_id)
     if state is None:
         raise HTTPException(status_code=404, detail="RUN_NOT_FOUND")
-    if event is None:
+    if not events:
         raise HTTPException(status_code=400, detail="NO_EVENT")
     if session_id:
         sessions.attach(session_id, state.run_id)
         active_session = session_id
     else:
         active_session = sessions.new_session(state.run_id)
-    return NextEventResponse(
+    serialized_events = [_serialize_event(event) for event in events]
+    body = NextEventResponse(
         run_id=state.run_id,
         session_id=active_session,
-        event=_serialize_event(event),
-        state=_serialize_state(state),
+        event=serialized_events[0],
+        events=serialized_events,
+        state=_serialize_state(state, fields),
     )
+    return _respond(body, binary, state)
 
 
 class DecisionRequest(BaseModel):
@@ -192,7 +309,12 @@ class DecisionResponse(BaseModel):
 
 
 @app.post("/runs/{run_id}/decision", response_model=DecisionResponse)
-async def decision(run_id: str, payload: DecisionRequest):
+async def decision(
+    run_id: str,
+    payload: DecisionRequest,
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
     resolved_run_id = run_id
     if payload.session_id:
         resolved = sessions.resolve_run_id(payload.session_id)
@@ -206,27 +328,316 @@ async def decision(run_id: str, payload: DecisionRequest):
     if not state.events_log:
         raise HTTPException(status_code=400, detail="NO_EVENT")
     event = state.events_log[-1]
-    summary = event.resolution.logs[-1] if event.resolution and event.resolution.logs else "Decision applied."
+    summary = render(event.resolution.logs[-1]) if event.resolution and event.resolution.logs else "Decision applied."
     session_id = payload.session_id
     if session_id:
         sessions.attach(session_id, state.run_id)
-    return DecisionResponse(
+    body = DecisionResponse(
         run_id=state.run_id,
         session_id=session_id,
-        state=_serialize_state(state),
+        state=_serialize_state(state, fields),
         resolved_event=_serialize_event(event),
         outcome_summary=summary,
         profile_summary=PROFILE_STORE.ingest_resolution(state, event),
     )
+    response = _respond(body, binary, state)
+    _archive_if_finished(state)
+    return response
+
+
+class BatchDecisionItem(BaseModel):
+    event_id: str
+    choice: Decision
+
+
+class BatchDecisionRequest(BaseModel):
+    decisions: List[BatchDecisionItem] = Field(min_length=1)
+    session_id: str | None = None
+
+
+class BatchDecisionResponse(BaseModel):
+    run_id: str
+    session_id: Optional[str]
+    state: dict
+    resolved_events: List[dict]
+    outcome_summary: str
+    profile_summary: Optional[dict]
+
+
+@app.post("/runs/{run_id}/decisions", response_model=BatchDecisionResponse)
+async def batch_decision(
+    run_id: str,
+    payload: BatchDecisionRequest,
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
+    """Resolve every pending event of a multi-event turn in one call."""
+
+    resolved_run_id = run_id
+    if payload.session_id:
+        resolved = sessions.resolve_run_id(payload.session_id)
+        if resolved:
+            resolved_run_id = resolved
+    # Hold on to the pending events: an endless run may archive some of them
+    # out of events_log as soon as the turn resolves.
+    current = engine.get_state(resolved_run_id)
+    events = [event for event in current.events_log if not event.resolved] if current else []
+    state, error = engine.make_decisions(
+        resolved_run_id, [(item.event_id, item.choice) for item in payload.decisions]
+    )
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    if state is None:
+        raise HTTPException(status_code=404, detail="RUN_NOT_FOUND")
+    last = events[-1]
+    summary = render(last.resolution.logs[-1]) if last.resolution and last.resolution.logs else "Decisions applied."
+    session_id = payload.session_id
+    if session_id:
+        sessions.attach(session_id, state.run_id)
+    body = BatchDecisionResponse(
+        run_id=state.run_id,
+        session_id=session_id,
+        state=_serialize_state(state, fields),
+        resolved_events=[_serialize_event(event) for event in events],
+        outcome_summary=summary,
+        profile_summary=PROFILE_STORE.ingest_resolutions(state, events),
+    )
+    response = _respond(body, binary, state)
+    _archive_if_finished(state)
+    return response
+
+
+class ForkRunRequest(BaseModel):
+    session_id: str | None = Field(default=None, description="Session to switch over to the new branch")
+
+
+class ForkRunResponse(BaseModel):
+    run_id: str
+    parent_run_id: str
+    session_id: Optional[str]
+    state: dict
+    pending_event: Optional[dict]
+    pending_events: List[dict] = []
+
+
+@app.post("/runs/{run_id}/fork", response_model=ForkRunResponse)
+async def fork_run(
+    run_id: str,
+    payload: Optional[ForkRunRequest] = None,
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
+    """Branch a run for undo checkpoints or what-if comparisons.
+
+    The parent run is untouched.  When ``session_id`` is given the session
+    follows the new branch; otherwise the branch is only reachable by its id.
+    """
+
+    state, error = engine.fork_run(run_id)
+    if error:
+        raise HTTPException(status_code=404, detail=error)
+    session_id = payload.session_id if payload else None
+    if session_id:
+        sessions.attach(session_id, state.run_id)
+    body = ForkRunResponse(
+        run_id=state.run_id,
+        parent_run_id=run_id,
+        session_id=session_id,
+        state=_serialize_state(state, fields),
+        **_pending_for_state(state),
+    )
+    return _respond(body, binary, state)
+
+
+class ArchivePageResponse(BaseModel):
+    run_id: str
+    offset: int
+    total: int
+    events: List[dict]
+
+
+@app.get("/runs/{run_id}/archive", response_model=ArchivePageResponse)
+async def get_archive(
+    run_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    binary: bool = Depends(_wants_binary),
+):
+    """Page through events an endless run has evicted to its on-disk archive."""
+
+    events, total, error = engine.archived_events(run_id, offset, limit)
+    if error:
+        raise HTTPException(status_code=404, detail=error)
+    body = ArchivePageResponse(run_id=run_id, offset=offset, total=total, events=events)
+    return _respond(body, binary, engine.get_state(run_id))
+
+
+class LeaderboardResponse(BaseModel):
+    by: str
+    total_runs: int
+    entries: List[dict]
+
+
+@app.get("/leaderboard", response_model=LeaderboardResponse)
+async def leaderboard(
+    by: Literal["score", "seed", "day"] = "score",
+    seed: Optional[int] = None,
+    day: Optional[date] = Query(default=None, description="UTC date; defaults to today"),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Top finished runs overall, for one seed, or for one UTC day."""
+
+    if by == "seed":
+        if seed is None:
+            raise HTTPException(status_code=400, detail="SEED_REQUIRED")
+        runs = RUN_ARCHIVE.top_for_seed(seed, limit)
+    elif by == "day":
+        day = day or datetime.now(timezone.utc).date()
+        runs = RUN_ARCHIVE.top_for_day((day - date(1970, 1, 1)).days, limit)
+    else:
+        runs = RUN_ARCHIVE.top_scores(limit)
+    return LeaderboardResponse(by=by, total_runs=len(RUN_ARCHIVE), entries=[run.to_summary() for run in runs])
+
+
+class EventsPageResponse(BaseModel):
+    run_id: str
+    cursor: int
+    next_cursor: Optional[int]
+    events: List[dict]
+
+
+@app.get("/runs/{run_id}/events", response_model=EventsPageResponse)
+async def get_events(
+    run_id: str,
+    cursor: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    binary: bool = Depends(_wants_binary),
+):
+    """Page through a run's event history, oldest first, including archived events."""
+
+    events, next_cursor, error = engine.events_page(run_id, cursor, limit)
+    if error:
+        raise HTTPException(status_code=404, detail=error)
+    body = EventsPageResponse(run_id=run_id, cursor=cursor, next_cursor=next_cursor, events=events)
+    return _respond(body, binary, engine.get_state(run_id))
 
 
 class StateResponse(BaseModel):
     state: dict
+    pending_event: Optional[dict] = None
+    pending_events: List[dict] = []
 
 
 @app.get("/runs/{run_id}/state", response_model=StateResponse)
-async def get_state(run_id: str):
+async def get_state(
+    run_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    fields: Optional[List[str]] = Depends(_state_fields),
+    binary: bool = Depends(_wants_binary),
+):
+    """Return the run state; ``If-None-Match`` with the current ETag yields 304."""
+
     state = engine.get_state(run_id)
     if not state:
         raise HTTPException(status_code=404, detail="RUN_NOT_FOUND")
-    return StateResponse(state=_serialize_state(state))
+    etag = _state_etag(state, fields, binary)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+    body = StateResponse(state=_serialize_state(state, fields), **_pending_for_state(state))
+    response = _respond(body, binary, state)
+    response.headers["ETag"] = etag
+    return response
+
+
+class MemoryReportResponse(BaseModel):
+    rss_mb: float
+    tracing: bool
+    runs: int
+    active_runs: int
+    finished_runs: int
+    orphaned_runs: int = Field(description="Runs held in memory that no session points at")
+    run_bytes: int
+    sessions: int
+    session_bytes: int
+    top_runs: List[dict]
+
+
+ADMIN_TOKEN_ENV = "LAZY_GOD_ADMIN_TOKEN"
+
+
+def _require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin endpoints exist only when ``LAZY_GOD_ADMIN_TOKEN`` is set, and need it in ``X-Admin-Token``."""
+
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN_INVALID")
+
+
+@app.get("/admin/memory", response_model=MemoryReportResponse, dependencies=[Depends(_require_admin)])
+async def memory_report(top: int = Query(default=10, ge=1, le=500)):
+    """Approximate memory held by runs and sessions, with the largest runs broken down.
+
+    Walks every run in memory, so it costs time proportional to the heap;
+    call it when diagnosing, not from a poll loop.
+    """
+
+    usages = engine.memory_by_run()
+    attached = sessions.run_ids()
+    active = sum(1 for usage in usages if usage.run_status == "active")
+    return MemoryReportResponse(
+        rss_mb=round(rss_mb(), 1),
+        tracing=TRACER.tracing,
+        runs=len(usages),
+        active_runs=active,
+        finished_runs=len(usages) - active,
+        orphaned_runs=sum(1 for usage in usages if usage.run_id not in attached),
+        run_bytes=sum(usage.total for usage in usages),
+        sessions=len(sessions),
+        session_bytes=sessions.memory_bytes(),
+        top_runs=[usage.to_dict() for usage in usages[:top]],
+    )
+
+
+@app.get("/admin/memory/runs/{run_id}", dependencies=[Depends(_require_admin)])
+async def run_memory(run_id: str):
+    """Approximate bytes one run holds, split into nations, events_log, history, quips and other."""
+
+    usage, error = engine.memory_usage(run_id)
+    if error:
+        raise HTTPException(status_code=404, detail=error)
+    return usage.to_dict()
+
+
+class TracemallocRequest(BaseModel):
+    action: Literal["start", "stop", "snapshot"]
+    frames: int = Field(default=1, ge=1, le=50, description="Stack depth recorded per allocation (start)")
+    top: int = Field(default=20, ge=1, le=500, description="Allocation sites to return (snapshot)")
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno"
+    rebase: bool = Field(default=True, description="Make this snapshot the baseline for the next diff")
+
+
+class TracemallocResponse(BaseModel):
+    tracing: bool
+    diff: Optional[List[dict]] = None
+
+
+@app.post("/admin/tracemalloc", response_model=TracemallocResponse, dependencies=[Depends(_require_admin)])
+async def tracemalloc_control(payload: TracemallocRequest):
+    """Start or stop tracemalloc, or diff the heap against the previous snapshot.
+
+    Tracing slows every allocation, so it is off until started here and
+    should be stopped once the diff has been read.
+    """
+
+    if payload.action == "start":
+        TRACER.start(payload.frames)
+        return TracemallocResponse(tracing=True)
+    if payload.action == "stop":
+        TRACER.stop()
+        return TracemallocResponse(tracing=False)
+    diff = TRACER.diff(payload.top, payload.key_type, payload.rebase)
+    if diff is None:
+        raise HTTPException(status_code=409, detail="TRACING_OFF")
+    return TracemallocResponse(tracing=True, diff=diff)
@@ -6,7 +6,7 @@ import json
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from core.models import Event, GameState
 
@@ -89,6 +89,12 @@ class ProfileStore:
     def ingest_resolution(self, state: GameState, event: Optional[Event]) -> Dict[str, Any]:
         """Update the profile with details from the resolved state."""
 
+        return self.ingest_resolutions(state, [event] if event else [])
+
+    def ingest_resolutions(self, state: GameState, events: Sequence[Event]) -> Dict[str, Any]:
+        """Update the profile once for a turn that resolved ``events``."""
+
+        event = events[-1] if events else None
         updated = False
         new_unlocks: List[str] = []
         for assistant in state.assistants.values():
@@ -100,9 +106,9 @@ class ProfileStore:
             self._profile.last_unlocks = new_unlocks
         elif state.run_status != "active":
             self._profile.last_unlocks = []
-        if event and "rare" in event.tags:
-            if event.template_key not in self._profile.rare_events_seen:
-                self._profile.rare_events_seen.append(event.template_key)
+        for resolved in events:
+            if "rare" in resolved.tags and resolved.template_key not in self._profile.rare_events_seen:
+                self._profile.rare_events_seen.append(resolved.template_key)
                 updated = True
         if state.run_status != "active":
             self._profile.total_runs += 1
@@ -0,0 +1,320 @@
+"""Append-only archive of finished runs with leaderboard indexes.
+
+Finished runs are written to two files:
+
+* ``runs.dat`` – a fixed-layout header per run followed by its
+  zlib-compressed decision tape,
+* ``runs.idx`` – one fixed-width entry per run (data offset, seed, score,
+  day, result) that is memory-mapped on open.
+
+Leaderboards never scan the archive per query, and opening does not scan it
+either.  Three sidecar files hold the query structures:
+
+* ``runs.scores`` – every run's score as an int64, appended with the run, so
+  rankings compare scores without unpacking index entries,
+* ``runs.seeds`` – per-seed rankings as a sorted (seed, score desc) segment,
+* ``runs.top`` – the bounded min-heaps of top scores overall and per day.
+
+New runs go into a small unsorted seed tail and the heaps in memory.  Once
+the tail grows past ``TAIL_LIMIT`` it is merged into the sorted segment (a
+linear copy, not a re-sort) and both checkpoints are rewritten.  Opening
+loads the checkpoints and replays only the index entries written after them.
+The archive directory defaults to ``LAZY_GOD_RUN_ARCHIVE_DIR``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.models import GameState
+
+ARCHIVE_DIR_ENV = "LAZY_GOD_RUN_ARCHIVE_DIR"
+DEFAULT_ARCHIVE_DIR = Path.home() / ".lazy_god" / "run_archive"
+
+# run_id, seed, score, stability, result, turns, started_at, ended_at, tape length
+RECORD_HEADER = struct.Struct("<16sqqdBIddI")
+# data offset, seed, score, day, result
+INDEX_ENTRY = struct.Struct("<QqqiB")
+# runs covered by the seed checkpoint; its seed and record-number arrays follow
+SEEDS_HEADER = struct.Struct("<Q")
+
+RESULT_CODES = {"won": 0, "collapsed": 1, "turn_limit": 2, "player_quit": 3}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+OTHER_RESULT = 255
+
+LEADERBOARD_DEPTH = 100
+TAIL_LIMIT = 4096
+
+
+@dataclass
+class ArchivedRun:
+    """A finished run read back from the archive."""
+
+    run_id: str
+    seed: int
+    score: int
+    stability: float
+    result: str
+    turns: int
+    started_at: float
+    ended_at: float
+    decision_tape: Optional[bytes] = None
+
+    def to_summary(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "seed": self.seed,
+            "score": self.score,
+            "stability": round(self.stability, 3),
+            "result": self.result,
+            "turns": self.turns,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+        }
+
+
+def epoch_day(timestamp: float) -> int:
+    """Return the UTC day number (days since the Unix epoch) of ``timestamp``."""
+
+    return int(timestamp // 86_400)
+
+
+class RunArchive:
+    """Finished-run archive answering top-K queries without full scans."""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        directory = directory or Path(os.environ.get(ARCHIVE_DIR_ENV) or DEFAULT_ARCHIVE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.data_path = directory / "runs.dat"
+        self.index_path = directory / "runs.idx"
+        self.scores_path = directory / "runs.scores"
+        self.seeds_path = directory / "runs.seeds"
+        self.top_path = directory / "runs.top"
+        self.data_path.touch()
+        self.index_path.touch()
+        self._count = self.index_path.stat().st_size // INDEX_ENTRY.size
+        self._index_map: Optional[mmap.mmap] = None
+        self._mapped = 0
+        self._scores = array("q")
+        self._top: List[Tuple[int, int]] = []
+        self._by_day: Dict[int, List[Tuple[int, int]]] = {}
+        self._seed_keys = array("q")
+        self._seed_recnos = array("q")
+        self._seed_tail: List[Tuple[int, int, int]] = []
+        self._load_indexes()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -- index access -------------------------------------------------
+    def _remap(self) -> None:
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        size = self._count * INDEX_ENTRY.size
+        if size:
+            with self.index_path.open("rb") as handle:
+                self._index_map = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped = self._count
+
+    def _entry(self, recno: int) -> Tuple[int, int, int, int, int]:
+        if recno >= self._mapped:
+            self._remap()
+        return INDEX_ENTRY.unpack_from(self._index_map, recno * INDEX_ENTRY.size)
+
+    def _load_indexes(self) -> None:
+        self._remap()
+        self._load_scores()
+        covered = min(self._load_seeds(), self._load_top())
+        # Entries past the older checkpoint; a missing checkpoint means all of them.
+        for recno in range(covered, self._count):
+            _, seed, score, day, _ = self._entry(recno)
+            if recno >= self._top_covered:
+                self._track(recno, score, day)
+            if recno >= self._seeds_covered:
+                self._seed_tail.append((seed, -score, recno))
+        if len(self._seed_tail) > TAIL_LIMIT:
+            self._compact_seed_tail()
+
+    def _load_scores(self) -> None:
+        stored = self.scores_path.stat().st_size // self._scores.itemsize if self.scores_path.exists() else 0
+        if stored:
+            with self.scores_path.open("rb") as handle:
+                self._scores.fromfile(handle, min(stored, self._count))
+        if stored != self._count:
+            # Written right after the index entry; realign after an interrupted append.
+            self._scores.extend(self._entry(recno)[2] for recno in range(len(self._scores), self._count))
+            with self.scores_path.open("wb") as handle:
+                self._scores.tofile(handle)
+
+    def _load_seeds(self) -> int:
+        self._seeds_covered = 0
+        if not self.seeds_path.exists():
+            return 0
+        with self.seeds_path.open("rb") as handle:
+            (covered,) = SEEDS_HEADER.unpack(handle.read(SEEDS_HEADER.size))
+            if covered > self._count:
+                return 0
+            self._seed_keys.fromfile(handle, covered)
+            self._seed_recnos.fromfile(handle, covered)
+        self._seeds_covered = covered
+        return covered
+
+    def _load_top(self) -> int:
+        self._top_covered = 0
+        if not self.top_path.exists():
+            return 0
+        data = json.loads(self.top_path.read_text())
+        if data["count"] > self._count:
+            return 0
+        self._top = [tuple(item) for item in data["top"]]
+        self._by_day = {int(day): [tuple(item) for item in heap] for day, heap in data["by_day"].items()}
+        self._top_covered = data["count"]
+        return self._top_covered
+
+    def _track(self, recno: int, score: int, day: int) -> None:
+        # Heaps hold (score, -recno): earlier runs win ties.
+        item = (score, -recno)
+        for heap in (self._top, self._by_day.setdefault(day, [])):
+            if len(heap) < LEADERBOARD_DEPTH:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def _compact_seed_tail(self) -> None:
+        """Merge the seed tail into the sorted segment and checkpoint the indexes."""
+
+        keys, recnos, scores = self._seed_keys, self._seed_recnos, self._scores
+        if len(self._seed_tail) > len(keys):
+            # Building the segment from scratch (first open of an old archive).
+            merged = sorted(
+                [(seed, -scores[recno], recno) for seed, recno in zip(keys, recnos)] + self._seed_tail
+            )
+            self._seed_keys = array("q", (seed for seed, _, _ in merged))
+            self._seed_recnos = array("q", (recno for _, _, recno in merged))
+            self._seed_tail = []
+            self._checkpoint()
+            return
+
+        def rank(recno: int) -> Tuple[int, int]:
+            return -scores[recno], recno
+
+        self._seed_tail.sort()
+        merged_keys, merged_recnos = array("q"), array("q")
+        copied = 0
+        for seed, neg_score, recno in self._seed_tail:
+            start = bisect_left(keys, seed, copied)
+            stop = bisect_right(keys, seed, start)
+            position = bisect_left(recnos, (neg_score, recno), start, stop, key=rank)
+            merged_keys += keys[copied:position]
+            merged_recnos += recnos[copied:position]
+            merged_keys.append(seed)
+            merged_recnos.append(recno)
+            copied = position
+        merged_keys += keys[copied:]
+        merged_recnos += recnos[copied:]
+        self._seed_keys, self._seed_recnos = merged_keys, merged_recnos
+        self._seed_tail = []
+        self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        """Persist the sorted seed segment and the heaps for the next open."""
+
+        covered = len(self._seed_keys)
+        scratch = self.seeds_path.with_suffix(".tmp")
+        with scratch.open("wb") as handle:
+            handle.write(SEEDS_HEADER.pack(covered))
+            self._seed_keys.tofile(handle)
+            self._seed_recnos.tofile(handle)
+        os.replace(scratch, self.seeds_path)
+        scratch = self.top_path.with_suffix(".tmp")
+        scratch.write_text(json.dumps({"count": self._count, "top": self._top, "by_day": self._by_day}))
+        os.replace(scratch, self.top_path)
+        self._seeds_covered = self._top_covered = self._count
+
+    # -- writes --------------------------------------------------------
+    def append(self, state: GameState, decision_tape: bytes, started_at: float, ended_at: Optional[float] = None) -> int:
+        """Archive a finished run and return its record number."""
+
+        ended_at = ended_at if ended_at is not None else time.time()
+        tape = zlib.compress(decision_tape, 9)
+        result = RESULT_CODES.get(state.run_status, OTHER_RESULT)
+        header = RECORD_HEADER.pack(
+            state.run_id.encode()[:16],
+            state.seed,
+            state.score,
+            state.stability,
+            result,
+            state.turn - 1,
+            started_at,
+            ended_at,
+            len(tape),
+        )
+        with self.data_path.open("ab") as data:
+            offset = data.tell()
+            data.write(header + tape)
+        day = epoch_day(ended_at)
+        with self.index_path.open("ab") as index:
+            index.write(INDEX_ENTRY.pack(offset, state.seed, state.score, day, result))
+        with self.scores_path.open("ab") as scores:
+            array("q", (state.score,)).tofile(scores)
+        recno = self._count
+        self._count += 1
+        self._scores.append(state.score)
+        self._track(recno, state.score, day)
+        self._seed_tail.append((state.seed, -state.score, recno))
+        if len(self._seed_tail) > TAIL_LIMIT:
+            self._compact_seed_tail()
+        return recno
+
+    # -- reads ---------------------------------------------------------
+    def get(self, recno: int, with_tape: bool = False) -> ArchivedRun:
+        offset = self._entry(recno)[0]
+        with self.data_path.open("rb") as data:
+            data.seek(offset)
+            fields = RECORD_HEADER.unpack(data.read(RECORD_HEADER.size))
+            tape = zlib.decompress(data.read(fields[8])) if with_tape else None
+        run_id, seed, score, stability, result, turns, started_at, ended_at, _ = fields
+        return ArchivedRun(
+            run_id=run_id.rstrip(b"\0").decode(),
+            seed=seed,
+            score=score,
+            stability=stability,
+            result=RESULT_NAMES.get(result, "other"),
+            turns=turns,
+            started_at=started_at,
+            ended_at=ended_at,
+            decision_tape=tape,
+        )
+
+    def _ranked(self, heap: List[Tuple[int, int]], limit: int) -> List[ArchivedRun]:
+        return [self.get(-neg_recno) for _, neg_recno in heapq.nlargest(limit, heap)]
+
+    def top_scores(self, limit: int = 10) -> List[ArchivedRun]:
+        return self._ranked(self._top, min(limit, LEADERBOARD_DEPTH))
+
+    def top_for_day(self, day: int, limit: int = 10) -> List[ArchivedRun]:
+        """Top runs that ended on ``day`` (days since the Unix epoch, UTC)."""
+
+        return self._ranked(self._by_day.get(day, []), min(limit, LEADERBOARD_DEPTH))
+
+    def top_for_seed(self, seed: int, limit: int = 10) -> List[ArchivedRun]:
+        start = bisect_left(self._seed_keys, seed)
+        stop = min(bisect_right(self._seed_keys, seed), start + limit)
+        candidates = [(-self._scores[recno], recno) for recno in self._seed_recnos[start:stop]]
+        candidates.extend((neg_score, recno) for tail_seed, neg_score, recno in self._seed_tail if tail_seed == seed)
+        return [self.get(recno) for _, recno in heapq.nsmallest(limit, candidates)]
+
+
+RUN_ARCHIVE = RunArchive()
@@ -0,0 +1,398 @@
+"""Compact binary encoding of API responses, negotiated through ``Accept``.
+
+JSON stays the default.  A client that sends ``Accept: application/vnd.lazy-god+msgpack``
+gets the same response as MessagePack in a schema-driven layout:
+
+* nations, assistants, events (with their choices, effects and resolution)
+  and blocs are arrays in the property order of ``docs/schemas``, not maps,
+* enum-valued fields (race, economy, demeanor, assistant class, event kind,
+  stability state, run status, relation status, decision keys, effect
+  targets) carry the value's index in :data:`ENUMS`; values not in the table
+  stay strings,
+* stability values (always whole thousandths) are integer milli-units,
+* nation ids are indices into the run's nations in state order.  When the
+  response includes ``state.nations`` that list is the table (each record
+  keeps its ``id`` string); otherwise clients reuse the one they already have.
+
+:func:`encode` builds the bytes and :func:`decode` turns them back into the
+JSON-shaped payload.  The MessagePack packer and unpacker are the small
+pure-Python ones below, covering just the types JSON payloads use, so the
+server needs no extra dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.models import AssistantClass, Decision, Demeanor, EconomyType, EventKind, Race, StabilityState
+
+MEDIA_TYPE = "application/vnd.lazy-god+msgpack"
+JSON_MEDIA_TYPE = "application/json"
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "docs" / "schemas"
+
+# Enum tables shared with clients.  Only ever append: indices are the wire values.
+ENUMS: Dict[str, Tuple[str, ...]] = {
+    "race": tuple(member.value for member in Race),
+    "economy": tuple(member.value for member in EconomyType),
+    "demeanor": tuple(member.value for member in Demeanor),
+    "assistant_class": tuple(member.value for member in AssistantClass),
+    "event_kind": tuple(member.value for member in EventKind),
+    "stability_state": tuple(member.value for member in StabilityState),
+    "run_status": ("active", "won", "collapsed", "turn_limit", "player_quit"),
+    "relation": ("neutral", "allied", "hostile", "trading"),
+    "decision": tuple(member.value for member in Decision),
+    "effect_target": ("global", "nation", "relation", "streak", "score"),
+}
+
+
+def accepts_binary(accept: Optional[str]) -> bool:
+    """True when ``accept`` ranks :data:`MEDIA_TYPE` strictly above JSON."""
+
+    if not accept:
+        return False
+    quality = {MEDIA_TYPE: 0.0, JSON_MEDIA_TYPE: 0.0}
+    for media_range in accept.split(","):
+        media, *params = (part.strip() for part in media_range.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media = media.lower()
+        if media in ("*/*", "application/*"):
+            quality[JSON_MEDIA_TYPE] = max(quality[JSON_MEDIA_TYPE], q)
+        elif media in quality:
+            quality[media] = max(quality[media], q)
+    return quality[MEDIA_TYPE] > quality[JSON_MEDIA_TYPE]
+
+
+# --- MessagePack ----------------------------------------------------------
+
+
+def _pack_into(out: bytearray, obj: Any) -> None:
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif obj >= 0:
+            for limit, code, fmt in ((0xFF, 0xCC, ">B"), (0xFFFF, 0xCD, ">H"), (0xFFFFFFFF, 0xCE, ">I")):
+                if obj <= limit:
+                    out.append(code)
+                    out += struct.pack(fmt, obj)
+                    break
+            else:
+                out.append(0xCF)
+                out += struct.pack(">Q", obj)
+        else:
+            for limit, code, fmt in ((-0x80, 0xD0, ">b"), (-0x8000, 0xD1, ">h"), (-0x80000000, 0xD2, ">i")):
+                if obj >= limit:
+                    out.append(code)
+                    out += struct.pack(fmt, obj)
+                    break
+            else:
+                out.append(0xD3)
+                out += struct.pack(">q", obj)
+    elif isinstance(obj, float):
+        out.append(0xCB)
+        out += struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        data = obj.encode()
+        _pack_header(out, len(data), 0xA0, 32, (0xD9, 0xDA, 0xDB))
+        out += data
+    elif isinstance(obj, (bytes, bytearray)):
+        _pack_header(out, len(obj), None, 0, (0xC4, 0xC5, 0xC6))
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        _pack_header(out, len(obj), 0x90, 16, (None, 0xDC, 0xDD))
+        for item in obj:
+            _pack_into(out, item)
+    elif isinstance(obj, dict):
+        _pack_header(out, len(obj), 0x80, 16, (None, 0xDE, 0xDF))
+        for key, value in obj.items():
+            _pack_into(out, key)
+            _pack_into(out, value)
+    else:
+        raise TypeError(f"cannot pack {type(obj).__name__}")
+
+
+def _pack_header(out: bytearray, size: int, fix: Optional[int], fix_limit: int, codes: Sequence[Optional[int]]) -> None:
+    """Write a length header: the fix form below ``fix_limit``, else 8/16/32-bit lengths."""
+
+    if fix is not None and size < fix_limit:
+        out.append(fix | size)
+        return
+    for code, limit, fmt in zip(codes, (0xFF, 0xFFFF, 0xFFFFFFFF), (">B", ">H", ">I")):
+        if code is not None and size <= limit:
+            out.append(code)
+            out += struct.pack(fmt, size)
+            return
+    raise ValueError("object too large to pack")
+
+
+def packb(obj: Any) -> bytes:
+    out = bytearray()
+    _pack_into(out, obj)
+    return bytes(out)
+
+
+_FIXED = {
+    0xCC: ">B", 0xCD: ">H", 0xCE: ">I", 0xCF: ">Q",
+    0xD0: ">b", 0xD1: ">h", 0xD2: ">i", 0xD3: ">q",
+    0xCA: ">f", 0xCB: ">d",
+}  # fmt: skip
+_LENGTHS = {0xD9: ">B", 0xDA: ">H", 0xDB: ">I", 0xC4: ">B", 0xC5: ">H", 0xC6: ">I"}
+_CONTAINERS = {0xDC: ">H", 0xDD: ">I", 0xDE: ">H", 0xDF: ">I"}
+
+
+def _unpack_from(data: bytes, pos: int) -> Tuple[Any, int]:
+    code = data[pos]
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= 0xE0:
+        return code - 0x100, pos
+    if 0xA0 <= code <= 0xBF:
+        size = code & 0x1F
+        return data[pos : pos + size].decode(), pos + size
+    if 0x90 <= code <= 0x9F:
+        return _unpack_array(data, pos, code & 0x0F)
+    if 0x80 <= code <= 0x8F:
+        return _unpack_map(data, pos, code & 0x0F)
+    if code == 0xC0:
+        return None, pos
+    if code in (0xC2, 0xC3):
+        return code == 0xC3, pos
+    if code in _FIXED:
+        fmt = _FIXED[code]
+        return struct.unpack_from(fmt, data, pos)[0], pos + struct.calcsize(fmt)
+    if code in _LENGTHS:
+        fmt = _LENGTHS[code]
+        size = struct.unpack_from(fmt, data, pos)[0]
+        pos += struct.calcsize(fmt)
+        raw = data[pos : pos + size]
+        return (raw.decode() if code >= 0xD9 else bytes(raw)), pos + size
+    if code in _CONTAINERS:
+        fmt = _CONTAINERS[code]
+        size = struct.unpack_from(fmt, data, pos)[0]
+        pos += struct.calcsize(fmt)
+        return (_unpack_array if code <= 0xDD else _unpack_map)(data, pos, size)
+    raise ValueError(f"unsupported MessagePack type 0x{code:02x}")
+
+
+def _unpack_array(data: bytes, pos: int, size: int) -> Tuple[List[Any], int]:
+    items = []
+    for _ in range(size):
+        item, pos = _unpack_from(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(data: bytes, pos: int, size: int) -> Tuple[Dict[Any, Any], int]:
+    result = {}
+    for _ in range(size):
+        key, pos = _unpack_from(data, pos)
+        result[key], pos = _unpack_from(data, pos)
+    return result, pos
+
+
+def unpackb(data: bytes) -> Any:
+    obj, pos = _unpack_from(data, 0)
+    if pos != len(data):
+        raise ValueError("trailing bytes after MessagePack object")
+    return obj
+
+
+# --- Schema-driven layout -------------------------------------------------
+
+# A shape turns one JSON value into its compact form and back, given the
+# nation id table (ids in state order) and its reverse index.
+Encoder = Callable[[Any, Dict[str, int]], Any]
+Decoder = Callable[[Any, List[str]], Any]
+
+
+class Shape:
+    def __init__(self, encode: Encoder, decode: Decoder) -> None:
+        self.encode = encode
+        self.decode = decode
+
+
+RAW = Shape(lambda value, rows: value, lambda value, ids: value)
+
+
+def enum_shape(table: str) -> Shape:
+    values = ENUMS[table]
+    index = {value: i for i, value in enumerate(values)}
+    return Shape(
+        lambda value, rows: index.get(value, value) if isinstance(value, str) else value,
+        lambda value, ids: values[value] if isinstance(value, int) else value,
+    )
+
+
+MILLI = Shape(
+    lambda value, rows: round(value * 1000) if isinstance(value, float) else value,
+    lambda value, ids: value / 1000 if isinstance(value, int) else value,
+)
+
+NATION_ID = Shape(
+    lambda value, rows: rows.get(value, value),
+    lambda value, ids: ids[value] if isinstance(value, int) else value,
+)
+
+
+def list_of(item: Shape) -> Shape:
+    return Shape(
+        lambda value, rows: None if value is None else [item.encode(v, rows) for v in value],
+        lambda value, ids: None if value is None else [item.decode(v, ids) for v in value],
+    )
+
+
+def map_of(key: Shape, value_shape: Shape) -> Shape:
+    return Shape(
+        lambda value, rows: {key.encode(k, rows): value_shape.encode(v, rows) for k, v in value.items()},
+        lambda value, ids: {key.decode(k, ids): value_shape.decode(v, ids) for k, v in value.items()},
+    )
+
+
+def record(schema: Dict[str, Any], **fields: Shape) -> Shape:
+    """An object written as an array in ``schema``'s property order (``None`` when absent)."""
+
+    names = tuple(schema["properties"])
+    shapes = tuple(fields.get(name, RAW) for name in names)
+    pairs = tuple(zip(names, shapes))
+
+    def encode(value: Optional[dict], rows: Dict[str, int]) -> Optional[list]:
+        if value is None:
+            return None
+        unknown = value.keys() - set(names)
+        if unknown:
+            raise ValueError(f"{schema.get('title', 'record')} has no layout for {sorted(unknown)}")
+        return [shape.encode(value.get(name), rows) for name, shape in pairs]
+
+    def decode(value: Optional[list], ids: List[str]) -> Optional[dict]:
+        if value is None:
+            return None
+        return {name: shape.decode(item, ids) for (name, shape), item in zip(pairs, value)}
+
+    return Shape(encode, decode)
+
+
+def _load_schemas() -> Dict[str, Dict[str, Any]]:
+    return {path.name: json.loads(path.read_text()) for path in SCHEMA_DIR.glob("*_schema.json")}
+
+
+_SCHEMAS = _load_schemas()
+_EVENT = _SCHEMAS["event_schema.json"]
+_CHOICE = _EVENT["properties"]["choices"]["items"]
+_RESOLUTION = next(option for option in _EVENT["properties"]["resolution"]["anyOf"] if "properties" in option)
+_STATE = _SCHEMAS["gamestate_schema.json"]
+
+NATION = record(
+    _SCHEMAS["nation_schema.json"],
+    primary_race=enum_shape("race"),
+    economy_type=enum_shape("economy"),
+    demeanor=enum_shape("demeanor"),
+    relations=map_of(NATION_ID, enum_shape("relation")),
+)
+ASSISTANT = record(
+    _SCHEMAS["assistant_schema.json"],
+    clazz=enum_shape("assistant_class"),
+    effect=record(_SCHEMAS["assistant_schema.json"]["properties"]["effect"]),
+)
+EVENT = record(
+    _EVENT,
+    kind=enum_shape("event_kind"),
+    nations=list_of(NATION_ID),
+    choices=list_of(
+        record(
+            _CHOICE,
+            key=enum_shape("decision"),
+            effects=list_of(record(_CHOICE["properties"]["effects"]["items"], target=enum_shape("effect_target"))),
+        )
+    ),
+    resolution=record(
+        _RESOLUTION,
+        chosen_key=enum_shape("decision"),
+        stability_delta=MILLI,
+        relation_changes=list_of(
+            record(
+                _RESOLUTION["properties"]["relation_changes"]["items"],
+                a=NATION_ID,
+                b=NATION_ID,
+                new_status=enum_shape("relation"),
+            )
+        ),
+    ),
+)
+
+_NATION_ID_COLUMN = list(_SCHEMAS["nation_schema.json"]["properties"]).index("id")
+
+# The nations map becomes a list in state order, so positions are the id table.
+NATION_LIST = Shape(
+    lambda value, rows: [NATION.encode(nation, rows) for nation in value.values()],
+    lambda value, ids: {nation["id"]: nation for nation in (NATION.decode(item, ids) for item in value)},
+)
+
+STATE_FIELDS: Dict[str, Shape] = {
+    "stability": MILLI,
+    "stability_history": list_of(MILLI),
+    "stability_state": enum_shape("stability_state"),
+    "nations": NATION_LIST,
+    "assistants": map_of(RAW, ASSISTANT),
+    "events_log": list_of(EVENT),
+    "run_status": enum_shape("run_status"),
+    "revealed_traits": map_of(NATION_ID, RAW),
+    "blocs": list_of(
+        record(_STATE["properties"]["blocs"]["items"], id=NATION_ID, members=list_of(NATION_ID))
+    ),
+}
+# The state stays a map (``fields`` projections drop keys); only its values are compacted.
+STATE = Shape(
+    lambda value, rows: {k: STATE_FIELDS.get(k, RAW).encode(v, rows) for k, v in value.items()},
+    lambda value, ids: {k: STATE_FIELDS.get(k, RAW).decode(v, ids) for k, v in value.items()},
+)
+
+# Top-level response keys with a layout; any other key is written as is.
+RESPONSE_FIELDS: Dict[str, Shape] = {
+    "state": STATE,
+    "event": EVENT,
+    "events": list_of(EVENT),
+    "pending_event": EVENT,
+    "pending_events": list_of(EVENT),
+    "resolved_event": EVENT,
+    "resolved_events": list_of(EVENT),
+}
+
+
+def encode(payload: Dict[str, Any], nation_ids: Sequence[str]) -> bytes:
+    """Pack a JSON-shaped response body; ``nation_ids`` is the run's nations in state order."""
+
+    rows = {nid: row for row, nid in enumerate(nation_ids)}
+    return packb({key: RESPONSE_FIELDS.get(key, RAW).encode(value, rows) for key, value in payload.items()})
+
+
+def decode(data: bytes, nation_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Inverse of :func:`encode`.
+
+    ``nation_ids`` may be omitted when the response carries ``state.nations``.
+    """
+
+    payload = unpackb(data)
+    if nation_ids is None:
+        nations = (payload.get("state") or {}).get("nations") or []
+        nation_ids = [item[_NATION_ID_COLUMN] for item in nations]
+    ids = list(nation_ids)
+    return {key: RESPONSE_FIELDS.get(key, RAW).decode(value, ids) for key, value in payload.items()}
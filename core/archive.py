@@ -0,0 +1,161 @@
+"""Append-only on-disk archive for events evicted from endless runs.
+
+Each run gets two files in the archive directory:
+
+* ``<run_id>.events.jsonl`` – one serialized event per line,
+* ``<run_id>.events.idx`` – a fixed-width (8 byte) byte offset per event.
+
+The offset index makes paging O(limit): a page starting at event ``n`` seeks
+straight to entry ``n`` instead of scanning the log.
+
+A forked run's archive starts out as a view of its parent's: the first
+``len(base)`` events are read from the parent's files and only events archived
+after the fork are written to the fork's own.
+
+:meth:`EventArchive.chain` and :meth:`EventArchive.reopen` let a run snapshot
+refer to its archive by run ids and lengths instead of copying it.  Run ids
+become file names, so :meth:`~EventArchive.reopen` only accepts ids of the
+form ``run_<8 hex digits>``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_OFFSET = struct.Struct("<Q")
+RUN_ID = re.compile(r"run_[0-9a-f]{8}")  # see GameEngine.start_run; also the archive file stem
+
+
+class EventArchive:
+    """Append-only JSONL archive of one run's evicted events."""
+
+    def __init__(
+        self, directory: Path, run_id: str, base: Optional[EventArchive] = None, count: Optional[int] = None
+    ) -> None:
+        """Start an empty archive for ``run_id``, resetting any files left under that id.
+
+        Passing ``count`` instead adopts the first ``count`` events of the
+        files already on disk (see :meth:`reopen`).
+        """
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id
+        self.data_path = directory / f"{run_id}.events.jsonl"
+        self.index_path = directory / f"{run_id}.events.idx"
+        if count is None:
+            self.data_path.write_bytes(b"")
+            self.index_path.write_bytes(b"")
+            count = 0
+        else:
+            self.data_path.touch()
+            self.index_path.touch()
+        self._count = count
+        self._base = base
+        self._base_count = len(base) if base is not None else 0
+
+    def __len__(self) -> int:
+        return self._base_count + self._count
+
+    def fork(self, directory: Path, run_id: str) -> EventArchive:
+        """Return an archive for ``run_id`` that shares every event archived so far."""
+
+        return EventArchive(directory, run_id, base=self)
+
+    def chain(self) -> List[Tuple[str, int]]:
+        """``(run_id, length)`` for this archive and its bases, oldest base first."""
+
+        links = self._base.chain() if self._base is not None else []
+        if links:
+            links[-1] = (links[-1][0], self._base_count)
+        return links + [(self.run_id, len(self))]
+
+    @classmethod
+    def reopen(cls, directory: Path, run_id: str, chain: Sequence[Tuple[str, int]]) -> EventArchive:
+        """Open ``run_id``'s archive as :meth:`chain` described it.
+
+        The chain must be well formed: run ids only, none repeated, lengths
+        that never shrink and the last link ``run_id`` itself, so it cannot
+        name files outside the run's own lineage.  Each link only exposes
+        its first ``length`` events.  Events archived after the chain was
+        taken stay on disk and are overwritten as the reopened run archives
+        its own; nothing is truncated here.
+        """
+
+        if not chain or chain[-1][0] != run_id:
+            raise ValueError(f"archive chain does not end at {run_id}")
+        seen = set()
+        archive: Optional[EventArchive] = None
+        for link_id, length in chain:
+            if not isinstance(link_id, str) or not RUN_ID.fullmatch(link_id) or link_id in seen:
+                raise ValueError(f"bad archive chain link {link_id!r}")
+            seen.add(link_id)
+            count = length - len(archive) if archive is not None else length
+            if not isinstance(length, int) or count < 0:
+                raise ValueError(f"bad archive length {length!r} for {link_id}")
+            archive = cls(directory, link_id, base=archive, count=count)
+            if archive._stored() < count:
+                raise ValueError(f"archive of {link_id} holds fewer than {count} events")
+        return archive
+
+    def _stored(self) -> int:
+        """Entries in this archive's own index file."""
+
+        return self.index_path.stat().st_size // _OFFSET.size if self.index_path.exists() else 0
+
+    def lineage(self) -> List[EventArchive]:
+        """This archive followed by its bases, newest first."""
+
+        archives: List[EventArchive] = [self]
+        while archives[-1]._base is not None:
+            archives.append(archives[-1]._base)
+        return archives
+
+    def delete(self) -> None:
+        """Remove this archive's own files; bases are left alone."""
+
+        self.data_path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+        self._count = 0
+
+    def extend(self, records: Iterable[dict]) -> None:
+        lines = [json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records]
+        if not lines:
+            return
+        with self.data_path.open("ab") as data, self.index_path.open("r+b") as index:
+            # A reopened archive may have stale entries past its count.
+            index.seek(self._count * _OFFSET.size)
+            offset = data.tell()
+            offsets = bytearray()
+            for line in lines:
+                offsets += _OFFSET.pack(offset)
+                offset += len(line)
+            data.write(b"".join(lines))
+            index.write(offsets)
+        self._count += len(lines)
+
+    def read(self, start: int, limit: int) -> List[dict]:
+        """Return up to ``limit`` archived events starting at position ``start``."""
+
+        start = max(0, start)
+        limit = max(0, limit)
+        records: List[dict] = []
+        if self._base is not None and start < self._base_count:
+            records = self._base.read(start, min(limit, self._base_count - start))
+            limit -= len(records)
+            start = self._base_count
+        start -= self._base_count
+        stop = min(self._count, start + limit)
+        if start >= stop:
+            return records
+        with self.index_path.open("rb") as index:
+            index.seek(start * _OFFSET.size)
+            (offset,) = _OFFSET.unpack(index.read(_OFFSET.size))
+        with self.data_path.open("rb") as data:
+            data.seek(offset)
+            for _ in range(stop - start):
+                records.append(json.loads(data.readline()))
+        return records
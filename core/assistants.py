@@ -0,0 +1,238 @@
+"""Assistant plugins, their triggers and the per-run cooldown timer wheel.
+
+Every assistant class is an :class:`AssistantPlugin` registered with
+:func:`register_assistant`.  A plugin declares the :class:`Trigger` values it
+reacts to and, if it starts locked, the peace streak that unlocks it.  The
+engine only calls the plugins subscribed to a trigger that fired, and
+cooldowns expire through an :class:`AssistantRoster` timer wheel instead of
+being decremented one by one, so a turn touches just the assistants whose
+trigger or timer fires however large the roster grows.
+"""
+
+from __future__ import annotations
+
+import abc
+import enum
+import heapq
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from .models import STABILITY_SCALE, Assistant, AssistantClass, AssistantEffect, GameState, from_milli, to_milli
+from .narrative import Message, msg, shared_msg, turns
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .game import GameEngine
+
+WHEEL_SLOTS = 64  # cooldowns longer than this wait out extra laps of the wheel
+
+
+class Trigger(str, enum.Enum):
+    peace = "peace"  # the turn's decisions kept the peace
+    positive_delta = "positive_delta"  # stability rose this turn
+
+
+@dataclass
+class TriggerContext:
+    """What a firing plugin sees of the turn, and where it reports back."""
+
+    state: GameState
+    involved: List[str]
+    stability_delta: int  # milli-units
+    notes: Dict[str, Message]
+    logs: List[Message] = field(default_factory=list)
+    hints: List[Message] = field(default_factory=list)
+
+
+class AssistantPlugin(abc.ABC):
+    """Base class for an assistant: its roster entry, triggers and behaviour."""
+
+    id = ""
+    triggers: Tuple[Trigger, ...] = ()
+    unlock_streak: Optional[int] = None  # peace streak that unlocks a locked assistant
+    unlock_log: Optional[Message] = None
+    unlock_note: Optional[Message] = None
+
+    @abc.abstractmethod
+    def build(self) -> Assistant:
+        """Return a fresh roster entry for a new run."""
+
+    def locked_note(self, assistant: Assistant) -> Message:
+        return shared_msg("assistant.awaits_omen", assistant.name)
+
+    def ready_note(self, assistant: Assistant) -> Message:
+        return shared_msg("assistant.ready", assistant.name)
+
+    @abc.abstractmethod
+    def fire(self, engine: GameEngine, assistant: Assistant, context: TriggerContext) -> bool:
+        """React to a subscribed trigger; return True if the assistant intervened."""
+
+
+ASSISTANT_PLUGINS: Dict[str, AssistantPlugin] = {}
+PLUGINS_BY_TRIGGER: Dict[Trigger, Tuple[AssistantPlugin, ...]] = {trigger: () for trigger in Trigger}
+
+
+def register_assistant(plugin_class: Type[AssistantPlugin]) -> Type[AssistantPlugin]:
+    """Class decorator adding an assistant plugin to every new run's roster."""
+
+    plugin = plugin_class()
+    ASSISTANT_PLUGINS[plugin.id] = plugin
+    for trigger in plugin.triggers:
+        PLUGINS_BY_TRIGGER[trigger] += (plugin,)
+    return plugin_class
+
+
+class AssistantRoster:
+    """Per-run cooldown clock, timer wheel and unlock index.
+
+    Assistants bound to a roster read and write ``cooldown_remaining``
+    through it.  :meth:`advance` moves the clock one resolved turn and
+    returns the assistants whose cooldown just ran out, looking at a single
+    wheel slot rather than every assistant.
+    """
+
+    def __init__(self, assistants: Dict[str, Assistant]) -> None:
+        self.tick = 0
+        self._ready: Dict[str, int] = {}
+        self._wheel: Dict[int, List[Tuple[int, str]]] = {}  # only slots with pending expiries
+        self._unlocks: List[Tuple[int, str]] = []
+        for assistant in assistants.values():
+            plugin = ASSISTANT_PLUGINS.get(assistant.id)
+            if not assistant.unlocked and plugin is not None and plugin.unlock_streak is not None:
+                heapq.heappush(self._unlocks, (plugin.unlock_streak, assistant.id))
+        self._bind(assistants)
+
+    def _bind(self, assistants: Dict[str, Assistant]) -> None:
+        for assistant in assistants.values():
+            remaining = assistant.cooldown_remaining
+            assistant._roster = self
+            if remaining and assistant.id not in self._ready:
+                self.start_cooldown(assistant.id, remaining)
+
+    def copy(self, assistants: Dict[str, Assistant]) -> AssistantRoster:
+        """Return a roster that continues from this one, bound to ``assistants``."""
+
+        clone = AssistantRoster.__new__(AssistantRoster)
+        clone.tick = self.tick
+        clone._ready = dict(self._ready)
+        clone._wheel = {index: list(slot) for index, slot in self._wheel.items()}
+        clone._unlocks = list(self._unlocks)
+        clone._bind(assistants)
+        return clone
+
+    def remaining(self, assistant_id: str) -> int:
+        return self._ready.get(assistant_id, self.tick) - self.tick
+
+    def start_cooldown(self, assistant_id: str, count: int) -> None:
+        if not count:
+            self._ready.pop(assistant_id, None)
+            return
+        ready = self.tick + count
+        self._ready[assistant_id] = ready
+        if count > 0:
+            self._wheel.setdefault(ready % WHEEL_SLOTS, []).append((ready, assistant_id))
+
+    def advance(self) -> List[str]:
+        """Move to the next turn; return the ids whose cooldown expired."""
+
+        self.tick += 1
+        index = self.tick % WHEEL_SLOTS
+        slot = self._wheel.get(index)
+        if not slot:
+            return []
+        expired = []
+        for ready, assistant_id in slot:
+            # Skip entries superseded by a newer cooldown for the same assistant.
+            if ready == self.tick and self._ready.get(assistant_id) == ready:
+                del self._ready[assistant_id]
+                expired.append(assistant_id)
+        pending = [entry for entry in slot if entry[0] > self.tick]
+        if pending:
+            self._wheel[index] = pending
+        else:
+            del self._wheel[index]
+        return expired
+
+    def due_unlocks(self, peace_streak: int) -> List[str]:
+        """Pop the locked assistants whose unlock streak ``peace_streak`` reaches."""
+
+        due = []
+        while self._unlocks and self._unlocks[0][0] <= peace_streak:
+            due.append(heapq.heappop(self._unlocks)[1])
+        return due
+
+
+@register_assistant
+class Prophet(AssistantPlugin):
+    id = "assistant_prophet"
+    triggers = (Trigger.positive_delta,)
+
+    def build(self) -> Assistant:
+        return Assistant(
+            id=self.id,
+            name="The Prophet",
+            clazz=AssistantClass.prophet,
+            rarity="rare",
+            unlocked=True,
+            level=1,
+            effect=AssistantEffect(type="instability_prediction", magnitude=0.2),
+            cooldown=3,
+            flavor_text="The Prophet whispers of coming storms.",
+        )
+
+    def fire(self, engine: GameEngine, assistant: Assistant, context: TriggerContext) -> bool:
+        if assistant.cooldown_remaining > 0:
+            context.notes[assistant.id] = msg("prophet.cooling", assistant.name, turns(assistant.cooldown_remaining))
+            return False
+        hint = engine._reveal_hidden_trait(context.state, context.involved)
+        if not hint:
+            context.notes[assistant.id] = shared_msg("prophet.no_secrets", assistant.name)
+            return False
+        assistant.cooldown_remaining = assistant.cooldown
+        context.notes[assistant.id] = msg("prophet.vision", assistant.name, turns(assistant.cooldown))
+        context.logs.append(shared_msg("prophet.vision_log"))
+        context.hints.append(hint)
+        return True
+
+
+@register_assistant
+class Diplomat(AssistantPlugin):
+    id = "assistant_diplomat"
+    triggers = (Trigger.peace,)
+    unlock_streak = 5
+    unlock_log = shared_msg("diplomat.unlocked_log")
+    unlock_note = shared_msg("diplomat.unlocked_note")
+
+    def build(self) -> Assistant:
+        return Assistant(
+            id=self.id,
+            name="The Diplomat",
+            clazz=AssistantClass.diplomat,
+            rarity="epic",
+            unlocked=False,
+            level=1,
+            effect=AssistantEffect(type="stability_boost", magnitude=0.05),
+            cooldown=2,
+            flavor_text="The Diplomat bides their time, ready to weave unshakable treaties.",
+        )
+
+    def locked_note(self, assistant: Assistant) -> Message:
+        return shared_msg("diplomat.locked")
+
+    def fire(self, engine: GameEngine, assistant: Assistant, context: TriggerContext) -> bool:
+        """Grant a stability bonus on peaceful turns."""
+
+        state = context.state
+        if assistant.cooldown_remaining > 0:
+            context.notes[assistant.id] = msg("diplomat.cooling", assistant.name, turns(assistant.cooldown_remaining))
+            return False
+        previous = state.stability_milli
+        state.stability_milli = min(STABILITY_SCALE, previous + to_milli(assistant.effect.magnitude))
+        actual = state.stability_milli - previous
+        if actual <= 0:
+            context.notes[assistant.id] = shared_msg("diplomat.poised", assistant.name)
+            return False
+        assistant.cooldown_remaining = assistant.cooldown
+        context.notes[assistant.id] = msg("diplomat.brokered", assistant.name, turns(assistant.cooldown))
+        context.logs.append(msg("diplomat.smooths", assistant.name, from_milli(actual)))
+        context.stability_delta += actual
+        return True
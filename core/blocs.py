@@ -0,0 +1,140 @@
+"""Alliance bloc tracking for the Lazy God engine.
+
+Nations joined by ``allied`` relations form blocs (connected components of
+the alliance graph).  :class:`AllianceBlocs` maintains those components
+incrementally with a union-find, so "which bloc is this nation in" and bloc
+counts/sizes are near O(1) per turn.  Union-find cannot split sets, so when an
+alliance dissolves only the affected bloc is rebuilt from its remaining
+alliance edges.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Set
+
+
+class AllianceBlocs:
+    """Union-find over nations connected by ``allied`` relations."""
+
+    def __init__(self, nation_ids: Iterable[str]) -> None:
+        self.ids: List[str] = list(nation_ids)
+        self.rows: Dict[str, int] = {nid: row for row, nid in enumerate(self.ids)}
+        self._parent: List[int] = list(range(len(self.ids)))
+        self._members: Dict[int, List[int]] = {row: [row] for row in range(len(self.ids))}
+        self._allies: Dict[int, Set[int]] = {}
+        self._bloc_count = 0
+        self._shared = False  # structures also held by a copy: copy them before changing them
+
+    def copy(self) -> AllianceBlocs:
+        """Return equal blocs; both share the union-find until one of them changes it."""
+
+        clone = AllianceBlocs.__new__(AllianceBlocs)
+        clone.ids, clone.rows = self.ids, self.rows  # never mutated after construction
+        clone._parent, clone._members, clone._allies = self._parent, self._members, self._allies
+        clone._bloc_count = self._bloc_count
+        clone._shared = self._shared = True
+        return clone
+
+    def _unshare(self) -> None:
+        if self._shared:
+            self._parent = list(self._parent)
+            self._members = {root: list(members) for root, members in self._members.items()}
+            self._allies = {row: set(allies) for row, allies in self._allies.items()}
+            self._shared = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The union-find itself, so bloc roots and member order survive a restore."""
+
+        return {
+            "ids": list(self.ids),
+            "parent": list(self._parent),
+            "members": [[root, list(members)] for root, members in self._members.items()],
+            "allies": [[row, list(allies)] for row, allies in self._allies.items()],
+            "bloc_count": self._bloc_count,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> AllianceBlocs:
+        blocs = cls(data["ids"])
+        blocs._parent = list(data["parent"])
+        blocs._members = {root: list(members) for root, members in data["members"]}
+        blocs._allies = {row: set(allies) for row, allies in data["allies"]}
+        blocs._bloc_count = data["bloc_count"]
+        return blocs
+
+    def _find(self, row: int) -> int:
+        # Path compression may write to a shared list: it never changes a root.
+        parent = self._parent
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    def _union(self, a: int, b: int) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        size_a, size_b = len(self._members[root_a]), len(self._members[root_b])
+        self._bloc_count += 1 - (size_a > 1) - (size_b > 1)
+        if size_a < size_b:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._members[root_a].extend(self._members.pop(root_b))
+
+    def _rebuild(self, root: int) -> None:
+        """Split a bloc back into components after an alliance dissolves."""
+
+        members = self._members.pop(root)
+        if len(members) > 1:
+            self._bloc_count -= 1
+        for row in members:
+            self._parent[row] = row
+            self._members[row] = [row]
+        for row in members:
+            for ally in self._allies.get(row, ()):
+                self._union(row, ally)
+
+    def ally(self, a: str, b: str) -> None:
+        row_a, row_b = self.rows[a], self.rows[b]
+        self._unshare()
+        self._allies.setdefault(row_a, set()).add(row_b)
+        self._allies.setdefault(row_b, set()).add(row_a)
+        self._union(row_a, row_b)
+
+    def dissolve(self, a: str, b: str) -> bool:
+        """Remove the alliance between ``a`` and ``b``; return True if one existed."""
+
+        row_a, row_b = self.rows[a], self.rows[b]
+        if row_b not in self._allies.get(row_a, ()):
+            return False
+        self._unshare()
+        self._allies[row_a].discard(row_b)
+        self._allies[row_b].discard(row_a)
+        self._rebuild(self._find(row_a))
+        return True
+
+    def bloc_of(self, nation_id: str) -> str:
+        """Return the identifier (root nation id) of the bloc containing ``nation_id``."""
+
+        return self.ids[self._find(self.rows[nation_id])]
+
+    def bloc_size(self, nation_id: str) -> int:
+        return len(self._members[self._find(self.rows[nation_id])])
+
+    def same_bloc(self, a: str, b: str) -> bool:
+        return self._find(self.rows[a]) == self._find(self.rows[b])
+
+    @property
+    def bloc_count(self) -> int:
+        """Number of multi-nation blocs."""
+
+        return self._bloc_count
+
+    def to_list(self) -> List[dict]:
+        blocs = [
+            {"id": self.ids[root], "size": len(members), "members": [self.ids[row] for row in members]}
+            for root, members in self._members.items()
+            if len(members) > 1
+        ]
+        blocs.sort(key=lambda bloc: (-bloc["size"], bloc["id"]))
+        return blocs
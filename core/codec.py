@@ -0,0 +1,129 @@
+"""Serializers generated once per model class.
+
+``dataclasses.asdict`` inspects every field at call time and deep-copies as
+it recurses.  :class:`Codec` instead writes a ``dump`` function (object to
+dict) and a ``load`` function (dict to object) for one class at import time,
+with each field's conversion inlined, and compiles them with :func:`exec`.
+A dump is then a single dict display and a load a single constructor call.
+
+Conversions are :class:`Conv` expression templates in which ``{v}`` stands
+for the value being converted::
+
+    Codec(Nation, primary_race=enum_conv(Race), relations=DICT)
+
+A conversion whose ``dump`` is ``None`` is not written at all; its ``load``
+expression rebuilds the field from the rest of ``data`` instead.
+
+Only fields accepted by the constructor are serialized, so ``init=False``
+caches and bindings never leave the process.  The generated source is kept
+on :attr:`Codec.source` for debugging.
+"""
+
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+@dataclass(frozen=True)
+class Conv:
+    """How one field is written and read back; ``{v}`` is the value."""
+
+    dump: Optional[str] = "{v}"
+    load: str = "{v}"
+    key: Optional[str] = None  # dict key, when it differs from the field name
+    names: Mapping[str, Any] = field(default_factory=dict)  # globals the templates refer to
+
+
+PLAIN = Conv()
+LIST = Conv("list({v})", "list({v})")
+TUPLE = Conv("list({v})", "tuple({v})")
+DICT = Conv("dict({v})", "dict({v})")
+
+
+def enum_conv(enum_class: type[enum.Enum], value: bool = True) -> Conv:
+    """Write an enum member as its value (or as itself, for ``str`` enums); read back the member."""
+
+    name = f"_{enum_class.__name__}"
+    return Conv("{v}.value" if value else "{v}", f"{name}({{v}})", names={name: enum_class})
+
+
+def call(dump: Callable[[Any], Any], load: Callable[[Any], Any], key: Optional[str] = None) -> Conv:
+    """Convert with a pair of functions (``key`` renames the dict entry)."""
+
+    dump_name, load_name = f"_dump_{dump.__name__}", f"_load_{load.__name__}"
+    return Conv(f"{dump_name}({{v}})", f"{load_name}({{v}})", key, {dump_name: dump, load_name: load})
+
+
+def _model(codec: Codec) -> Tuple[str, str, Dict[str, Any]]:
+    name = codec.cls.__name__
+    return f"_dump_{name}", f"_load_{name}", {f"_dump_{name}": codec.dump, f"_load_{name}": codec.load}
+
+
+def nested(codec: Codec, optional: bool = False) -> Conv:
+    """A field holding another model, written with that model's codec."""
+
+    dump_name, load_name, names = _model(codec)
+    if optional:
+        return Conv(
+            f"None if {{v}} is None else {dump_name}({{v}})",
+            f"None if {{v}} is None else {load_name}({{v}})",
+            names=names,
+        )
+    return Conv(f"{dump_name}({{v}})", f"{load_name}({{v}})", names=names)
+
+
+def each(codec: Codec, container: Union[str, type] = "list") -> Conv:
+    """A field holding a sequence of models, rebuilt as ``container`` (a builtin's name or a class)."""
+
+    dump_name, load_name, names = _model(codec)
+    if isinstance(container, type):
+        name = f"_{container.__name__}"
+        names, container = {**names, name: container}, name
+    return Conv(
+        f"[{dump_name}(item) for item in {{v}}]", f"{container}({load_name}(item) for item in {{v}})", names=names
+    )
+
+
+def derived(load: str, **names: Any) -> Conv:
+    """A field that is not written but rebuilt by ``load`` (which may read ``data``)."""
+
+    return Conv(None, load, names=names)
+
+
+class Codec:
+    """Generated ``dump``/``load`` pair for a dataclass.
+
+    ``order`` lists field names in output order (default: declaration
+    order); every other keyword maps a field name to its :class:`Conv`.
+    """
+
+    def __init__(self, cls: type, order: Sequence[str] = (), **convs: Conv) -> None:
+        self.cls = cls
+        init_fields = [f.name for f in fields(cls) if f.init]
+        unknown = set(convs) - set(init_fields)
+        if unknown:
+            raise ValueError(f"{cls.__name__} has no init fields {sorted(unknown)}")
+        names = list(order) or init_fields
+        if sorted(names) != sorted(init_fields):
+            raise ValueError(f"order must list every init field of {cls.__name__}")
+        entries: List[Tuple[str, str, Conv]] = []
+        for name in names:
+            conv = convs.get(name, PLAIN)
+            entries.append((name, conv.key or name, conv))
+        namespace: Dict[str, Any] = {"_cls": cls}
+        for name, _, conv in entries:
+            for global_name, value in conv.names.items():
+                if namespace.setdefault(global_name, value) is not value:
+                    raise ValueError(f"{cls.__name__}.{name}: {global_name} already names another object")
+        dumped = ", ".join(
+            f"{key!r}: {conv.dump.replace('{v}', f'obj.{name}')}"
+            for name, key, conv in entries
+            if conv.dump is not None
+        )
+        loaded = ", ".join(f"{name}={conv.load.replace('{v}', f'data[{key!r}]')}" for name, key, conv in entries)
+        self.source = f"def dump(obj):\n    return {{{dumped}}}\n\ndef load(data):\n    return _cls({loaded})\n"
+        exec(compile(self.source, f"<codec {cls.__name__}>", "exec"), namespace)
+        self.dump: Callable[[Any], Dict[str, Any]] = namespace["dump"]
+        self.load: Callable[[Mapping[str, Any]], Any] = namespace["load"]
@@ -8,10 +8,12 @@ milestones.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
 
-from .models import Demeanor, EconomyType, EventChoiceEffect, EventKind, Race
+from .models import CompiledEffects, Demeanor, EconomyType, EventChoice, EventChoiceEffect, EventKind, Race, compile_effects
+from .narrative import ENGLISH
+from .traits import TRAITS
 
 
 @dataclass(frozen=True)
@@ -197,6 +199,55 @@ NATION_ARCHETYPES: List[NationArchetype] = [
     ),
 ]
 
+# Extra traits rolled onto nations whose archetype defines fewer than three.
+OPTIONAL_TRAITS: Tuple[str, ...] = (
+    "blood_feud",
+    "xenophile",
+    "zealot",
+    "isolationist",
+    "mercantile",
+    "mystic",
+    "martial_culture",
+    "expansionist",
+    "pacifist",
+    "plutocracy",
+    "festival_culture",
+    "storm_riders",
+    "shadow_brokers",
+)
+
+for _archetype in NATION_ARCHETYPES:
+    TRAITS.mask(_archetype.hidden_traits)
+TRAITS.mask(OPTIONAL_TRAITS)
+ENGLISH.update({f"trait.{TRAITS.name(bit)}": TRAITS.name(bit).replace("_", " ") for bit in range(len(TRAITS))})
+
+
+@dataclass(frozen=True)
+class FollowUp:
+    """A consequence that lands ``delay`` turns after a choice is made.
+
+    Follow-ups either spawn another event (``template_key``) with the same
+    nations, or apply delayed ``effects`` when the due turn is resolved.
+    """
+
+    choice: str
+    delay: int
+    template_key: str = ""
+    effects: Tuple[EventChoiceEffect, ...] = ()
+    note: str = ""
+    compiled: CompiledEffects = field(init=False, repr=False, compare=False)
+    note_code: str = field(init=False, default="", repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compiled", compile_effects(self.effects))
+
+
+CHOICE_LABELS = (
+    ("peace", "Champion cooperation"),
+    ("hostile", "Apply divine pressure"),
+    ("trade", "Broker clever trade"),
+)
+
 
 @dataclass(frozen=True)
 class EventTemplate:
@@ -210,6 +261,33 @@ class EventTemplate:
     hostile_effects: Tuple[EventChoiceEffect, ...]
     trade_effects: Tuple[EventChoiceEffect, ...]
     punchline: str
+    follow_ups: Tuple[FollowUp, ...] = ()
+    choices: Tuple[EventChoice, ...] = field(init=False, repr=False, compare=False)
+    summary_code: str = field(init=False, repr=False, compare=False)
+    punchline_code: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Compiled once here; every event from this template shares the same choices.
+        effects = {"peace": self.peace_effects, "hostile": self.hostile_effects, "trade": self.trade_effects}
+        choices = tuple(EventChoice(key=key, label=label, effects=effects[key]) for key, label in CHOICE_LABELS)
+        object.__setattr__(self, "choices", choices)
+        # Events only carry message codes; the authored text goes into the
+        # catalogue through messages().
+        for index, follow_up in enumerate(self.follow_ups):
+            object.__setattr__(follow_up, "note_code", f"event.{self.key}.follow_up.{index}")
+        object.__setattr__(self, "summary_code", f"event.{self.key}.summary")
+        object.__setattr__(self, "punchline_code", f"event.{self.key}.punchline")
+
+    def messages(self) -> Dict[str, str]:
+        """This template's authored text keyed by message code, in catalogue form."""
+
+        messages = {
+            self.summary_code: self.summary_template.replace("{a}", "{0}").replace("{b}", "{1}"),
+            self.punchline_code: self.punchline,
+        }
+        for follow_up in self.follow_ups:
+            messages[follow_up.note_code] = follow_up.note
+        return messages
 
 
 def _effects(stability: float, score: int) -> Tuple[EventChoiceEffect, ...]:
@@ -241,6 +319,7 @@ EVENT_TEMPLATES: List[EventTemplate] = [
         hostile_effects=_effects(-0.25, 70),
         trade_effects=_effects(0.04, 60),
         punchline="The goat is later elected mayor of the disputed valley.",
+        follow_ups=(FollowUp(choice="hostile", delay=4, template_key="goat_memoirs"),),
     ),
     EventTemplate(
         key="arcane_trade",
@@ -251,6 +330,14 @@ EVENT_TEMPLATES: List[EventTemplate] = [
         hostile_effects=_effects(-0.15, 55),
         trade_effects=_effects(0.11, 130),
         punchline="Express delivery now guaranteed before the thought even finishes.",
+        follow_ups=(
+            FollowUp(
+                choice="trade",
+                delay=2,
+                effects=_effects(0.02, 80),
+                note="Portal postage tolls finally clear customs.",
+            ),
+        ),
     ),
     EventTemplate(
         key="oracle_dispute",
@@ -351,6 +438,14 @@ EVENT_TEMPLATES: List[EventTemplate] = [
         hostile_effects=_effects(-0.27, 85),
         trade_effects=_effects(0.06, 95),
         punchline="The paperwork stack is taller than most mortal heroes.",
+        follow_ups=(
+            FollowUp(
+                choice="peace",
+                delay=3,
+                effects=_effects(0.05, 120),
+                note="The renewed truce pays its first dividends.",
+            ),
+        ),
     ),
     EventTemplate(
         key="guild_strike",
@@ -491,6 +586,7 @@ EVENT_TEMPLATES: List[EventTemplate] = [
         hostile_effects=_effects(-0.24, 80),
         trade_effects=_effects(0.04, 85),
         punchline="You officially declare the insult outdated and introduce new approved insults.",
+        follow_ups=(FollowUp(choice="hostile", delay=5, template_key="grudge_resurfaces"),),
     ),
     EventTemplate(
         key="mirror_expedition",
@@ -654,3 +750,44 @@ EVENT_TEMPLATES: List[EventTemplate] = [
     ),
 ]
 
+
+# Templates that only appear as scheduled follow-ups, never as random draws.
+FOLLOW_UP_TEMPLATES: List[EventTemplate] = [
+    EventTemplate(
+        key="goat_memoirs",
+        kind=EventKind.interaction,
+        summary_template="The disputed goat publishes memoirs blaming {a} and {b} for everything.",
+        tags=("conflict", "comedy", "follow_up"),
+        peace_effects=_effects(0.1, 120),
+        hostile_effects=_effects(-0.2, 60),
+        trade_effects=_effects(0.06, 140),
+        punchline="The book tour sells out; the goat refuses to sign anything but treaties.",
+    ),
+    EventTemplate(
+        key="grudge_resurfaces",
+        kind=EventKind.interaction,
+        summary_template="{a} commissions an opera about the 900-year-old insult and premieres it at {b}'s border.",
+        tags=("conflict", "tradition", "follow_up"),
+        peace_effects=_effects(0.14, 150),
+        hostile_effects=_effects(-0.28, 90),
+        trade_effects=_effects(0.05, 100),
+        punchline="Critics call the third act a war crime against rhyme.",
+    ),
+]
+
+
+TEMPLATES_BY_KEY: Dict[str, EventTemplate] = {
+    template.key: template for template in EVENT_TEMPLATES + FOLLOW_UP_TEMPLATES
+}
+
+# The shipped templates' text joins the English catalogue once, at import.
+CONTENT_MESSAGES: Dict[str, str] = {
+    code: text for template in TEMPLATES_BY_KEY.values() for code, text in template.messages().items()
+}
+ENGLISH.update(CONTENT_MESSAGES)
+
+# Follow-ups by their note code (unique per template and position), so queued
+# follow-ups can be written to a snapshot and found again on restore.
+FOLLOW_UPS_BY_CODE: Dict[str, FollowUp] = {
+    follow_up.note_code: follow_up for template in TEMPLATES_BY_KEY.values() for follow_up in template.follow_ups
+}
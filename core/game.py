@@ -8,9 +8,17 @@ and debugged.
 
 from __future__ import annotations
 
+import copy
 import random
+import shutil
+import sys
+import tempfile
+import time
 import uuid
-from typing import Dict, List, Optional, Tuple, Union
+import weakref
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from .models import (
     Nation,
@@ -18,56 +26,96 @@ from .models import (
     EconomyType,
     Demeanor,
     Assistant,
-    AssistantClass,
-    AssistantEffect,
     Event,
     EventKind,
     EventChoice,
     EventChoiceEffect,
     EventResolution,
+    EffectOp,
     GameState,
+    NationMap,
     StabilityState,
+    STABILITY_SCALE,
     Decision,
+    from_milli,
+    shared_tuple,
 )
 
-from .content import EVENT_TEMPLATES, NATION_ARCHETYPES, EventTemplate, NationArchetype
+from .archive import EventArchive
+from .assistants import ASSISTANT_PLUGINS, PLUGINS_BY_TRIGGER, AssistantRoster, Trigger, TriggerContext
+from .blocs import AllianceBlocs
+from .history import StabilityHistory
+from .memory import RunMemory, deep_sizeof, shared_content_ids
+from .narrative import Message, msg, plural, shared_msg, turns
+from .rng import RunStreams
+from .content import (
+    EVENT_TEMPLATES,
+    NATION_ARCHETYPES,
+    OPTIONAL_TRAITS,
+    TEMPLATES_BY_KEY,
+    EventTemplate,
+    NationArchetype,
+)
+from .sampling import NationPairSampler
+from .scheduler import EventScheduler, ScheduledItem
+from .sharing import DecisionTape, LayeredDict, SharedLog
+from .snapshot import SNAPSHOT_VERSION, STATE_SNAPSHOT
+from .traits import TRAITS, pick_bit
+from .world import WorldTable
 
 
-GOD_QUIPS = {
-    StabilityState.golden_age: "Behold! Mortals write musicals about your benevolence.",
-    StabilityState.peaceful: "A serene hum blankets the world—don't nap through it.",
-    StabilityState.stable: "Steady as a cosmic sofa. Comfortable, but keep an eye open.",
-    StabilityState.tense: "You can almost hear the tea cups rattling. Maybe intervene?",
-    StabilityState.chaotic: "Fires everywhere. Some metaphorical, some disappointingly real.",
-}
+# Catalogue codes (see ``core.narrative``) for god quips; each tuple is a
+# pool one quip is drawn from.
+GOD_QUIPS = {state: f"quip.{state.value}" for state in StabilityState}
 
 ASSISTANT_TRIGGER_QUIPS = {
-    "assistant_prophet": [
-        "Your prophet hums cosmic chords as secrets unfurl.",
-        "Visions ripple outward—apparently destiny smells like cardamom.",
-    ],
-    "assistant_diplomat": [
-        "The Diplomat already drafts thank-you notes for both sides.",
-        "Treaties flutter like confetti—clearly someone's networking hard.",
-    ],
+    "assistant_prophet": ("quip.prophet.0", "quip.prophet.1"),
+    "assistant_diplomat": ("quip.diplomat.0", "quip.diplomat.1"),
+}
+
+# Event participant weighting: restless, powerful and embattled nations are
+# pulled into events more often.  The floor keeps quiet nations in rotation.
+PAIR_WEIGHT_FLOOR = 0.1
+PAIR_WEIGHT_UNREST = 2.0
+PAIR_WEIGHT_POWER = 1.0
+PAIR_WEIGHT_TENSION = 0.5
+
+# Relation each decision establishes between an event's participants, plus the
+# stability swing when a decision reinforces or breaks an alliance bloc.
+DECISION_RELATIONS = {
+    Decision.peace.value: "allied",
+    Decision.hostile.value: "hostile",
+    Decision.trade.value: "trading",
 }
+# One byte per resolved decision in a run's decision tape.
+DECISION_CODES = {Decision.peace.value: 0, Decision.hostile.value: 1, Decision.trade.value: 2}
+BLOC_SOLIDARITY_BONUS = 20  # stability milli-units
+BLOC_FRACTURE_PENALTY = 40
+
+# Endless runs keep this many recent events and quips in memory by default;
+# older events are archived to disk.
+DEFAULT_EVENT_WINDOW = 50
 
 RUN_END_QUIPS = {
-    "won": [
-        "Mortals declare an annual nap-day in your honour.",
-        "Peace lingers like a warm blanket—you may actually be good at this.",
-    ],
-    "collapsed": [
-        "The cosmos winces. Maybe bring extra snacks next time.",
-        "Chaos reigns and your couch privileges are revoked—for now.",
-    ],
-    "turn_limit": [
-        "Time runs out with mortals still mid-squabble—classic.",
-        "The clock sighs louder than the nations. Perhaps a rematch?",
-    ],
+    "won": ("quip.won.0", "quip.won.1"),
+    "collapsed": ("quip.collapsed.0", "quip.collapsed.1"),
+    "turn_limit": ("quip.turn_limit.0", "quip.turn_limit.1"),
 }
 
 
+@dataclass
+class EffectBatch:
+    """Changes collected while applying one decision's targeted effects."""
+
+    relation_changes: List[Tuple[str, str, str]]
+    logs: List[Message]
+    streaks: Dict[str, int]
+    stability: int = 0  # milli-units
+
+
+EffectHandler = Callable[[GameState, List[str], str, float, EffectBatch], None]
+
+
 class GameEngine:
     """Encapsulates the game state and rules.
 
@@ -76,40 +124,53 @@ class GameEngine:
     would persist state in a database.
     """
 
-    def __init__(self, seed: Optional[int] = None) -> None:
+    def __init__(self, seed: Optional[int] = None, archive_dir: Optional[Path] = None) -> None:
         self.seed = seed if seed is not None else random.randint(1, 1_000_000)
         self.rng = random.Random(self.seed)
+        self._archive_dir = archive_dir
         self.active_runs: Dict[str, GameState] = {}
-        self.run_rngs: Dict[str, random.Random] = {}
+        self.run_rngs: Dict[str, RunStreams] = {}
+        self.run_samplers: Dict[str, NationPairSampler] = {}
+        self.run_worlds: Dict[str, WorldTable] = {}
+        self.run_archives: Dict[str, EventArchive] = {}
+        self.run_tapes: Dict[str, DecisionTape] = {}
+        self.run_started_at: Dict[str, float] = {}
+        self.run_rosters: Dict[str, AssistantRoster] = {}
+        self._effect_handlers: Dict[EffectOp, EffectHandler] = {
+            EffectOp.nation: self._apply_nation_effect,
+            EffectOp.relation: self._apply_relation_effect,
+            EffectOp.streak: self._apply_streak_effect,
+        }
+
+    @property
+    def archive_dir(self) -> Path:
+        """Where endless runs archive evicted events.
+
+        Without an explicit directory each engine gets a private temporary
+        one, created on first use and removed with the engine.
+        """
+        if self._archive_dir is None:
+            self._archive_dir = Path(tempfile.mkdtemp(prefix="lazy_god_archive_"))
+            weakref.finalize(self, shutil.rmtree, self._archive_dir, True)
+        return self._archive_dir
 
-    def _generate_nation(self, run_id: str, archetype: NationArchetype) -> Nation:
-        run_rng = self.run_rngs[run_id]
+    def _generate_nation(
+        self, run_id: str, archetype: NationArchetype, taken: Optional[Dict[str, Nation]] = None
+    ) -> Nation:
+        run_rng = self.run_rngs[run_id].stream(0, "world")
         nid = f"nation_{run_rng.getrandbits(32):08x}"
+        while taken and nid in taken:
+            nid = f"nation_{run_rng.getrandbits(32):08x}"
         name = self._make_name(run_rng, archetype)
         prosperity = round(run_rng.uniform(*archetype.prosperity_range), 2)
         unrest = round(run_rng.uniform(*archetype.unrest_range), 2)
         power = round(run_rng.uniform(*archetype.power_range), 2)
         population = run_rng.randint(15_000, 90_000_000)
         base_traits = list(archetype.hidden_traits)
-        optional_traits = [
-            "blood_feud",
-            "xenophile",
-            "zealot",
-            "isolationist",
-            "mercantile",
-            "mystic",
-            "martial_culture",
-            "expansionist",
-            "pacifist",
-            "plutocracy",
-            "festival_culture",
-            "storm_riders",
-            "shadow_brokers",
-        ]
         # ensure optional traits differ from base ones
-        extra_choices = [t for t in optional_traits if t not in base_traits]
+        extra_choices = [t for t in OPTIONAL_TRAITS if t not in base_traits]
         run_rng.shuffle(extra_choices)
-        hidden_traits: List[HiddenTrait] = base_traits + extra_choices[: max(0, 3 - len(base_traits))]
+        hidden_traits = base_traits + extra_choices[: max(0, 3 - len(base_traits))]
         return Nation(
             id=nid,
             name=name,
@@ -117,7 +178,7 @@ class GameEngine:
             primary_race=archetype.race,
             economy_type=archetype.economy,
             demeanor=archetype.demeanor,
-            hidden_traits=hidden_traits,
+            hidden_mask=TRAITS.mask(hidden_traits),
             power=power,
             population=population,
             prosperity=prosperity,
@@ -128,81 +189,47 @@ class GameEngine:
         prefix = run_rng.choice(archetype.name_prefixes)
         suffix = run_rng.choice(archetype.name_suffixes)
         joiner = " " if run_rng.random() > 0.5 else ""
-        return prefix + joiner + suffix
+        # Names repeat across runs; interning keeps one copy of each.
+        return sys.intern(prefix + joiner + suffix)
 
     def _generate_assistants(self, unlocked_flags: Optional[Dict[str, bool]] = None) -> Dict[str, Assistant]:
-        """Return the baseline roster of assistants for a new run."""
-
-        prophet = Assistant(
-            id="assistant_prophet",
-            name="The Prophet",
-            clazz=AssistantClass.prophet,
-            rarity="rare",
-            unlocked=True,
-            level=1,
-            effect=AssistantEffect(type="instability_prediction", magnitude=0.2),
-            cooldown=3,
-            flavor_text="The Prophet whispers of coming storms.",
-        )
-        diplomat = Assistant(
-            id="assistant_diplomat",
-            name="The Diplomat",
-            clazz=AssistantClass.diplomat,
-            rarity="epic",
-            unlocked=False,
-            level=1,
-            effect=AssistantEffect(type="stability_boost", magnitude=0.05),
-            cooldown=2,
-            flavor_text="The Diplomat bides their time, ready to weave unshakable treaties.",
-        )
+        """Return the baseline roster of assistants for a new run, one per registered plugin."""
+
         unlocked_flags = unlocked_flags or {}
-        prophet.unlocked = unlocked_flags.get(prophet.id, True)
-        diplomat.unlocked = unlocked_flags.get(diplomat.id, diplomat.unlocked)
-        prophet.cooldown_remaining = 0
-        diplomat.cooldown_remaining = 0
-        return {
-            prophet.id: prophet,
-            diplomat.id: diplomat,
-        }
+        assistants: Dict[str, Assistant] = {}
+        for plugin in ASSISTANT_PLUGINS.values():
+            assistant = plugin.build()
+            assistant.unlocked = unlocked_flags.get(assistant.id, assistant.unlocked)
+            assistants[assistant.id] = assistant
+        return assistants
 
-    def _initial_assistant_notes(self, assistants: Dict[str, Assistant]) -> Dict[str, str]:
-        notes: Dict[str, str] = {}
+    def _initial_assistant_notes(self, assistants: Dict[str, Assistant]) -> Dict[str, Message]:
+        notes: Dict[str, Message] = {}
         for assistant in assistants.values():
             if assistant.unlocked:
-                if assistant.cooldown_remaining > 0:
-                    turn_word = "turn" if assistant.cooldown_remaining == 1 else "turns"
-                    notes[assistant.id] = (
-                        f"{assistant.name} prepares quietly ({assistant.cooldown_remaining} {turn_word} remaining)."
-                    )
-                else:
-                    notes[assistant.id] = f"{assistant.name} is ready to intervene at your signal."
+                notes[assistant.id] = shared_msg("assistant.ready_at_signal", assistant.name)
             else:
-                if assistant.id == "assistant_diplomat":
-                    notes[assistant.id] = "Maintain a peace streak of five turns to invite The Diplomat."
-                else:
-                    notes[assistant.id] = f"{assistant.name} awaits an omen before joining the roster."
+                notes[assistant.id] = ASSISTANT_PLUGINS[assistant.id].locked_note(assistant)
         return notes
 
-    def _tick_assistants(self, state: GameState) -> Dict[str, str]:
-        notes: Dict[str, str] = {}
-        for assistant in state.assistants.values():
-            if not assistant.unlocked:
-                if assistant.id == "assistant_diplomat":
-                    notes[assistant.id] = "Maintain a peace streak of five turns to invite The Diplomat."
-                else:
-                    notes[assistant.id] = f"{assistant.name} watches from afar, awaiting your momentum."
-                continue
-            if assistant.cooldown_remaining > 0:
-                assistant.cooldown_remaining = max(0, assistant.cooldown_remaining - 1)
-            if assistant.cooldown_remaining > 0:
-                turn_word = "turn" if assistant.cooldown_remaining == 1 else "turns"
-                notes[assistant.id] = (
-                    f"{assistant.name} regroups between interventions ({assistant.cooldown_remaining} {turn_word} remaining)."
-                )
-            else:
-                notes[assistant.id] = f"{assistant.name} is ready to intervene."
+    def _tick_assistants(self, state: GameState) -> Dict[str, Message]:
+        """Advance the cooldown clock; only assistants whose cooldown expired are touched."""
+
+        notes = state.assistant_notes
+        for assistant_id in self.run_rosters[state.run_id].advance():
+            assistant = state.assistants[assistant_id]
+            notes[assistant_id] = ASSISTANT_PLUGINS[assistant_id].ready_note(assistant)
         return notes
 
+    def _fire_assistants(self, trigger: Trigger, context: TriggerContext) -> None:
+        """Run the unlocked plugins subscribed to ``trigger``, in registration order."""
+
+        assistants = context.state.assistants
+        for plugin in PLUGINS_BY_TRIGGER[trigger]:
+            assistant = assistants.get(plugin.id)
+            if assistant is not None and assistant.unlocked and plugin.fire(self, assistant, context):
+                self._append_assistant_quip(context.state, assistant.id)
+
     def start_run(
         self,
         world_theme: str = "classic_fantasy",
@@ -210,72 +237,135 @@ class GameEngine:
         difficulty: str = "normal",
         seed: Optional[int] = None,
         profile_unlocks: Optional[Dict[str, bool]] = None,
+        world_size: int = 8,
+        events_per_turn: int = 1,
+        endless: bool = False,
+        event_window: int = DEFAULT_EVENT_WINDOW,
     ) -> GameState:
-        """Initialize a new game run with a set of nations and assistants."""
+        """Initialize a new game run with a set of nations and assistants.
+
+        ``world_size`` controls how many nations are generated.  Worlds larger
+        than the archetype catalogue reuse archetypes with replacement.
+        ``events_per_turn`` spawns that many concurrent events on disjoint
+        nation pairs each turn (capped at half the world).  ``endless`` runs
+        ignore ``turn_limit`` and keep only the last ``event_window`` events and
+        quips in memory, archiving older events to disk.
+        """
         run_id = f"run_{uuid.uuid4().hex[:8]}"
         run_seed = seed if seed is not None else self.rng.randint(1, 9_999_999)
-        self.run_rngs[run_id] = random.Random(run_seed)
+        self.run_rngs[run_id] = RunStreams(run_seed)
         # Generate nations from curated archetypes
-        run_rng = self.run_rngs[run_id]
-        archetypes = run_rng.sample(NATION_ARCHETYPES, k=min(8, len(NATION_ARCHETYPES)))
-        nations = {}
+        run_rng = self.run_rngs[run_id].stream(0, "world")
+        world_size = max(2, world_size)
+        if world_size <= len(NATION_ARCHETYPES):
+            archetypes = run_rng.sample(NATION_ARCHETYPES, k=world_size)
+        else:
+            archetypes = run_rng.choices(NATION_ARCHETYPES, k=world_size)
+        nations: Dict[str, Nation] = {}
         for archetype in archetypes:
-            nation = self._generate_nation(run_id, archetype)
+            nation = self._generate_nation(run_id, archetype, nations)
             nations[nation.id] = nation
+        world = WorldTable(list(nations.values()))
         assistants = self._generate_assistants(profile_unlocks)
         assistant_notes = self._initial_assistant_notes(assistants)
         state = GameState(
             run_id=run_id,
             turn=1,
-            stability=0.5,
+            stability_milli=500,
             stability_state=StabilityState.stable,
             score=0,
             peace_streak=0,
             chaos_streak=0,
-            nations=nations,
+            nations=NationMap(nations, world),
             assistants=assistants,
-            events_log=[],
+            events_log=SharedLog(),
             world_theme=world_theme,
             run_status="active",
             turn_limit=turn_limit,
             seed=run_seed,
-            stability_history=[0.5],
-            revealed_traits={nid: [] for nid in nations},
-            god_quips=[],
+            stability_history=StabilityHistory([500]),
+            revealed_mask=LayeredDict(),
+            god_quips=SharedLog(),
             assistant_notes=assistant_notes,
+            blocs=AllianceBlocs(nations),
+            events_per_turn=max(1, min(events_per_turn, len(nations) // 2)),
+            scheduler=EventScheduler(),
+            endless=endless,
+            event_window=max(1, event_window) if endless else 0,
         )
         self.active_runs[run_id] = state
+        self.run_tapes[run_id] = DecisionTape()
+        self.run_started_at[run_id] = time.time()
+        self.run_rosters[run_id] = AssistantRoster(assistants)
+        self.run_worlds[run_id] = world
+        self.run_samplers[run_id] = NationPairSampler(
+            {nid: self._nation_event_weight(nation) for nid, nation in nations.items()}
+        )
         return state
 
-    def _compute_stability_state(self, stability: float) -> StabilityState:
-        if stability >= 0.9:
+    def _nation_event_weight(self, nation: Nation) -> float:
+        """Return how strongly ``nation`` attracts events this turn."""
+
+        tension = sum(1 for status in nation.relations.values() if status == "hostile")
+        return (
+            PAIR_WEIGHT_FLOOR
+            + PAIR_WEIGHT_UNREST * nation.unrest
+            + PAIR_WEIGHT_POWER * nation.power
+            + PAIR_WEIGHT_TENSION * tension
+        )
+
+    def _tick_world(self, state: GameState) -> None:
+        """Evolve every nation's stats and re-weight event participation.
+
+        The sampler is reloaded wholesale rather than point-updated on
+        purpose: the tick drifts every stat of every nation, so every weight
+        moves each turn, and one O(n) reload beats n O(log n) updates.  Point
+        updates are for draws within a turn (see
+        :meth:`~core.sampling.NationPairSampler.sample_disjoint_pairs`).
+        """
+
+        world = self.run_worlds[state.run_id]
+        world.tick(state.stability)
+        self.run_samplers[state.run_id].refresh_all(
+            world.event_weights(PAIR_WEIGHT_FLOOR, PAIR_WEIGHT_UNREST, PAIR_WEIGHT_POWER, PAIR_WEIGHT_TENSION)
+        )
+
+    def _compute_stability_state(self, stability: int) -> StabilityState:
+        """Name the band ``stability`` (in milli-units) falls in."""
+
+        if stability >= 900:
             return StabilityState.golden_age
-        elif stability >= 0.7:
+        elif stability >= 700:
             return StabilityState.peaceful
-        elif stability >= 0.4:
+        elif stability >= 400:
             return StabilityState.stable
-        elif stability >= 0.2:
+        elif stability >= 200:
             return StabilityState.tense
         else:
             return StabilityState.chaotic
 
-    def _generate_event(self, state: GameState) -> Event:
-        run_rng = self.run_rngs[state.run_id]
-        # Choose two random nations for the event
-        nation_ids = run_rng.sample(list(state.nations.keys()), k=2)
-        rare_templates = [template for template in EVENT_TEMPLATES if "rare" in template.tags]
-        common_templates = [template for template in EVENT_TEMPLATES if "rare" not in template.tags]
-        template_pool = common_templates if common_templates else EVENT_TEMPLATES
-        if rare_templates and run_rng.random() < 0.12:
-            template_pool = rare_templates
-        template = run_rng.choice(template_pool)
+    def _generate_event(
+        self,
+        state: GameState,
+        nation_ids: Optional[List[str]] = None,
+        template: Optional[EventTemplate] = None,
+    ) -> Event:
+        run_rng = self.run_rngs[state.run_id].stream(state.turn, "event")
+        # Choose two distinct nations, weighted by unrest, power and tension
+        if nation_ids is None:
+            nation_ids = self.run_samplers[state.run_id].sample_pair(run_rng)
+        if template is None:
+            rare_templates = [template for template in EVENT_TEMPLATES if "rare" in template.tags]
+            common_templates = [template for template in EVENT_TEMPLATES if "rare" not in template.tags]
+            template_pool = common_templates if common_templates else EVENT_TEMPLATES
+            if rare_templates and run_rng.random() < 0.12:
+                template_pool = rare_templates
+            template = run_rng.choice(template_pool)
         name_a = state.nations[nation_ids[0]].name
         name_b = state.nations[nation_ids[1]].name
-        summary = template.summary_template.format(a=name_a, b=name_b)
+        summary = msg(template.summary_code, name_a, name_b)
         choices = self._build_choices_from_template(template)
-        assistant_ids = [
-            aid for aid, assistant in state.assistants.items() if assistant.unlocked
-        ]
+        assistant_ids = shared_tuple(aid for aid, assistant in state.assistants.items() if assistant.unlocked)
         event = Event(
             id=f"event_{run_rng.getrandbits(32):08x}",
             kind=template.kind,
@@ -284,29 +374,130 @@ class GameEngine:
             summary=summary,
             choices=choices,
             template_key=template.key,
-            tags=list(template.tags),
+            tags=template.tags,
             assistant_influence=assistant_ids,
             rng_seed=run_rng.randint(0, 10_000),
         )
         return event
 
-    def _build_choices_from_template(self, template: EventTemplate) -> List[EventChoice]:
-        return [
-            EventChoice(key="peace", label="Champion cooperation", effects=list(template.peace_effects)),
-            EventChoice(key="hostile", label="Apply divine pressure", effects=list(template.hostile_effects)),
-            EventChoice(key="trade", label="Broker clever trade", effects=list(template.trade_effects)),
-        ]
+    def _build_choices_from_template(self, template: EventTemplate) -> Sequence[EventChoice]:
+        return template.choices
 
     def get_state(self, run_id: str) -> Optional[GameState]:
         return self.active_runs.get(run_id)
 
+    def fork_run(self, run_id: str) -> Tuple[Optional[GameState], Optional[str]]:
+        """Branch ``run_id`` into a new run that continues from the same point.
+
+        The branch plays on independently (undo checkpoints, or trying every
+        choice of a pending event).  Forking costs the same however large the
+        world or long the run: nations, relations, the world's columns,
+        blocs, the sampler and the stability history are shared copy-on-write
+        (see :mod:`core.sharing`), resolved events, quips and the decision
+        tape are shared up to the fork point, and archived events stay on
+        disk.  Only the pending events, assistants and their cooldowns, the
+        scheduled follow-ups and the random streams are copied.
+
+        Returns (forked_state, error_message).
+        """
+        parent = self.active_runs.get(run_id)
+        if parent is None:
+            return None, "RUN_NOT_FOUND"
+        fork_id = f"run_{uuid.uuid4().hex[:8]}"
+        world = self.run_worlds[run_id].fork()
+        pending = 0
+        for event in reversed(parent.events_log):
+            if event.resolved:
+                break
+            pending += 1
+        state = replace(
+            parent,
+            run_id=fork_id,
+            nations=parent.nations.fork(world),
+            assistants={aid: replace(assistant) for aid, assistant in parent.assistants.items()},
+            events_log=parent.events_log.fork(pending, copy.copy),
+            stability_history=parent.stability_history.copy(),
+            revealed_mask=parent.revealed_mask.fork(),
+            god_quips=parent.god_quips.fork(),
+            assistant_notes=dict(parent.assistant_notes),
+            blocs=parent.blocs.copy() if parent.blocs else None,
+            scheduler=parent.scheduler.copy() if parent.scheduler else None,
+            version=0,
+        )
+        self.active_runs[fork_id] = state
+        self.run_rngs[fork_id] = self.run_rngs[run_id].copy()
+        self.run_worlds[fork_id] = world
+        self.run_samplers[fork_id] = self.run_samplers[run_id].copy()
+        self.run_tapes[fork_id] = self.run_tapes[run_id].fork()
+        self.run_started_at[fork_id] = self.run_started_at[run_id]
+        self.run_rosters[fork_id] = self.run_rosters[run_id].copy(state.assistants)
+        if run_id in self.run_archives:
+            self.run_archives[fork_id] = self.run_archives[run_id].fork(self.archive_dir, fork_id)
+        return state, None
+
+    def snapshot_run(self, run_id: str) -> Tuple[Optional[dict], Optional[str]]:
+        """Capture ``run_id`` as JSON-safe data that :meth:`restore_run` can rebuild.
+
+        Archived events stay on disk and are referred to, not copied, so a
+        snapshot of an endless run is restored against the same archive
+        directory.  Returns (snapshot, error_message).
+        """
+        state = self.active_runs.get(run_id)
+        if state is None:
+            return None, "RUN_NOT_FOUND"
+        archive = self.run_archives.get(run_id)
+        return {
+            "version": SNAPSHOT_VERSION,
+            "state": STATE_SNAPSHOT.dump(state),
+            "world": self.run_worlds[run_id].snapshot(),
+            "streams": self.run_rngs[run_id].snapshot(),
+            "sampler": self.run_samplers[run_id].snapshot(),
+            "tape": bytes(self.run_tapes[run_id]).hex(),
+            "started_at": self.run_started_at[run_id],
+            "archive": archive.chain() if archive is not None else None,
+        }, None
+
+    def restore_run(self, snapshot: dict) -> Tuple[Optional[GameState], Optional[str]]:
+        """Rebuild a run from :meth:`snapshot_run` under its original id.
+
+        The restored run continues exactly as the original would have.
+        Snapshots are not signed, so only restore ones this server wrote
+        itself; they are deliberately not accepted over the API.  Malformed
+        snapshots, including archive chains that leave the run's own lineage,
+        raise ``KeyError``, ``TypeError`` or ``ValueError`` before anything is
+        registered.  Returns (restored_state, error_message).
+        """
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return None, "SNAPSHOT_UNSUPPORTED"
+        run_id = snapshot["state"]["run_id"]
+        if run_id in self.active_runs:
+            return None, "RUN_EXISTS"
+        state: GameState = STATE_SNAPSHOT.load(snapshot["state"])
+        world = WorldTable.from_snapshot(list(state.nations.values()), snapshot["world"])
+        state.nations.table = world
+        streams = RunStreams.from_snapshot(snapshot["streams"])
+        sampler = NationPairSampler.from_snapshot(snapshot["sampler"])
+        tape = DecisionTape(bytes.fromhex(snapshot["tape"]))
+        if snapshot["archive"]:
+            self.run_archives[run_id] = EventArchive.reopen(self.archive_dir, run_id, snapshot["archive"])
+        self.active_runs[run_id] = state
+        self.run_rngs[run_id] = streams
+        self.run_worlds[run_id] = world
+        self.run_samplers[run_id] = sampler
+        self.run_tapes[run_id] = tape
+        self.run_started_at[run_id] = snapshot["started_at"]
+        # Cooldowns are relative to the roster clock, so a fresh roster picks them up.
+        self.run_rosters[run_id] = AssistantRoster(state.assistants)
+        return state, None
+
     def make_decision(
         self, run_id: str, event_id: str, choice_key: Union[str, Decision]
     ) -> Tuple[Optional[GameState], Optional[str]]:
         """Resolve a decision for a given event and update game state.
 
         Returns a tuple (updated_state, error_message).  If error_message is not None,
-        no state update is performed.
+        no state update is performed.  Runs spawning several events per turn
+        must resolve them together through :meth:`make_decisions`.
         """
         state = self.active_runs.get(run_id)
         if state is None:
@@ -320,253 +511,480 @@ class GameEngine:
             return None, "EVENT_ID_MISMATCH"
         if event.resolved:
             return None, "EVENT_ALREADY_RESOLVED"
-        run_rng = self.run_rngs[state.run_id]
-        assistant_notes = self._tick_assistants(state)
-        # Validate choice
-        choice_key_value = choice_key.value if isinstance(choice_key, Decision) else choice_key
-        choice: Optional[EventChoice] = next((c for c in event.choices if c.key == choice_key_value), None)
+        if len(self._pending_events(state)) > 1:
+            return None, "BATCH_DECISION_REQUIRED"
+        choice = self._find_choice(event, choice_key)
         if not choice:
             return None, "INVALID_CHOICE"
-        # Apply effects
-        stability_delta = 0.0
+        self._resolve_turn(state, [(event, choice)])
+        state.touch()
+        return state, None
+
+    def make_decisions(
+        self, run_id: str, decisions: Sequence[Tuple[str, Union[str, Decision]]]
+    ) -> Tuple[Optional[GameState], Optional[str]]:
+        """Resolve every pending event of the current turn in a single pass.
+
+        ``decisions`` pairs each pending event id with a choice.  All pending
+        events must be covered exactly once; validation happens before any
+        state is touched, so an error leaves the run unchanged.
+        """
+        state = self.active_runs.get(run_id)
+        if state is None:
+            return None, "RUN_NOT_FOUND"
+        pending = self._pending_events(state)
+        if not pending:
+            return None, "NO_ACTIVE_EVENT"
+        pending_by_id = {event.id: event for event in pending}
+        chosen: Dict[str, EventChoice] = {}
+        for event_id, choice_key in decisions:
+            event = pending_by_id.get(event_id)
+            if event is None:
+                return None, "EVENT_ID_MISMATCH"
+            if event_id in chosen:
+                return None, "DUPLICATE_DECISION"
+            choice = self._find_choice(event, choice_key)
+            if not choice:
+                return None, "INVALID_CHOICE"
+            chosen[event_id] = choice
+        if len(chosen) != len(pending):
+            return None, "DECISIONS_INCOMPLETE"
+        self._resolve_turn(state, [(event, chosen[event.id]) for event in pending])
+        state.touch()
+        return state, None
+
+    def _pending_events(self, state: GameState) -> List[Event]:
+        """Return the unresolved events of the current turn, oldest first."""
+
+        pending: List[Event] = []
+        for event in reversed(state.events_log):
+            if event.resolved:
+                break
+            pending.append(event)
+        pending.reverse()
+        return pending
+
+    def _find_choice(self, event: Event, choice_key: Union[str, Decision]) -> Optional[EventChoice]:
+        choice_key_value = choice_key.value if isinstance(choice_key, Decision) else choice_key
+        return next((c for c in event.choices if c.key == choice_key_value), None)
+
+    def _resolve_turn(self, state: GameState, batch: List[Tuple[Event, EventChoice]]) -> None:
+        """Apply one turn's decisions with a single stability and history update."""
+
+        assistant_notes = self._tick_assistants(state)
+        # Apply effects for every event before touching turn-level state
+        stability_delta = 0
         score_delta = 0
-        relation_changes: List[Tuple[str, str, str]] = []
-        logs: List[str] = []
-        for effect in choice.effects:
-            if effect.target == "global" and effect.attribute == "stability":
-                stability_delta += effect.delta
-            elif effect.target == "score" and effect.attribute == "points":
-                score_delta += int(effect.delta)
+        delayed_logs: List[Message] = []
+        delayed_changes: List[Tuple[str, str, str]] = []
+        streak_shifts: Dict[str, int] = {}
+        scheduler = state.scheduler
+        for item in scheduler.pop_due_effects(state.turn) if scheduler else []:
+            compiled = item.follow_up.compiled
+            effects = EffectBatch(delayed_changes, [], streak_shifts)
+            self._apply_effects(state, list(item.nations), compiled.ops, effects)
+            item_stability = compiled.stability + effects.stability
+            item_score = compiled.score
+            stability_delta += item_stability
+            score_delta += item_score
+            delayed_logs.append(
+                msg("log.delayed", shared_msg(item.follow_up.note_code), from_milli(item_stability), item_score)
+            )
+            delayed_logs.extend(effects.logs)
+        outcomes = []
+        for event, choice in batch:
+            event_stability = choice.compiled.stability
+            event_score = choice.compiled.score
+            relation_changes, bloc_delta, event_logs = self._apply_relation_changes(
+                state, event.nations, DECISION_RELATIONS.get(choice.key)
+            )
+            event_stability += bloc_delta
+            if choice.compiled.ops:
+                effects = EffectBatch(relation_changes, event_logs, streak_shifts)
+                self._apply_effects(state, event.nations, choice.compiled.ops, effects)
+                event_stability += effects.stability
+            event_logs.extend(self._schedule_follow_ups(state, event, choice.key))
+            stability_delta += event_stability
+            score_delta += event_score
+            outcomes.append((event, choice.key, event_stability, event_score, relation_changes, event_logs))
+        chosen_keys = {choice.key for _, choice in batch}
+        self.run_tapes[state.run_id].extend(DECISION_CODES.get(choice.key, 255) for _, choice in batch)
+        involved = [nid for event, _ in batch for nid in event.nations]
         previous_stability_state = state.stability_state
-        assistant_logs: List[str] = []
+        assistant_context = TriggerContext(state, involved, 0, assistant_notes)
         # Update stability and compute new state
-        new_stability = max(0.0, min(1.0, round(state.stability + stability_delta, 3)))
-        stability_delta = round(new_stability - state.stability, 3)
-        state.stability = new_stability
+        new_stability = max(0, min(STABILITY_SCALE, state.stability_milli + stability_delta))
+        stability_delta = new_stability - state.stability_milli
+        state.stability_milli = new_stability
         state.score += score_delta
-        # Update streaks
-        if choice_key_value == Decision.peace.value:
-            state.peace_streak += 1
-            state.chaos_streak = 0
-            bonus_logs, bonus_delta, diplomat_triggered = self._apply_diplomat_bonus(state, assistant_notes)
-            if bonus_delta:
-                assistant_logs.extend(bonus_logs)
-                stability_delta = round(stability_delta + bonus_delta, 3)
-            if diplomat_triggered:
-                self._append_assistant_quip(state, "assistant_diplomat")
-        elif choice_key_value == Decision.hostile.value:
+        # Update streaks: any hostile decision breaks the peace for the turn
+        if Decision.hostile.value in chosen_keys:
             state.chaos_streak += 1
             state.peace_streak = 0
+        elif Decision.peace.value in chosen_keys:
+            state.peace_streak += 1
+            state.chaos_streak = 0
+            assistant_context.stability_delta = stability_delta
+            self._fire_assistants(Trigger.peace, assistant_context)
+            stability_delta = assistant_context.stability_delta
         else:
             # trade resets nothing
             pass
-        streak_logs: List[str] = []
+        for streak, shift in streak_shifts.items():
+            attribute = f"{streak}_streak"
+            setattr(state, attribute, max(0, getattr(state, attribute) + shift))
+        streak_logs: List[Message] = []
         if state.peace_streak and state.peace_streak % 3 == 0:
             bonus = 75
             state.score += bonus
-            streak_logs.append(f"Peace streak of {state.peace_streak}! Bonus score +{bonus}.")
-            reveal = self._reveal_hidden_trait(state, event.nations)
+            streak_logs.append(msg("log.peace_streak", state.peace_streak, bonus))
+            reveal = self._reveal_hidden_trait(state, involved)
             if reveal:
                 streak_logs.append(reveal)
         if state.chaos_streak and state.chaos_streak % 3 == 0:
             penalty = 40
             state.score = max(0, state.score - penalty)
-            streak_logs.append(f"Chaos streak of {state.chaos_streak}. Divine cleanup tax -{penalty}.")
+            streak_logs.append(msg("log.chaos_streak", state.chaos_streak, penalty))
         # Determine stability state
-        state.stability_state = self._compute_stability_state(state.stability)
-        state.stability_history.append(state.stability)
+        state.stability_state = self._compute_stability_state(state.stability_milli)
+        state.stability_history.append(state.stability_milli)
         quip = None
         if state.stability_state != previous_stability_state:
-            quip = GOD_QUIPS[state.stability_state]
+            quip = shared_msg(GOD_QUIPS[state.stability_state])
             state.god_quips.append(quip)
-        # Prophet hint on positive stability swing
-        hint: Optional[str] = None
-        prophet_logs: List[str] = []
-        hint, prophet_logs, prophet_triggered = self._maybe_trigger_prophet(state, event, stability_delta, assistant_notes)
-        if prophet_logs:
-            assistant_logs.extend(prophet_logs)
-        if prophet_triggered:
-            self._append_assistant_quip(state, "assistant_prophet")
-        resolution_logs = [
-            f"Decision {choice_key_value} applied. Stability change {stability_delta:+.2f}, score change {score_delta:+d}."
-        ]
+        if stability_delta > 0:
+            assistant_context.stability_delta = stability_delta
+            self._fire_assistants(Trigger.positive_delta, assistant_context)
+        turn_logs: List[Message] = list(delayed_logs)
         if streak_logs:
-            resolution_logs.extend(streak_logs)
+            turn_logs.extend(streak_logs)
         unlock_logs = self._process_assistant_unlocks(state, assistant_notes)
-        if assistant_logs:
-            resolution_logs.extend(assistant_logs)
+        turn_logs.extend(assistant_context.logs)
         if unlock_logs:
-            resolution_logs.extend(unlock_logs)
+            turn_logs.extend(unlock_logs)
         if quip:
-            resolution_logs.append(f"God quip: {quip}")
-        if hint:
-            resolution_logs.append(hint)
-        if "rare" in event.tags:
-            rare_line = "Rare omen detected: this scenario seldom manifests."
-            resolution_logs.append(rare_line)
-            state.god_quips.append(rare_line)
-        resolution_logs.append("Punchline: " + self._derive_punchline(event))
-        # Mark event resolved
-        event.resolved = True
-        event.resolution = EventResolution(
-            chosen_key=choice_key_value,
-            stability_delta=stability_delta,
-            score_delta=score_delta,
-            relation_changes=relation_changes,
-            logs=resolution_logs,
-        )
+            turn_logs.append(shared_msg("log.god_quip", quip))
+        turn_logs.extend(assistant_context.hints)
+        if len(outcomes) > 1:
+            turn_logs.insert(0, msg("log.turn_total", from_milli(stability_delta), score_delta))
+        resolution_logs: List[Message] = []
+        for index, (event, chosen_key, event_stability, event_score, relation_changes, event_logs) in enumerate(outcomes):
+            is_last = index == len(outcomes) - 1
+            if len(outcomes) == 1:
+                event_stability, event_score = stability_delta, score_delta
+            resolution_logs = [msg("log.decision", chosen_key, from_milli(event_stability), event_score)]
+            if event_logs:
+                resolution_logs.extend(event_logs)
+            if is_last:
+                resolution_logs.extend(turn_logs)
+                relation_changes = relation_changes + delayed_changes
+            if "rare" in event.tags:
+                rare_line = shared_msg("log.rare_omen")
+                resolution_logs.append(rare_line)
+                state.god_quips.append(rare_line)
+            resolution_logs.append(shared_msg("log.punchline", self._derive_punchline(event)))
+            # Mark event resolved
+            event.resolved = True
+            event.resolution = EventResolution(
+                chosen_key=chosen_key,
+                stability_delta=event_stability,
+                score_delta=event_score,
+                relation_changes=relation_changes,
+                logs=resolution_logs,
+            )
         # Advance to next turn if not ended
         state.turn += 1
         # End conditions
-        if state.stability <= 0.0:
+        if state.stability_milli <= 0:
             state.run_status = "collapsed"
-        elif state.turn > state.turn_limit:
-            if state.stability >= 0.75:
+        elif not state.endless and state.turn > state.turn_limit:
+            if state.stability_milli >= 750:
                 state.run_status = "won"
-            elif state.stability <= 0.25:
+            elif state.stability_milli <= 250:
                 state.run_status = "collapsed"
             else:
                 state.run_status = "turn_limit"
         if state.run_status != "active":
             final_key = state.run_status if state.run_status in RUN_END_QUIPS else "turn_limit"
-            final_quip = run_rng.choice(RUN_END_QUIPS[final_key])
+            final_quip = shared_msg(self.run_rngs[state.run_id].stream(state.turn, "verdict").choice(RUN_END_QUIPS[final_key]))
             state.god_quips.append(final_quip)
-            resolution_logs.append(f"Final verdict: {final_quip}")
-        state.assistant_notes = assistant_notes
-        return state, None
+            resolution_logs.append(shared_msg("log.verdict", final_quip))
+        self._tick_world(state)
+        if state.endless:
+            self._trim_endless_run(state)
+
+    def _trim_endless_run(self, state: GameState) -> None:
+        """Archive events beyond the resident window and drop stale quips."""
+
+        window = state.event_window
+        overflow = len(state.events_log) - window
+        if overflow > 0:
+            archive = self._archive_for(state.run_id)
+            archive.extend(event.to_dict() for event in state.events_log[:overflow])
+            del state.events_log[:overflow]
+        if len(state.god_quips) > window:
+            del state.god_quips[:-window]
+
+    def _archive_for(self, run_id: str) -> EventArchive:
+        archive = self.run_archives.get(run_id)
+        if archive is None:
+            archive = EventArchive(self.archive_dir, run_id)
+            self.run_archives[run_id] = archive
+        return archive
+
+    def decision_tape(self, run_id: str) -> bytes:
+        """Return the run's decisions so far, one byte each (see DECISION_CODES)."""
+
+        return bytes(self.run_tapes.get(run_id, b""))
+
+    def archived_events(self, run_id: str, offset: int = 0, limit: int = 50) -> Tuple[List[dict], int, Optional[str]]:
+        """Page through events evicted from an endless run's resident window.
+
+        Returns (events, total_archived, error_message).
+        """
+        if run_id not in self.active_runs:
+            return [], 0, "RUN_NOT_FOUND"
+        archive = self.run_archives.get(run_id)
+        if archive is None:
+            return [], 0, None
+        return archive.read(offset, limit), len(archive), None
+
+    def events_page(
+        self, run_id: str, cursor: int = 0, limit: int = 50
+    ) -> Tuple[List[dict], Optional[int], Optional[str]]:
+        """Page through a run's whole event history, archived and resident.
+
+        ``cursor`` is the absolute position of the first event to return
+        (0 is the run's first event).  Returns (events, next_cursor,
+        error_message); ``next_cursor`` is None once the history is exhausted.
+        """
+        state = self.active_runs.get(run_id)
+        if state is None:
+            return [], None, "RUN_NOT_FOUND"
+        archive = self.run_archives.get(run_id)
+        archived = len(archive) if archive is not None else 0
+        total = archived + len(state.events_log)
+        cursor = max(0, cursor)
+        stop = min(total, cursor + limit)
+        events: List[dict] = []
+        if archive is not None and cursor < archived:
+            events.extend(archive.read(cursor, min(stop, archived) - cursor))
+        events.extend(event.to_dict() for event in state.events_log[max(0, cursor - archived) : max(0, stop - archived)])
+        return events, stop if stop < total else None, None
+
+    def _apply_relation_changes(
+        self, state: GameState, nation_ids: List[str], status: Optional[str]
+    ) -> Tuple[List[Tuple[str, str, str]], int, List[Message]]:
+        """Set ``status`` between the event's nations and update alliance blocs.
+
+        Returns the applied relation changes, the bloc stability delta (in
+        milli-units) and any bloc log lines.
+        """
+
+        if not status or len(nation_ids) < 2:
+            return [], 0, []
+        blocs = state.blocs
+        changes: List[Tuple[str, str, str]] = []
+        stability_delta = 0
+        logs: List[Message] = []
+        a, b = nation_ids[0], nation_ids[1]
+        if status == "allied" and blocs and blocs.same_bloc(a, b):
+            stability_delta += BLOC_SOLIDARITY_BONUS
+            logs.append(
+                msg(
+                    "log.bloc_solidarity",
+                    state.nations[a].name,
+                    state.nations[b].name,
+                    blocs.bloc_size(a),
+                    from_milli(BLOC_SOLIDARITY_BONUS),
+                )
+            )
+        stability_delta += self._set_relation(state, self.run_worlds[state.run_id], a, b, status, changes, logs)
+        return changes, stability_delta, logs
+
+    def _set_relation(
+        self,
+        state: GameState,
+        world: WorldTable,
+        a: str,
+        b: str,
+        status: str,
+        changes: List[Tuple[str, str, str]],
+        logs: List[Message],
+    ) -> int:
+        """Set the relation between ``a`` and ``b``; return the bloc fracture delta in milli-units."""
+
+        nations = state.nations
+        previous = nations[a].relations.get(b, "neutral")
+        if previous == status:
+            return 0
+        nations.relations_for_write(a)[b] = status
+        nations.relations_for_write(b)[a] = status
+        world.set_relation(a, b, status)
+        changes.append((a, b, status))
+        blocs = state.blocs
+        if blocs:
+            if status == "allied":
+                blocs.ally(a, b)
+            elif previous == "allied" and blocs.dissolve(a, b):
+                penalty = from_milli(-BLOC_FRACTURE_PENALTY)
+                logs.append(msg("log.bloc_shatters", nations[a].name, nations[b].name, penalty))
+                return -BLOC_FRACTURE_PENALTY
+        return 0
+
+    def _apply_effects(
+        self, state: GameState, nation_ids: List[str], ops: Sequence[Tuple[EffectOp, str, float]], batch: EffectBatch
+    ) -> None:
+        """Dispatch compiled targeted effects on ``nation_ids`` in one pass over the opcodes."""
 
-    def _derive_punchline(self, event: Event) -> str:
+        for op, attribute, delta in ops:
+            self._effect_handlers[op](state, nation_ids, attribute, delta, batch)
+
+    def _apply_nation_effect(
+        self, state: GameState, nation_ids: List[str], attribute: str, delta: float, batch: EffectBatch
+    ) -> None:
+        world = self.run_worlds[state.run_id]
+        world.shift(attribute, [world.rows[nid] for nid in nation_ids], delta)
+        batch.logs.append(msg(f"log.effect.{attribute}", delta, plural("nations", len(nation_ids))))
+
+    def _apply_relation_effect(
+        self, state: GameState, nation_ids: List[str], attribute: str, delta: float, batch: EffectBatch
+    ) -> None:
+        world = self.run_worlds[state.run_id]
+        for index, a in enumerate(nation_ids):
+            relations = state.nations[a].relations
+            for b in nation_ids[index + 1 :]:
+                if delta > 0:
+                    status = attribute
+                elif relations.get(b, "neutral") == attribute:
+                    status = "neutral"
+                else:
+                    continue
+                batch.stability += self._set_relation(state, world, a, b, status, batch.relation_changes, batch.logs)
+
+    def _apply_streak_effect(
+        self, state: GameState, nation_ids: List[str], attribute: str, delta: float, batch: EffectBatch
+    ) -> None:
+        batch.streaks[attribute] = batch.streaks.get(attribute, 0) + int(delta)
+
+    def _schedule_follow_ups(self, state: GameState, event: Event, chosen_key: str) -> List[Message]:
+        """Queue the template's follow-ups for ``chosen_key``; return log lines."""
+
+        template = TEMPLATES_BY_KEY.get(event.template_key)
+        if state.scheduler is None or template is None:
+            return []
+        logs: List[Message] = []
+        for follow_up in template.follow_ups:
+            if follow_up.choice != chosen_key:
+                continue
+            state.scheduler.schedule(state.turn + follow_up.delay, follow_up, tuple(event.nations), event.id)
+            if follow_up.effects:
+                logs.append(msg("log.follow_up_set", turns(follow_up.delay)))
+        return logs
+
+    def _generate_follow_up(self, state: GameState, item: ScheduledItem) -> Event:
+        template = TEMPLATES_BY_KEY[item.follow_up.template_key]
+        return self._generate_event(state, list(item.nations), template)
+
+    def _derive_punchline(self, event: Event) -> Message:
         if event.template_key:
-            for template in EVENT_TEMPLATES:
-                if template.key == event.template_key:
-                    return template.punchline
-        summary = event.summary
-        # Attempt to match the template punchline based on key prefix
+            template = TEMPLATES_BY_KEY.get(event.template_key)
+            if template:
+                return shared_msg(template.punchline_code)
+        # Fall back to the template whose summary code the event carries
         for template in EVENT_TEMPLATES:
-            if summary.startswith(template.summary_template.split("{", 1)[0]):
-                return template.punchline
-        return "The gods shrug enigmatically."
+            if event.summary.code == template.summary_code:
+                return shared_msg(template.punchline_code)
+        return shared_msg("punchline.shrug")
 
-    def _reveal_hidden_trait(self, state: GameState, nation_ids: List[str]) -> Optional[str]:
-        run_rng = self.run_rngs[state.run_id]
-        candidates: List[Tuple[str, str]] = []
+    def _reveal_hidden_trait(self, state: GameState, nation_ids: List[str]) -> Optional[Message]:
+        run_rng = self.run_rngs[state.run_id].stream(state.turn, "reveal")
+        candidates: List[Tuple[str, int]] = []
         for nid in nation_ids:
-            known = set(state.revealed_traits[nid])
-            hidden = [trait for trait in state.nations[nid].hidden_traits if trait not in known]
-            if hidden:
-                trait = run_rng.choice(hidden)
-                candidates.append((nid, trait))
+            bit = pick_bit(state.nations[nid].hidden_mask & ~state.revealed_mask.get(nid, 0), run_rng)
+            if bit is not None:
+                candidates.append((nid, bit))
         if not candidates:
             return None
-        nid, trait = run_rng.choice(candidates)
-        state.revealed_traits[nid].append(trait)
-        nation_name = state.nations[nid].name
-        readable_trait = trait.replace("_", " ")
-        return f"Prophet reveals that {nation_name} hides the trait: {readable_trait}."
-
-    def _apply_diplomat_bonus(self, state: GameState, assistant_notes: Dict[str, str]) -> Tuple[List[str], float, bool]:
-        """Grant a stability bonus if the Diplomat assistant is unlocked."""
-
-        diplomat = state.assistants.get("assistant_diplomat")
-        if not diplomat or not diplomat.unlocked:
-            return [], 0.0, False
-        if diplomat.cooldown_remaining > 0:
-            turn_word = "turn" if diplomat.cooldown_remaining == 1 else "turns"
-            assistant_notes[diplomat.id] = (
-                f"{diplomat.name} refines negotiation scripts ({diplomat.cooldown_remaining} {turn_word} remaining)."
-            )
-            return [], 0.0, False
-        bonus = round(diplomat.effect.magnitude, 3)
-        previous = state.stability
-        state.stability = min(1.0, round(state.stability + bonus, 3))
-        actual = round(state.stability - previous, 3)
-        if actual <= 0:
-            assistant_notes[diplomat.id] = f"{diplomat.name} is poised to assist."  # fallback note
-            return [], 0.0, False
-        diplomat.cooldown_remaining = diplomat.cooldown
-        turn_word = "turn" if diplomat.cooldown_remaining == 1 else "turns"
-        assistant_notes[diplomat.id] = f"{diplomat.name} brokered calm. Ready in {diplomat.cooldown} {turn_word}."
-        log = f"{diplomat.name} smooths tensions. Stability change {actual:+.2f}."
-        return [log], actual, True
+        nid, bit = run_rng.choice(candidates)
+        state.revealed_mask[nid] = state.revealed_mask.get(nid, 0) | 1 << bit
+        return msg("log.reveal", state.nations[nid].name, shared_msg(f"trait.{TRAITS.name(bit)}"))
 
     def _append_assistant_quip(self, state: GameState, assistant_id: str) -> None:
         options = ASSISTANT_TRIGGER_QUIPS.get(assistant_id)
         if not options:
             return
-        run_rng = self.run_rngs[state.run_id]
-        state.god_quips.append(run_rng.choice(options))
+        run_rng = self.run_rngs[state.run_id].stream(state.turn, "quip")
+        state.god_quips.append(shared_msg(run_rng.choice(options)))
 
-    def _maybe_trigger_prophet(
-        self,
-        state: GameState,
-        event: Event,
-        stability_delta: float,
-        assistant_notes: Dict[str, str],
-    ) -> Tuple[Optional[str], List[str], bool]:
-        prophet = state.assistants.get("assistant_prophet")
-        if not prophet or not prophet.unlocked:
-            return None, [], False
-        if stability_delta <= 0:
-            if prophet.cooldown_remaining > 0:
-                turn_word = "turn" if prophet.cooldown_remaining == 1 else "turns"
-                assistant_notes[prophet.id] = (
-                    f"{prophet.name} meditates on calmer tides ({prophet.cooldown_remaining} {turn_word} remaining)."
-                )
-            else:
-                assistant_notes[prophet.id] = f"{prophet.name} awaits a positive omen."
-            return None, [], False
-        if prophet.cooldown_remaining > 0:
-            turn_word = "turn" if prophet.cooldown_remaining == 1 else "turns"
-            assistant_notes[prophet.id] = (
-                f"{prophet.name} meditates on calmer tides ({prophet.cooldown_remaining} {turn_word} remaining)."
-            )
-            return None, [], False
-        hint = self._reveal_hidden_trait(state, event.nations)
-        if not hint:
-            assistant_notes[prophet.id] = f"{prophet.name} senses no fresh secrets."
-            return None, [], False
-        prophet.cooldown_remaining = prophet.cooldown
-        turn_word = "turn" if prophet.cooldown_remaining == 1 else "turns"
-        assistant_notes[prophet.id] = f"{prophet.name} shares a vision. Ready in {prophet.cooldown} {turn_word}."
-        log = "The Prophet shares a whispered vision of hidden motives."
-        return hint, [log], True
-
-    def _process_assistant_unlocks(self, state: GameState, assistant_notes: Dict[str, str]) -> List[str]:
-        """Unlock assistants based on the current run state."""
-
-        logs: List[str] = []
-        diplomat = state.assistants.get("assistant_diplomat")
-        if diplomat and not diplomat.unlocked and state.peace_streak >= 5:
-            diplomat.unlocked = True
-            diplomat.cooldown_remaining = 0
-            logs.append("Assistant unlocked: The Diplomat pledges to broker future truces.")
-            assistant_notes[diplomat.id] = "The Diplomat arrives eager to draft alliances."
-            self._append_assistant_quip(state, diplomat.id)
+    def _process_assistant_unlocks(self, state: GameState, assistant_notes: Dict[str, Message]) -> List[Message]:
+        """Unlock the assistants whose peace-streak threshold was just reached."""
+
+        logs: List[Message] = []
+        for assistant_id in self.run_rosters[state.run_id].due_unlocks(state.peace_streak):
+            assistant = state.assistants[assistant_id]
+            if assistant.unlocked:
+                continue
+            plugin = ASSISTANT_PLUGINS[assistant_id]
+            assistant.unlocked = True
+            assistant.cooldown_remaining = 0
+            logs.append(plugin.unlock_log)
+            assistant_notes[assistant_id] = plugin.unlock_note
+            self._append_assistant_quip(state, assistant_id)
         return logs
 
     def next_turn(self, run_id: str) -> Tuple[Optional[Event], Optional[str]]:
         """Advance the run by generating a new event if possible.
 
         Returns (event, error_message).  If no error_message, event will be created and logged.
+        For runs with several events per turn this returns the first of them;
+        use :meth:`next_events` to receive the whole batch.
         """
+        events, error = self.next_events(run_id)
+        if error:
+            return None, error
+        return events[0], None
+
+    def next_events(self, run_id: str) -> Tuple[List[Event], Optional[str]]:
+        """Generate every event for the coming turn on disjoint nation pairs."""
+
         state = self.active_runs.get(run_id)
         if state is None:
-            return None, "RUN_NOT_FOUND"
+            return [], "RUN_NOT_FOUND"
         if state.run_status != "active":
-            return None, "RUN_ENDED"
+            return [], "RUN_ENDED"
         # If there is a pending unresolved event, do not create a new one
         if state.events_log and not state.events_log[-1].resolved:
-            return None, "EVENT_PENDING"
-        # Generate a new event and append to log
-        event = self._generate_event(state)
-        state.events_log.append(event)
-        return event, None
+            return [], "EVENT_PENDING"
+        # Scheduled follow-ups take their slots first; overlapping ones wait a turn
+        events: List[Event] = []
+        taken: List[str] = []
+        due = state.scheduler.pop_due_events(state.turn, state.events_per_turn) if state.scheduler else []
+        for item in due:
+            if any(nid in taken for nid in item.nations):
+                state.scheduler.schedule(state.turn + 1, item.follow_up, item.nations, item.source_event)
+                continue
+            events.append(self._generate_follow_up(state, item))
+            taken.extend(item.nations)
+        # Fill the remaining slots with weighted random events
+        remaining = state.events_per_turn - len(events)
+        if remaining == 1 and not taken:
+            events.append(self._generate_event(state))
+        elif remaining > 0:
+            pairs = self.run_samplers[run_id].sample_disjoint_pairs(
+                self.run_rngs[run_id].stream(state.turn, "event"), remaining, taken
+            )
+            events.extend(self._generate_event(state, pair) for pair in pairs)
+        state.events_log.extend(events)
+        state.touch()
+        return events, None
 
     def end_run(self, run_id: str, reason: str) -> dict:
         state = self.active_runs.get(run_id)
         if not state:
             return {"run_id": run_id, "reason": "RUN_NOT_FOUND", "final_score": 0}
         state.run_status = reason
+        state.touch()
         summary = {
             "run_id": run_id,
             "reason": reason,
@@ -575,3 +993,71 @@ class GameEngine:
             "stability": state.stability,
         }
         return summary
+
+    def discard_run(self, run_id: str) -> bool:
+        """Forget a run and its per-run structures; return False if it was unknown.
+
+        Archive files go too, except those another resident run still reads
+        through a fork.  Batch tools that play many runs back to back call
+        this so neither memory nor the archive directory grows with the
+        number of runs.
+        """
+        state = self.active_runs.pop(run_id, None)
+        archive = self.run_archives.pop(run_id, None)
+        if archive is not None:
+            in_use = {link.data_path for other in self.run_archives.values() for link in other.lineage()}
+            for link in archive.lineage():
+                if link.data_path not in in_use:
+                    link.delete()
+        for per_run in (
+            self.run_rngs,
+            self.run_samplers,
+            self.run_worlds,
+            self.run_tapes,
+            self.run_started_at,
+            self.run_rosters,
+        ):
+            per_run.pop(run_id, None)
+        return state is not None
+
+    def memory_usage(self, run_id: str, seen: Optional[Set[int]] = None) -> Tuple[Optional[RunMemory], Optional[str]]:
+        """Approximate resident bytes of a run, by category.
+
+        ``nations`` includes the run's world table, ``events_log`` the
+        scheduler and archive handle, ``quips`` the god quips and assistant
+        notes; everything else the run owns lands in ``other``.  Passing one
+        ``seen`` set across runs charges structures shared by forks only once.
+        Walks the whole run, so it is meant for diagnostics, not hot paths.
+        """
+        state = self.active_runs.get(run_id)
+        if not state:
+            return None, "RUN_NOT_FOUND"
+        if seen is None:
+            seen = shared_content_ids()
+
+        def size(*objects: object) -> int:
+            return sum(deep_sizeof(obj, seen) for obj in objects)
+
+        return RunMemory(
+            run_id=run_id,
+            run_status=state.run_status,
+            turn=state.turn,
+            nations=size(state.nations, self.run_worlds.get(run_id)),
+            events_log=size(state.events_log, state.scheduler, self.run_archives.get(run_id)),
+            history=size(state.stability_history),
+            quips=size(state.god_quips, state.assistant_notes),
+            other=size(
+                state,
+                self.run_rngs.get(run_id),
+                self.run_samplers.get(run_id),
+                self.run_tapes.get(run_id),
+                self.run_started_at.get(run_id),
+                self.run_rosters.get(run_id),
+            ),
+        ), None
+
+    def memory_by_run(self) -> List[RunMemory]:
+        """:meth:`memory_usage` for every run held in memory, largest first."""
+        seen = shared_content_ids()
+        usages = [self.memory_usage(run_id, seen)[0] for run_id in list(self.active_runs)]
+        return sorted((usage for usage in usages if usage), key=lambda usage: usage.total, reverse=True)
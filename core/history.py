@@ -0,0 +1,100 @@
+"""Bounded stability history for the Lazy God engine.
+
+Short runs keep every stability sample, but endless runs can last for
+hundreds of thousands of turns.  :class:`StabilityHistory` stores at most
+``capacity`` points: once full, neighbouring points are merged (keeping the
+later sample of each pair) and every point then covers twice as many turns.
+Memory and per-turn serialization cost therefore stay flat however long the
+run lasts, while the newest sample is always exact.
+
+Samples are stability milli-units (0..1000) kept in an ``array('h')``, two
+bytes per point rather than a pointer to a float object.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Union
+
+DEFAULT_HISTORY_CAPACITY = 512
+
+
+class StabilityHistory:
+    """Append-only, downsampling sequence of stability milli-units."""
+
+    def __init__(self, values: Iterable[int] = (), capacity: int = DEFAULT_HISTORY_CAPACITY) -> None:
+        if capacity < 2 or capacity % 2:
+            raise ValueError("capacity must be an even number of at least 2")
+        self.capacity = capacity
+        self.stride = 1
+        self.samples = 0
+        self._values = array("h")
+        self._fill = 0
+        self._shared = False  # values also held by a copy: copy them before writing
+        for value in values:
+            self.append(value)
+
+    def append(self, value: int) -> None:
+        self.samples += 1
+        if self._shared:
+            self._values = array("h", self._values)
+            self._shared = False
+        if self._fill < self.stride and self._values:
+            # Still inside the newest bucket: the later sample wins.
+            self._values[-1] = value
+            self._fill += 1
+            return
+        if len(self._values) >= self.capacity:
+            self._values = self._values[1::2]
+            self.stride *= 2
+        self._values.append(value)
+        self._fill = 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(index, slice):
+            return self._values[index].tolist()
+        return self._values[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StabilityHistory):
+            return self._values == other._values and self.stride == other.stride
+        if isinstance(other, list):
+            return self._values.tolist() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"StabilityHistory({self._values.tolist()!r}, stride={self.stride})"
+
+    def copy(self) -> StabilityHistory:
+        """Return an equal history; both share their values until one of them appends."""
+
+        clone = StabilityHistory.__new__(StabilityHistory)
+        clone.capacity, clone.stride, clone.samples, clone._fill = self.capacity, self.stride, self.samples, self._fill
+        clone._values = self._values
+        clone._shared = self._shared = True
+        return clone
+
+    def to_list(self) -> List[int]:
+        return self._values.tolist()
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "values": self._values.tolist(),
+            "capacity": self.capacity,
+            "stride": self.stride,
+            "samples": self.samples,
+            "fill": self._fill,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, object]) -> StabilityHistory:
+        history = cls(capacity=data["capacity"])
+        history._values = array("h", data["values"])
+        history.stride, history.samples, history._fill = data["stride"], data["samples"], data["fill"]
+        return history
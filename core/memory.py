@@ -0,0 +1,192 @@
+"""Memory accounting for runs and the process.
+
+Two tools for working out where memory goes:
+
+* :func:`deep_sizeof` walks an object graph and sums ``sys.getsizeof`` over
+  every object reachable from it, counting each object once.  The engine
+  uses it to break a run's footprint down by category (see
+  :meth:`core.game.GameEngine.memory_usage`).  Objects owned by the
+  module-level content tables, or pooled in the shared message and tuple
+  pools, are shared by every run and never charged to one.
+* :class:`MemoryTracer` wraps :mod:`tracemalloc` to diff the process heap
+  between two snapshots.  Tracing is only switched on on request, so
+  nothing is paid for it the rest of the time.
+
+Both are approximations: the sizes are what CPython reports for the
+objects, not allocator overhead or memory shared with other runs.
+"""
+
+from __future__ import annotations
+
+import enum
+import os
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Leaves that are shared process-wide or own no per-run memory.
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, enum.Enum)
+
+_content_ids: Optional[Set[int]] = None
+
+
+def rss_mb() -> float:
+    """Resident set size of this process in MiB (0.0 where /proc is unavailable)."""
+
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):  # pragma: no cover - non-Linux
+        return 0.0
+
+
+def _referents(obj: Any) -> Iterable[Any]:
+    if isinstance(obj, dict):
+        yield from obj.keys()
+        yield from obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        yield from obj
+    else:
+        attributes = getattr(obj, "__dict__", None)
+        if attributes is not None:
+            yield attributes
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if hasattr(obj, slot):
+                    yield getattr(obj, slot)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate bytes held by ``obj`` and everything it references.
+
+    Objects whose ids are already in ``seen`` are skipped and new ones are
+    added, so sharing one ``seen`` set across calls attributes each object to
+    the first call that reaches it.
+    """
+
+    if seen is None:
+        seen = shared_content_ids()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        stack.extend(_referents(current))
+    return total
+
+
+def shared_content_ids() -> Set[int]:
+    """Ids of the objects owned by the content tables and the shared pools.
+
+    The pools of shared messages and tuples grow as runs meet new content,
+    so they are walked on every call; the returned set is a fresh copy.
+    """
+
+    global _content_ids
+    from .models import SHARED_TUPLES
+    from .narrative import SHARED_MESSAGES
+
+    if _content_ids is None:
+        from .content import EVENT_TEMPLATES, NATION_ARCHETYPES
+
+        ids: Set[int] = set()
+        # Walked one by one: a temporary container's id could be reused later.
+        for table in (EVENT_TEMPLATES, NATION_ARCHETYPES):
+            deep_sizeof(table, ids)
+        _content_ids = ids
+    ids = set(_content_ids)
+    for pool in (SHARED_MESSAGES, SHARED_TUPLES):
+        deep_sizeof(pool, ids)
+    return ids
+
+
+@dataclass
+class RunMemory:
+    """Approximate resident bytes of one run, by category."""
+
+    run_id: str
+    run_status: str
+    turn: int
+    nations: int
+    events_log: int
+    history: int
+    quips: int
+    other: int
+
+    @property
+    def total(self) -> int:
+        return self.nations + self.events_log + self.history + self.quips + self.other
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "run_status": self.run_status,
+            "turn": self.turn,
+            "total": self.total,
+            "nations": self.nations,
+            "events_log": self.events_log,
+            "history": self.history,
+            "quips": self.quips,
+            "other": self.other,
+        }
+
+
+class MemoryTracer:
+    """On-demand :mod:`tracemalloc` snapshots, diffed against a moving baseline.
+
+    :meth:`start` takes the first baseline.  Each :meth:`diff` takes a new
+    snapshot, returns the top allocation sites by growth since the baseline
+    and (unless ``rebase`` is false) makes the new snapshot the baseline.
+    """
+
+    def __init__(self) -> None:
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = self._snapshot()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._baseline = None
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        )
+
+    def diff(self, top: int = 20, key_type: str = "lineno", rebase: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """Top ``top`` allocation sites by size change; ``None`` when not tracing."""
+
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = self._snapshot()
+        if self._baseline is None:
+            self._baseline = snapshot
+        stats = snapshot.compare_to(self._baseline, key_type)[:top]
+        if rebase:
+            self._baseline = snapshot
+        return [
+            {
+                "location": str(stat.traceback),
+                "size": stat.size,
+                "size_diff": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats
+        ]
+
+
+TRACER = MemoryTracer()
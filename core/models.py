@@ -9,9 +9,22 @@ from __future__ import annotations
 
 import enum
 import random
+import sys
 import uuid
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .codec import DICT, LIST, TUPLE, Codec, Conv, call, each, enum_conv, nested
+from .history import StabilityHistory
+from .narrative import Message, render, render_all
+from .sharing import LayeredDict, SharedLog
+from .traits import TRAITS
+
+if TYPE_CHECKING:
+    from .assistants import AssistantRoster
+    from .blocs import AllianceBlocs
+    from .scheduler import EventScheduler
+    from .world import WorldTable
 
 
 class Race(str, enum.Enum):
@@ -59,11 +72,35 @@ class Decision(str, enum.Enum):
     trade = "trade"
 
 
+# Stability is held as an integer number of thousandths ("milli-units") inside
+# the engine, so it needs no rounding and every engine path agrees bit for
+# bit.  It becomes a float only when it leaves the engine.
+STABILITY_SCALE = 1000
+
+
+def to_milli(value: float) -> int:
+    return round(value * STABILITY_SCALE)
+
+
+def from_milli(milli: int) -> float:
+    return milli / STABILITY_SCALE
+
+
 HiddenTrait = str  # for simplicity; would be enum in full implementation
 RelationStatus = str  # neutral, allied, hostile, trading, etc.
 
+# Canonical instances of small recurring tuples of names, shared by every run.
+SHARED_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
 
-@dataclass
+
+def shared_tuple(values: Iterable[str]) -> Tuple[str, ...]:
+    """Return the shared tuple equal to ``values``; the pool is never pruned."""
+
+    values = tuple(values)
+    return SHARED_TUPLES.setdefault(values, values)
+
+
+@dataclass(slots=True)
 class Nation:
     id: str
     name: str
@@ -71,7 +108,11 @@ class Nation:
     primary_race: Race
     economy_type: EconomyType
     demeanor: Demeanor
-    hidden_traits: List[HiddenTrait]
+    hidden_mask: int  # bitset over core.traits.TRAITS
+    # Set by the world table that binds this nation (see _WorldColumn); declared
+    # ahead of the stat fields so __init__ assigns them first.
+    _table: Optional[WorldTable] = field(default=None, init=False, repr=False, compare=False)
+    _row: int = field(default=0, init=False, repr=False, compare=False)
     relations: Dict[str, RelationStatus] = field(default_factory=dict)
     power: float = field(default_factory=lambda: round(random.random(), 2))
     population: int = field(default_factory=lambda: random.randint(10_000, 50_000_000))
@@ -79,8 +120,128 @@ class Nation:
     unrest: float = field(default_factory=lambda: round(random.uniform(0.0, 0.3), 2))
     last_interaction: str = "none"
 
-    def to_dict(self) -> dict:
-        return asdict(self)
+    @property
+    def hidden_traits(self) -> List[HiddenTrait]:
+        return TRAITS.names(self.hidden_mask)
+
+    # to_dict / from_dict are generated below (see core.codec).
+
+
+class _WorldColumn:
+    """Descriptor that stores a numeric nation stat in a bound world table.
+
+    Unbound nations keep the value in the field's own slot.  Once a
+    :class:`core.world.WorldTable` binds the nation, reads and writes go
+    straight to the table's column so the ``Nation`` acts as a view.
+    """
+
+    def __init__(self, name: str, slot: Any) -> None:
+        self.name = name
+        self.slot = slot  # the member descriptor this one replaces
+
+    def __get__(self, obj: Optional[Nation], owner: Optional[type] = None):
+        if obj is None:
+            return self
+        table = obj._table
+        if table is None:
+            return self.slot.__get__(obj, owner)
+        return table.get(self.name, obj._row)
+
+    def __set__(self, obj: Nation, value: float) -> None:
+        table = obj._table
+        if table is None:
+            self.slot.__set__(obj, value)
+        else:
+            table.set(self.name, obj._row, value)
+
+
+for _column in ("power", "prosperity", "unrest"):
+    setattr(Nation, _column, _WorldColumn(_column, getattr(Nation, _column)))
+
+NATION_CODEC = Codec(
+    Nation,
+    order=(
+        "id", "name", "archetype", "primary_race", "economy_type", "demeanor", "relations",
+        "power", "population", "prosperity", "unrest", "last_interaction", "hidden_mask",
+    ),
+    name=Conv(load="_intern({v})", names={"_intern": sys.intern}),  # as at generation
+    primary_race=enum_conv(Race, value=False),
+    economy_type=enum_conv(EconomyType, value=False),
+    demeanor=enum_conv(Demeanor, value=False),
+    relations=DICT,
+    hidden_mask=call(TRAITS.names, TRAITS.mask, key="hidden_traits"),
+)
+Nation.to_dict = NATION_CODEC.dump  # type: ignore[attr-defined]
+Nation.from_dict = staticmethod(NATION_CODEC.load)  # type: ignore[attr-defined]
+
+
+class NationMap(LayeredDict[str, Nation]):
+    """A run's nations by id, shared copy-on-write with its forks.
+
+    A run reads its nations bound to its own world ``table``.  One found in
+    a shared layer but bound to another run's table is rebound by a shallow
+    copy on first lookup; the copy still shares the relations dict, which
+    :meth:`relations_for_write` copies before the run first changes it.
+    """
+
+    __slots__ = ("table", "_private")
+
+    def __init__(self, nations: Dict[str, Nation], table: Optional[WorldTable] = None) -> None:
+        super().__init__(nations)
+        self.table = table
+        self._private: Set[str] = set(self._own)  # ids whose relations dict only this run holds
+
+    def __getitem__(self, nation_id: str) -> Nation:
+        nation = self._own.get(nation_id)
+        if nation is not None:
+            return nation
+        for layer in self._layers:
+            nation = layer.get(nation_id)
+            if nation is not None:
+                break
+        else:
+            raise KeyError(nation_id)
+        if nation._table is not self.table:
+            nation = self._rebind(nation)
+        return nation
+
+    # Every layer stack bottoms out in the run's founding nations, all of them.
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layers[-1] if self._layers else self._own)
+
+    def __len__(self) -> int:
+        return len(self._layers[-1] if self._layers else self._own)
+
+    def __contains__(self, nation_id: object) -> bool:
+        return nation_id in (self._layers[-1] if self._layers else self._own)
+
+    def _rebind(self, nation: Nation) -> Nation:
+        clone = replace(nation)  # the relations dict is passed on, not copied
+        clone._table, clone._row = self.table, self.table.rows[nation.id]
+        self._own[nation.id] = clone
+        return clone
+
+    def relations_for_write(self, nation_id: str) -> Dict[str, RelationStatus]:
+        """Return ``nation_id``'s relations, copied first if a fork may still read them."""
+
+        nation = self[nation_id]
+        if nation_id not in self._private:
+            if self._own.get(nation_id) is not nation:
+                nation = self._rebind(nation)  # never change an object another run can reach
+            nation.relations = dict(nation.relations)
+            self._private.add(nation_id)
+        return nation.relations
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        self._private = set()
+
+    def fork(self, table: WorldTable) -> NationMap:  # type: ignore[override]
+        """Return the nations of a fork that plays on ``table``."""
+
+        clone = super().fork()
+        clone.table, clone._private = table, set()
+        return clone
 
 
 class AssistantClass(str, enum.Enum):
@@ -91,7 +252,7 @@ class AssistantClass(str, enum.Enum):
     court_mage = "CourtMage"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantEffect:
     type: str
     magnitude: float
@@ -99,7 +260,7 @@ class AssistantEffect:
     duration_turns: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Assistant:
     id: str
     name: str
@@ -109,14 +270,46 @@ class Assistant:
     level: int
     effect: AssistantEffect
     cooldown: int
+    # Set by the roster that binds this assistant (see _RosterCooldown).
+    _roster: Optional[AssistantRoster] = field(default=None, init=False, repr=False, compare=False)
     cooldown_remaining: int = 0
     flavor_text: str = ""
 
-    def to_dict(self) -> dict:
-        d = asdict(self)
-        # convert nested AssistantEffect
-        d["effect"] = asdict(self.effect)
-        return d
+
+class _RosterCooldown:
+    """Descriptor for ``Assistant.cooldown_remaining``.
+
+    Unbound assistants keep the value in the field's own slot.  Once a
+    :class:`core.assistants.AssistantRoster` binds the assistant, the value
+    is derived from the roster's clock, so cooldowns run down without the
+    engine visiting every assistant each turn.
+    """
+
+    def __init__(self, slot: Any) -> None:
+        self.slot = slot  # the member descriptor this one replaces
+
+    def __get__(self, obj: Optional[Assistant], owner: Optional[type] = None):
+        if obj is None:
+            return self
+        roster = obj._roster
+        if roster is None:
+            return self.slot.__get__(obj, owner)
+        return roster.remaining(obj.id)
+
+    def __set__(self, obj: Assistant, value: int) -> None:
+        roster = obj._roster
+        if roster is None:
+            self.slot.__set__(obj, value)
+        else:
+            roster.start_cooldown(obj.id, value)
+
+
+Assistant.cooldown_remaining = _RosterCooldown(Assistant.cooldown_remaining)  # type: ignore[assignment]
+
+ASSISTANT_EFFECT_CODEC = Codec(AssistantEffect)
+ASSISTANT_CODEC = Codec(Assistant, clazz=enum_conv(AssistantClass, value=False), effect=nested(ASSISTANT_EFFECT_CODEC))
+Assistant.to_dict = ASSISTANT_CODEC.dump  # type: ignore[attr-defined]
+Assistant.from_dict = staticmethod(ASSISTANT_CODEC.load)  # type: ignore[attr-defined]
 
 
 class EventKind(str, enum.Enum):
@@ -127,110 +320,220 @@ class EventKind(str, enum.Enum):
     tech_magic = "tech_magic"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventChoiceEffect:
     target: str  # global, nation, relation, streak, score
     attribute: str
     delta: float
 
 
-@dataclass
+class EffectOp(enum.IntEnum):
+    """Opcodes for targeted effects that cannot be folded into a run-wide delta."""
+
+    nation = 1
+    relation = 2
+    streak = 3
+
+
+EFFECT_OPS = {op.name: op for op in EffectOp}
+
+# Attributes each opcode understands.  Nation effects shift a stat of every
+# event participant; relation effects set (positive delta) or break (negative
+# delta) that status between every pair of participants; streak effects add
+# whole turns to the peace or chaos streak.
+EFFECT_ATTRIBUTES: Dict[EffectOp, Tuple[str, ...]] = {
+    EffectOp.nation: ("prosperity", "unrest", "power"),
+    EffectOp.relation: ("neutral", "allied", "hostile", "trading"),
+    EffectOp.streak: ("peace", "chaos"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledEffects:
+    """An effect list reduced once to aggregate deltas plus targeted opcodes.
+
+    ``global.stability`` and ``score.points`` effects are summed into
+    ``stability`` (in milli-units) and ``score``; nation, relation and streak effects become
+    ``(opcode, attribute, delta)`` entries in ``ops``, one per distinct
+    ``(opcode, attribute)`` with the deltas summed.
+    """
+
+    stability: int = 0
+    score: int = 0
+    ops: Tuple[Tuple[EffectOp, str, float], ...] = ()
+
+
+def compile_effects(effects: Iterable[EventChoiceEffect]) -> CompiledEffects:
+    """Compile ``effects``; unknown targets raise ``ValueError`` instead of being ignored."""
+
+    stability = 0
+    score = 0
+    ops: Dict[Tuple[EffectOp, str], float] = {}
+    for effect in effects:
+        op = EFFECT_OPS.get(effect.target)
+        if effect.target == "global" and effect.attribute == "stability":
+            stability += to_milli(effect.delta)
+        elif effect.target == "score" and effect.attribute == "points":
+            score += int(effect.delta)
+        elif op is not None and effect.attribute in EFFECT_ATTRIBUTES[op]:
+            ops[op, effect.attribute] = ops.get((op, effect.attribute), 0.0) + effect.delta
+        else:
+            raise ValueError(f"unsupported effect {effect.target}.{effect.attribute}")
+    return CompiledEffects(stability, score, tuple((op, attr, delta) for (op, attr), delta in ops.items() if delta))
+
+
+@dataclass(frozen=True, slots=True)
 class EventChoice:
+    """An immutable choice, shared by every event generated from the same template."""
+
     key: str  # peace, hostile, trade, etc.
     label: str
-    effects: List[EventChoiceEffect]
-    constraints: List[str] = field(default_factory=list)
+    effects: Tuple[EventChoiceEffect, ...]
+    constraints: Tuple[str, ...] = ()
+    compiled: CompiledEffects = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compiled", compile_effects(self.effects))
 
-@dataclass
+
+CHOICE_EFFECT_CODEC = Codec(EventChoiceEffect)
+CHOICE_CODEC = Codec(EventChoice, effects=each(CHOICE_EFFECT_CODEC, "tuple"), constraints=TUPLE)
+
+
+@dataclass(slots=True)
 class EventResolution:
     chosen_key: str
-    stability_delta: float
+    stability_delta: int  # milli-units
     score_delta: int
     relation_changes: List[Tuple[str, str, RelationStatus]]
-    logs: List[str]
+    logs: List[Message]
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     id: str
     kind: EventKind
     turn: int
     nations: List[str]
-    summary: str
-    choices: List[EventChoice]
+    summary: Message
+    choices: Sequence[EventChoice]
     template_key: str = ""
-    tags: List[str] = field(default_factory=list)
-    assistant_influence: List[str] = field(default_factory=list)
+    tags: Sequence[str] = ()  # the template's tuple, shared by its events
+    assistant_influence: Sequence[str] = ()
     resolved: bool = False
     resolution: Optional[EventResolution] = None
     rng_seed: int = field(default_factory=lambda: random.randint(0, 10_000))
 
-    def to_dict(self) -> dict:
-        d = asdict(self)
-        # Convert complex nested types to serializable forms
-        d["kind"] = self.kind.value
-        d["choices"] = [
-            {
-                "key": c.key,
-                "label": c.label,
-                "effects": [asdict(e) for e in c.effects],
-                "constraints": c.constraints,
-            }
-            for c in self.choices
-        ]
-        if self.resolution:
-            d["resolution"] = {
-                "chosen_key": self.resolution.chosen_key,
-                "stability_delta": self.resolution.stability_delta,
-                "score_delta": self.resolution.score_delta,
-                "relation_changes": [
-                    {"a": a, "b": b, "new_status": status} for a, b, status in self.resolution.relation_changes
-                ],
-                "logs": self.resolution.logs,
-            }
-        return d
+
+def _relation_change_dicts(changes: List[Tuple[str, str, RelationStatus]]) -> List[dict]:
+    return [{"a": a, "b": b, "new_status": status} for a, b, status in changes]
+
+
+def _relation_change_tuples(changes: List[dict]) -> List[Tuple[str, str, RelationStatus]]:
+    return [(change["a"], change["b"], change["new_status"]) for change in changes]
+
+
+# The API dicts render messages, so these codecs only dump; runs are restored
+# from the message-preserving codecs in core.snapshot.
+RESOLUTION_CODEC = Codec(
+    EventResolution,
+    stability_delta=Conv("{v} / _scale", "round({v} * _scale)", names={"_scale": STABILITY_SCALE}),
+    relation_changes=call(_relation_change_dicts, _relation_change_tuples),
+    logs=call(render_all, list),
+)
+EVENT_CODEC = Codec(
+    Event,
+    kind=enum_conv(EventKind),
+    nations=LIST,
+    summary=call(render, str),
+    choices=each(CHOICE_CODEC, "tuple"),
+    tags=TUPLE,
+    assistant_influence=TUPLE,
+    resolution=nested(RESOLUTION_CODEC, optional=True),
+)
+Event.to_dict = EVENT_CODEC.dump  # type: ignore[attr-defined]
 
 
 @dataclass
 class GameState:
     run_id: str
     turn: int
-    stability: float
+    stability_milli: int
     stability_state: StabilityState
     score: int
     peace_streak: int
     chaos_streak: int
-    nations: Dict[str, Nation]
+    nations: NationMap
     assistants: Dict[str, Assistant]
-    events_log: List[Event]
+    events_log: SharedLog[Event]
     world_theme: str
     run_status: str  # active, won, collapsed, turn_limit
     turn_limit: int
     seed: int
-    stability_history: List[float]
-    revealed_traits: Dict[str, List[str]]
-    god_quips: List[str]
-    assistant_notes: Dict[str, str]
-
-    def to_dict(self) -> dict:
-        return {
-            "run_id": self.run_id,
-            "turn": self.turn,
-            "stability": self.stability,
-            "stability_state": self.stability_state.value,
-            "score": self.score,
-            "peace_streak": self.peace_streak,
-            "chaos_streak": self.chaos_streak,
-            "nations": {nid: n.to_dict() for nid, n in self.nations.items()},
-            "assistants": {aid: a.to_dict() for aid, a in self.assistants.items()},
-            "events_log": [e.to_dict() for e in self.events_log],
-            "world_theme": self.world_theme,
-            "run_status": self.run_status,
-            "turn_limit": self.turn_limit,
-            "seed": self.seed,
-            "stability_history": self.stability_history,
-            "revealed_traits": self.revealed_traits,
-            "god_quips": self.god_quips,
-            "assistant_notes": self.assistant_notes,
-        }
+    stability_history: StabilityHistory  # milli-units
+    revealed_mask: LayeredDict[str, int]  # nation id -> bitset of revealed traits; absent means none
+    god_quips: SharedLog[Message]
+    assistant_notes: Dict[str, Message]
+    blocs: Optional[AllianceBlocs] = None
+    events_per_turn: int = 1
+    scheduler: Optional[EventScheduler] = None
+    endless: bool = False
+    event_window: int = 0
+    version: int = 0
+
+    @property
+    def stability(self) -> float:
+        return from_milli(self.stability_milli)
+
+    @stability.setter
+    def stability(self, value: float) -> None:
+        self.stability_milli = to_milli(value)
+
+    @property
+    def revealed_traits(self) -> Dict[str, List[str]]:
+        """Revealed trait names per nation, every nation included."""
+
+        return {nid: TRAITS.names(self.revealed_mask.get(nid, 0)) for nid in self.nations}
+
+    def touch(self) -> None:
+        """Record a mutation so cached serialisations (and ETags) go stale."""
+
+        self.version += 1
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Serialise the state, or only ``fields`` of it.
+
+        Projection happens before serialisation, so unrequested subtrees such
+        as ``nations`` or ``events_log`` are never built.  Unknown field names
+        raise ``KeyError``.
+        """
+        if fields is None:
+            return {name: serialise(self) for name, serialise in STATE_FIELDS.items()}
+        return {name: STATE_FIELDS[name](self) for name in fields}
+
+
+STATE_FIELDS: Dict[str, Callable[[GameState], Any]] = {
+    "run_id": lambda state: state.run_id,
+    "turn": lambda state: state.turn,
+    "stability": lambda state: state.stability,
+    "stability_state": lambda state: state.stability_state.value,
+    "score": lambda state: state.score,
+    "peace_streak": lambda state: state.peace_streak,
+    "chaos_streak": lambda state: state.chaos_streak,
+    "nations": lambda state: {nid: n.to_dict() for nid, n in state.nations.items()},
+    "assistants": lambda state: {aid: a.to_dict() for aid, a in state.assistants.items()},
+    "events_log": lambda state: [e.to_dict() for e in state.events_log],
+    "world_theme": lambda state: state.world_theme,
+    "run_status": lambda state: state.run_status,
+    "turn_limit": lambda state: state.turn_limit,
+    "seed": lambda state: state.seed,
+    "stability_history": lambda state: [from_milli(value) for value in state.stability_history],
+    "revealed_traits": lambda state: state.revealed_traits,
+    "god_quips": lambda state: render_all(state.god_quips),
+    "assistant_notes": lambda state: {aid: render(note) for aid, note in state.assistant_notes.items()},
+    "blocs": lambda state: state.blocs.to_list() if state.blocs else [],
+    "events_per_turn": lambda state: state.events_per_turn,
+    "endless": lambda state: state.endless,
+    "event_window": lambda state: state.event_window,
+    "version": lambda state: state.version,
+}
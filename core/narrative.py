@@ -0,0 +1,185 @@
+"""Narrative messages stored as codes and rendered on demand.
+
+The engine does not format player-facing text.  Event summaries, resolution
+logs, god quips and assistant notes are kept as :class:`Message` tuples of a
+catalogue code and its arguments, and only become strings when
+:func:`render` is called while serialising a state or event (or by the CLI).
+Headless simulation (batch runs, tournaments, soak tests) never renders, and
+localising the game means installing another :class:`Catalog` with
+:func:`use_catalog` rather than touching the engine.
+
+Arguments may themselves be messages (a god quip inside a log line), which
+are rendered first.  Rendered strings are cached per catalogue, since the
+same quips and notes repeat across turns and runs, and messages built purely
+from content are shared between runs through :func:`shared_msg`.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class Message(NamedTuple):
+    code: str
+    args: Tuple[Any, ...] = ()
+
+
+def msg(code: str, *args: Any) -> Message:
+    return Message(code, args)
+
+
+# Messages built only from content (quips, punchlines, fixed log lines) recur
+# in every run; shared_msg hands out one instance per distinct message.
+SHARED_MESSAGES: Dict[Message, Message] = {}
+
+
+def shared_msg(code: str, *args: Any) -> Message:
+    """Like :func:`msg`, but return the canonical instance of a recurring message.
+
+    Only for messages whose arguments come from static content; the pool is
+    never pruned.
+    """
+
+    message = Message(code, args)
+    return SHARED_MESSAGES.setdefault(message, message)
+
+
+def dump_message(message: Message) -> List[Any]:
+    """``[code, *args]`` with nested messages as nested lists (JSON-safe for snapshots)."""
+
+    return [message.code, *(dump_message(a) if isinstance(a, Message) else a for a in message.args)]
+
+
+def load_message(data: List[Any]) -> Message:
+    """Inverse of :func:`dump_message`; recurring messages come back as their shared instance."""
+
+    message = Message(data[0], tuple(load_message(a) if isinstance(a, list) else a for a in data[1:]))
+    return SHARED_MESSAGES.get(message, message)
+
+
+def plural(stem: str, count: int) -> Message:
+    """``count`` with a noun: renders ``<stem>.one`` or ``<stem>.other``."""
+
+    return Message(f"{stem}.one" if count == 1 else f"{stem}.other", (count,))
+
+
+def turns(count: int) -> Message:
+    return plural("turns", count)
+
+
+class Catalog:
+    """Message templates keyed by code, formatted with ``str.format`` positional fields.
+
+    Codes a catalogue lacks are looked up in ``fallback`` (:data:`ENGLISH`
+    unless given), so a partial translation still renders every message; a
+    code no catalogue knows renders as the code itself.
+    """
+
+    def __init__(self, messages: Mapping[str, str], cache_size: int = 8192, fallback: Optional[Catalog] = None) -> None:
+        self.messages: Dict[str, str] = dict(messages)
+        self.fallback = fallback
+        self._cached = lru_cache(maxsize=cache_size)(self._format)
+
+    def update(self, messages: Mapping[str, str]) -> None:
+        self.messages.update(messages)
+        self._cached.cache_clear()
+
+    def template(self, code: str) -> Optional[str]:
+        template = self.messages.get(code)
+        if template is None:
+            fallback = self.fallback or (ENGLISH if self is not ENGLISH else None)
+            return fallback.template(code) if fallback is not None else None
+        return template
+
+    def _format(self, code: str, args: Tuple[Any, ...]) -> str:
+        template = self.template(code)
+        if template is None:
+            return code
+        return template.format(*(self.render(a) if isinstance(a, Message) else a for a in args))
+
+    def render(self, message: Message) -> str:
+        try:
+            return self._cached(message.code, message.args)
+        except TypeError:  # unhashable arguments skip the cache
+            return self._format(message.code, message.args)
+
+
+ENGLISH = Catalog(
+    {
+        "turns.one": "{0} turn",
+        "turns.other": "{0} turns",
+        "nations.one": "{0} nation",
+        "nations.other": "{0} nations",
+        # Stability-state god quips
+        "quip.golden_age": "Behold! Mortals write musicals about your benevolence.",
+        "quip.peaceful": "A serene hum blankets the world—don't nap through it.",
+        "quip.stable": "Steady as a cosmic sofa. Comfortable, but keep an eye open.",
+        "quip.tense": "You can almost hear the tea cups rattling. Maybe intervene?",
+        "quip.chaotic": "Fires everywhere. Some metaphorical, some disappointingly real.",
+        # Assistant trigger quips
+        "quip.prophet.0": "Your prophet hums cosmic chords as secrets unfurl.",
+        "quip.prophet.1": "Visions ripple outward—apparently destiny smells like cardamom.",
+        "quip.diplomat.0": "The Diplomat already drafts thank-you notes for both sides.",
+        "quip.diplomat.1": "Treaties flutter like confetti—clearly someone's networking hard.",
+        # Run verdicts
+        "quip.won.0": "Mortals declare an annual nap-day in your honour.",
+        "quip.won.1": "Peace lingers like a warm blanket—you may actually be good at this.",
+        "quip.collapsed.0": "The cosmos winces. Maybe bring extra snacks next time.",
+        "quip.collapsed.1": "Chaos reigns and your couch privileges are revoked—for now.",
+        "quip.turn_limit.0": "Time runs out with mortals still mid-squabble—classic.",
+        "quip.turn_limit.1": "The clock sighs louder than the nations. Perhaps a rematch?",
+        # Resolution logs
+        "log.decision": "Decision {0} applied. Stability change {1:+.2f}, score change {2:+d}.",
+        "log.turn_total": "Turn total: stability change {0:+.2f}, score change {1:+d}.",
+        "log.delayed": "Delayed consequence: {0} Stability change {1:+.2f}, score change {2:+d}.",
+        "log.follow_up_set": "Consequences set in motion: expect a payoff in {0}.",
+        "log.peace_streak": "Peace streak of {0}! Bonus score +{1}.",
+        "log.chaos_streak": "Chaos streak of {0}. Divine cleanup tax -{1}.",
+        "log.god_quip": "God quip: {0}",
+        "log.rare_omen": "Rare omen detected: this scenario seldom manifests.",
+        "log.punchline": "Punchline: {0}",
+        "log.verdict": "Final verdict: {0}",
+        "log.bloc_solidarity": "Bloc solidarity: {0} and {1} stand together (bloc of {2}). Stability change {3:+.2f}.",
+        "log.bloc_shatters": "The alliance between {0} and {1} shatters. Stability change {2:+.2f}.",
+        "log.effect.prosperity": "Prosperity {0:+.2f} for {1}.",
+        "log.effect.unrest": "Unrest {0:+.2f} for {1}.",
+        "log.effect.power": "Power {0:+.2f} for {1}.",
+        "log.reveal": "Prophet reveals that {0} hides the trait: {1}.",
+        "punchline.shrug": "The gods shrug enigmatically.",
+        # Assistants
+        "assistant.ready_at_signal": "{0} is ready to intervene at your signal.",
+        "assistant.ready": "{0} is ready to intervene.",
+        "assistant.awaits_omen": "{0} awaits an omen before joining the roster.",
+        "prophet.cooling": "{0} meditates on calmer tides ({1} remaining).",
+        "prophet.no_secrets": "{0} senses no fresh secrets.",
+        "prophet.vision": "{0} shares a vision. Ready in {1}.",
+        "prophet.vision_log": "The Prophet shares a whispered vision of hidden motives.",
+        "diplomat.locked": "Maintain a peace streak of five turns to invite The Diplomat.",
+        "diplomat.cooling": "{0} refines negotiation scripts ({1} remaining).",
+        "diplomat.poised": "{0} is poised to assist.",
+        "diplomat.brokered": "{0} brokered calm. Ready in {1}.",
+        "diplomat.smooths": "{0} smooths tensions. Stability change {1:+.2f}.",
+        "diplomat.unlocked_log": "Assistant unlocked: The Diplomat pledges to broker future truces.",
+        "diplomat.unlocked_note": "The Diplomat arrives eager to draft alliances.",
+    }
+)
+
+_catalog = ENGLISH
+
+
+def use_catalog(catalog: Catalog) -> Catalog:
+    """Render with ``catalog`` from now on; return the previous catalogue."""
+
+    global _catalog
+    previous, _catalog = _catalog, catalog
+    return previous
+
+
+def render(message: Message, catalog: Optional[Catalog] = None) -> str:
+    return (catalog or _catalog).render(message)
+
+
+def render_all(messages: Iterable[Message], catalog: Optional[Catalog] = None) -> List[str]:
+    catalog = catalog or _catalog
+    return [catalog.render(message) for message in messages]
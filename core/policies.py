@@ -0,0 +1,147 @@
+"""Automated decision policies for simulated players.
+
+A policy looks at the run state and the turn's pending events and returns one
+:class:`~core.models.Decision` per event, or an empty list to quit the run.
+Batch runs of the CLI, the load-test harness and balancing tools all share
+these so "a pacifist player" means the same thing everywhere, and
+:func:`play_run` is the one loop that drives a run under a policy.
+"""
+
+from __future__ import annotations
+
+import importlib
+import random
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Decision, Event, EventChoice, GameState
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .game import GameEngine
+
+Policy = Callable[[GameState, Sequence[Event], random.Random], List[Decision]]
+
+DECISION_ORDER = (Decision.peace, Decision.hostile, Decision.trade)
+
+# Choice weights (peace, hostile, trade) for the built-in player styles.
+POLICY_WEIGHTS: Dict[str, Tuple[float, float, float]] = {
+    "balanced": (0.45, 0.2, 0.35),
+    "pacifist": (0.8, 0.05, 0.15),
+    "merchant": (0.25, 0.1, 0.65),
+    "chaotic": (0.2, 0.6, 0.2),
+}
+
+SCRIPT_KEYS = {"p": Decision.peace, "h": Decision.hostile, "t": Decision.trade}
+
+
+def weighted_policy(weights: Tuple[float, float, float]) -> Policy:
+    """Pick each decision at random with the given (peace, hostile, trade) weights."""
+
+    def choose(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+        return rng.choices(DECISION_ORDER, weights=weights, k=len(events))
+
+    return choose
+
+
+def _payoff(choice: EventChoice) -> Tuple[float, float]:
+    return choice.compiled.stability, choice.compiled.score
+
+
+def greedy_policy(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+    """Pick the choice with the best immediate stability payoff (score breaks ties)."""
+
+    return [Decision(max(event.choices, key=_payoff).key) for event in events]
+
+
+def trade_first_policy(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+    """Trade unless trading would cost stability, in which case play greedy."""
+
+    decisions = []
+    for event in events:
+        trade = next((choice for choice in event.choices if choice.key == Decision.trade.value), None)
+        if trade is not None and _payoff(trade)[0] >= 0:
+            decisions.append(Decision.trade)
+        else:
+            decisions.append(Decision(max(event.choices, key=_payoff).key))
+    return decisions
+
+
+def always_peace_policy(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+    return [Decision.peace] * len(events)
+
+
+def scripted_policy(script: str) -> Policy:
+    """Replay a decision script such as ``"pphtq"``: one letter per event, ``q`` quits.
+
+    Whitespace is ignored.  The run quits when the script runs out.
+    """
+
+    letters: Iterator[str] = (letter for letter in script.lower() if not letter.isspace())
+
+    def choose(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+        decisions = []
+        for _ in events:
+            letter = next(letters, "q")
+            if letter == "q":
+                return []
+            if letter not in SCRIPT_KEYS:
+                raise ValueError(f"unknown decision {letter!r} in script; expected p, h, t or q")
+            decisions.append(SCRIPT_KEYS[letter])
+        return decisions
+
+    return choose
+
+
+POLICIES: Dict[str, Policy] = {name: weighted_policy(weights) for name, weights in POLICY_WEIGHTS.items()}
+POLICIES["random"] = weighted_policy((1.0, 1.0, 1.0))
+POLICIES["greedy"] = greedy_policy
+POLICIES["trade_first"] = trade_first_policy
+POLICIES["always_peace"] = always_peace_policy
+
+
+def resolve_policy(spec: str) -> Policy:
+    """Look up a built-in policy by name, or import one given as ``module:function``."""
+
+    if spec in POLICIES:
+        return POLICIES[spec]
+    module_name, sep, attribute = spec.partition(":")
+    if not sep:
+        raise KeyError(f"unknown policy {spec!r}; use a built-in name or module:function")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def play_run(
+    engine: GameEngine,
+    policy: Policy,
+    seed: int,
+    rng: Optional[random.Random] = None,
+    on_turn: Optional[Callable[[GameState, Sequence[Event], List[Decision]], None]] = None,
+    **start_options,
+) -> GameState:
+    """Play a new run seeded with ``seed`` to the end under ``policy``.
+
+    The policy draws from ``rng`` (by default ``random.Random(seed)``), so two
+    policies played on the same seed see the same world and the same random
+    numbers.  ``on_turn`` is called after every resolved turn.  A policy that
+    returns no decisions ends the run as ``player_quit``.
+    """
+
+    state = engine.start_run(seed=seed, **start_options)
+    run_id = state.run_id
+    rng = rng or random.Random(seed)
+    while state.run_status == "active":
+        events, error = engine.next_events(run_id)
+        if error:
+            raise RuntimeError(f"seed {seed}: {error}")
+        decisions = policy(state, events, rng)
+        if not decisions:
+            engine.end_run(run_id, reason="player_quit")
+            break
+        if len(events) == 1:
+            state, error = engine.make_decision(run_id, events[0].id, decisions[0])
+        else:
+            state, error = engine.make_decisions(run_id, [(e.id, d) for e, d in zip(events, decisions)])
+        if error:
+            raise RuntimeError(f"seed {seed}: {error}")
+        if on_turn is not None:
+            on_turn(state, events, decisions)
+    return state
@@ -0,0 +1,138 @@
+"""Counter-based random streams for the Lazy God engine.
+
+Every random draw in a run comes from a stream keyed by ``(run seed, turn,
+purpose)``, for example ``(1337, 12, "event")``.  A stream's n-th output is
+``splitmix64(key + n * GAMMA)``, so:
+
+* any turn's randomness is available in O(1) without replaying earlier turns,
+* streams never interfere: an extra quip draw cannot shift which event a
+  later turn generates, so adding content keeps regression seeds valid,
+* a stream's whole state is two integers, which makes forking a run cheap.
+
+:class:`CounterRandom` is a :class:`random.Random` subclass, so ``choice``,
+``shuffle``, ``sample`` and friends all work unchanged on top of it.
+"""
+
+from __future__ import annotations
+
+import copy
+import random
+import zlib
+from typing import Dict, Tuple
+
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+
+
+def splitmix64(value: int) -> int:
+    """The splitmix64 finaliser: a bijective 64-bit mix."""
+
+    z = (value + GAMMA) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def stream_key(seed: int, turn: int, purpose: str) -> int:
+    """Derive the 64-bit key of the ``purpose`` stream for ``turn`` of a run."""
+
+    key = splitmix64(seed & MASK64)
+    key = splitmix64(key ^ (turn & MASK64))
+    return splitmix64(key ^ zlib.crc32(purpose.encode()))
+
+
+class CounterRandom(random.Random):
+    """:class:`random.Random` driven by a keyed counter instead of a Mersenne Twister."""
+
+    def __init__(self, key: int = 0) -> None:
+        self._key = 0
+        self._counter = 0
+        super().__init__(key)
+
+    def seed(self, a=None, version: int = 2) -> None:  # noqa: D102 - mirrors random.Random
+        if a is None:
+            a = random.getrandbits(64)
+        elif not isinstance(a, int):
+            a = zlib.crc32(str(a).encode())
+        self._key = a & MASK64
+        self._counter = 0
+        self.gauss_next = None
+
+    def _next64(self) -> int:
+        self._counter += 1
+        return splitmix64((self._key + self._counter * GAMMA) & MASK64)
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        bits = 0
+        produced = 0
+        while produced < k:
+            bits = (bits << 64) | self._next64()
+            produced += 64
+        return bits >> (produced - k)
+
+    def jump(self, steps: int) -> None:
+        """Skip ``steps`` 64-bit outputs in O(1)."""
+
+        self._counter += steps
+
+    def getstate(self) -> Tuple[int, int, object]:
+        return self._key, self._counter, self.gauss_next
+
+    def setstate(self, state: Tuple[int, int, object]) -> None:
+        self._key, self._counter, self.gauss_next = state
+
+
+class RunStreams:
+    """Per-run factory of ``(turn, purpose)`` streams.
+
+    Streams for the newest turn are cached so successive draws within a turn
+    continue one sequence; asking for a newer turn drops the old ones.  Older
+    turns can still be requested (for replays) and are rebuilt from their key.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self._turn = 0
+        self._streams: Dict[str, CounterRandom] = {}
+
+    def copy(self) -> RunStreams:
+        """Return streams that continue exactly where these ones are."""
+
+        clone = RunStreams(self.seed)
+        clone._turn = self._turn
+        clone._streams = {purpose: copy.copy(rng) for purpose, rng in self._streams.items()}
+        return clone
+
+    def snapshot(self) -> Dict[str, object]:
+        """The cached streams' positions; keys are rederived from the seed on restore."""
+
+        return {
+            "seed": self.seed,
+            "turn": self._turn,
+            "counters": {purpose: rng._counter for purpose, rng in self._streams.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, object]) -> RunStreams:
+        streams = cls(data["seed"])
+        streams._turn = data["turn"]
+        for purpose, counter in data["counters"].items():
+            streams.stream(streams._turn, purpose).jump(counter)
+        return streams
+
+    def stream(self, turn: int, purpose: str) -> CounterRandom:
+        if turn != self._turn:
+            if turn < self._turn:
+                return CounterRandom(stream_key(self.seed, turn, purpose))
+            self._turn = turn
+            self._streams = {}
+        rng = self._streams.get(purpose)
+        if rng is None:
+            rng = CounterRandom(stream_key(self.seed, turn, purpose))
+            self._streams[purpose] = rng
+        return rng
@@ -0,0 +1,230 @@
+"""Weighted sampling structures for the Lazy God engine.
+
+Event generation needs to pick nation pairs in proportion to how much they
+"matter" this turn (unrest, power, simmering grudges).  Changing a single
+weight and drawing an index are both O(log n), which keeps event generation
+cheap even for very large worlds.  The world tick moves every weight at once,
+so the engine reloads the tree in O(n) once per turn and keeps point updates
+for changes within a turn, such as excluding nations already drawn.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+
+class FenwickSampler:
+    """Binary indexed tree over non-negative weights.
+
+    ``update`` and ``sample`` run in O(log n); ``load`` rebuilds the whole
+    tree in O(n).  Floating point error from repeated point updates is
+    bounded by rebuilding after every ``len(self)`` updates, which keeps the
+    amortised cost of an update at O(log n).
+    """
+
+    def __init__(self, weights: Iterable[float] = ()) -> None:
+        self._weights: List[float] = []
+        self._tree: List[float] = [0.0]
+        self._top_bit = 0
+        self._updates_since_load = 0
+        self._shared = False  # lists also held by a copy: replace them before writing
+        self.load(weights)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @property
+    def total(self) -> float:
+        return self.prefix_sum(len(self._weights))
+
+    def copy(self) -> FenwickSampler:
+        """Return an equal sampler; both share their lists until one of them changes a weight."""
+
+        clone = FenwickSampler()
+        clone._weights, clone._tree = self._weights, self._tree
+        clone._top_bit, clone._updates_since_load = self._top_bit, self._updates_since_load
+        clone._shared = self._shared = True
+        return clone
+
+    def weight(self, index: int) -> float:
+        return self._weights[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Weights and tree as they are: point updates leave float residue a reload would not."""
+
+        return {"weights": list(self._weights), "tree": list(self._tree), "updates": self._updates_since_load}
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> FenwickSampler:
+        sampler = cls(data["weights"])
+        sampler._tree = list(data["tree"])
+        sampler._updates_since_load = data["updates"]
+        return sampler
+
+    def load(self, weights: Iterable[float]) -> None:
+        """Replace every weight at once in O(n)."""
+
+        if hasattr(weights, "tolist"):  # NumPy arrays convert far faster in bulk
+            weights = weights.tolist()
+        self._weights = [w if w > 0.0 else 0.0 for w in weights]
+        size = len(self._weights)
+        tree = [0.0] + self._weights
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top_bit = 1 << (size.bit_length() - 1) if size else 0
+        self._updates_since_load = 0
+        self._shared = False
+
+    def update(self, index: int, weight: float) -> None:
+        """Set the weight at ``index``."""
+
+        weight = max(0.0, float(weight))
+        delta = weight - self._weights[index]
+        if not delta:
+            return
+        if self._shared:
+            self._weights, self._tree = list(self._weights), list(self._tree)
+            self._shared = False
+        self._weights[index] = weight
+        self._updates_since_load += 1
+        if self._updates_since_load > len(self._weights):
+            self.load(self._weights)
+            return
+        size = len(self._weights)
+        i = index + 1
+        tree = self._tree
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, count: int) -> float:
+        """Return the sum of the first ``count`` weights."""
+
+        total = 0.0
+        tree = self._tree
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def find(self, target: float) -> int:
+        """Return the first index whose cumulative weight exceeds ``target``."""
+
+        position = 0
+        step = self._top_bit
+        size = len(self._weights)
+        tree = self._tree
+        while step:
+            nxt = position + step
+            if nxt <= size and tree[nxt] <= target:
+                position = nxt
+                target -= tree[nxt]
+            step >>= 1
+        # Guard against float residue pushing us past the last positive weight.
+        index = min(position, size - 1)
+        while index > 0 and self._weights[index] <= 0.0:
+            index -= 1
+        return index
+
+    def sample(self, rng: random.Random) -> int:
+        total = self.total
+        if total <= 0.0:
+            return rng.randrange(len(self._weights))
+        return self.find(rng.random() * total)
+
+    def sample_pair(self, rng: random.Random) -> Tuple[int, int]:
+        """Draw two distinct indices without replacement.
+
+        The second draw skips over the first index's slice of the cumulative
+        distribution instead of zeroing its weight, so no tree updates are
+        needed.
+        """
+
+        if len(self._weights) < 2:
+            raise ValueError("at least two weights are required to sample a pair")
+        first = self.sample(rng)
+        first_weight = self._weights[first]
+        remaining = self.total - first_weight
+        if remaining <= 0.0:
+            second = rng.randrange(len(self._weights) - 1)
+            return first, second + (second >= first)
+        target = rng.random() * remaining
+        if target >= self.prefix_sum(first):
+            target += first_weight
+        second = self.find(target)
+        if second == first:
+            # Only reachable through rounding at the boundary of ``first``.
+            second = first + 1 if first + 1 < len(self._weights) else first - 1
+        return first, second
+
+
+class NationPairSampler:
+    """Maps nation identifiers onto a :class:`FenwickSampler`."""
+
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.ids: List[str] = list(weights)
+        self.index: Dict[str, int] = {nid: i for i, nid in enumerate(self.ids)}
+        self.tree = FenwickSampler(weights.values())
+
+    def copy(self) -> NationPairSampler:
+        clone = NationPairSampler.__new__(NationPairSampler)
+        clone.ids, clone.index = self.ids, self.index  # never mutated after construction
+        clone.tree = self.tree.copy()
+        return clone
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"ids": list(self.ids), "tree": self.tree.snapshot()}
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> NationPairSampler:
+        sampler = cls.__new__(cls)
+        sampler.ids = list(data["ids"])
+        sampler.index = {nid: i for i, nid in enumerate(sampler.ids)}
+        sampler.tree = FenwickSampler.from_snapshot(data["tree"])
+        return sampler
+
+    def refresh(self, nation_id: str, weight: float) -> None:
+        """Change one nation's weight until the next :meth:`refresh_all`."""
+
+        self.tree.update(self.index[nation_id], weight)
+
+    def refresh_all(self, weights: Sequence[float]) -> None:
+        """Reload every weight, ordered like :attr:`ids`."""
+
+        self.tree.load(weights)
+
+    def sample_pair(self, rng: random.Random) -> List[str]:
+        first, second = self.tree.sample_pair(rng)
+        return [self.ids[first], self.ids[second]]
+
+    def sample_disjoint_pairs(
+        self, rng: random.Random, count: int, exclude: Sequence[str] = ()
+    ) -> List[List[str]]:
+        """Draw ``count`` pairs in which no nation appears twice.
+
+        Drawn (and ``exclude``-d) nations are zeroed out for the rest of the
+        batch and restored afterwards, so the whole batch costs
+        O((count + len(exclude)) * log n).  There must be at least ``2 * count``
+        positively weighted nations outside ``exclude``.
+        """
+
+        tree = self.tree
+        saved: List[Tuple[int, float]] = []
+        pairs: List[List[str]] = []
+        for nid in exclude:
+            index = self.index[nid]
+            saved.append((index, tree.weight(index)))
+            tree.update(index, 0.0)
+        for _ in range(count):
+            first, second = tree.sample_pair(rng)
+            pairs.append([self.ids[first], self.ids[second]])
+            for index in (first, second):
+                saved.append((index, tree.weight(index)))
+                tree.update(index, 0.0)
+        for index, weight in reversed(saved):
+            tree.update(index, weight)
+        return pairs
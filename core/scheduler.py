@@ -0,0 +1,92 @@
+"""Per-run scheduling of delayed consequences for the Lazy God engine.
+
+Templates can declare :class:`~core.content.FollowUp` entries that land
+several turns after a choice: a follow-up event featuring the same nations, or
+delayed effects such as a treaty paying out.  :class:`EventScheduler` keeps
+them in priority queues keyed by due turn, so checking for due items is O(1)
+and popping one is O(log n) no matter how long an endless run's queue grows.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from .content import FOLLOW_UPS_BY_CODE, FollowUp
+
+
+@dataclass(order=True)
+class ScheduledItem:
+    """A follow-up waiting in the queue for its due turn."""
+
+    due_turn: int
+    sequence: int
+    follow_up: FollowUp = field(compare=False)
+    nations: Tuple[str, ...] = field(compare=False, default=())
+    source_event: str = field(compare=False, default="")
+
+
+class EventScheduler:
+    """Two min-heaps (events and effects) ordered by due turn, then insertion."""
+
+    def __init__(self) -> None:
+        self._events: List[ScheduledItem] = []
+        self._effects: List[ScheduledItem] = []
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._events) + len(self._effects)
+
+    def copy(self) -> EventScheduler:
+        """Return an independent scheduler; queued items are immutable and shared."""
+
+        clone = EventScheduler()
+        clone._events, clone._effects = list(self._events), list(self._effects)
+        clone._sequence = self._sequence
+        return clone
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Both heaps as lists, follow-ups named by their note code."""
+
+        def items(heap: List[ScheduledItem]) -> List[list]:
+            return [
+                [item.due_turn, item.sequence, item.follow_up.note_code, list(item.nations), item.source_event]
+                for item in heap
+            ]
+
+        return {"sequence": self._sequence, "events": items(self._events), "effects": items(self._effects)}
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> EventScheduler:
+        def items(rows: List[list]) -> List[ScheduledItem]:
+            return [
+                ScheduledItem(due, sequence, FOLLOW_UPS_BY_CODE[code], tuple(nations), source)
+                for due, sequence, code, nations, source in rows
+            ]
+
+        scheduler = cls()
+        scheduler._events, scheduler._effects = items(data["events"]), items(data["effects"])
+        scheduler._sequence = data["sequence"]
+        return scheduler
+
+    def schedule(self, due_turn: int, follow_up: FollowUp, nations: Tuple[str, ...], source_event: str) -> None:
+        self._sequence += 1
+        item = ScheduledItem(due_turn, self._sequence, follow_up, tuple(nations), source_event)
+        heapq.heappush(self._events if follow_up.template_key else self._effects, item)
+
+    def pop_due_events(self, turn: int, limit: int) -> List[ScheduledItem]:
+        """Pop up to ``limit`` follow-up events due on or before ``turn``."""
+
+        due: List[ScheduledItem] = []
+        while self._events and self._events[0].due_turn <= turn and len(due) < limit:
+            due.append(heapq.heappop(self._events))
+        return due
+
+    def pop_due_effects(self, turn: int) -> List[ScheduledItem]:
+        """Pop every delayed effect due on or before ``turn``."""
+
+        due: List[ScheduledItem] = []
+        while self._effects and self._effects[0].due_turn <= turn:
+            due.append(heapq.heappop(self._effects))
+        return due
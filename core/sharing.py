@@ -0,0 +1,248 @@
+"""Copy-on-write containers for forked runs.
+
+:meth:`core.game.GameEngine.fork_run` branches a run without copying what
+the two runs still agree on.  Each container here forks in time that does
+not depend on how much it holds: what both runs had at the fork is frozen
+and shared, and each run keeps its own changes on top of it.
+
+* :class:`LayeredDict` freezes its entries into a layer both runs read
+  through; writes land in the writer's own top layer.
+* :class:`SharedLog` freezes its items into a segment both runs read
+  through; appends land in the writer's own tail.
+* :class:`DecisionTape` refers to the parent's tape and the length it had at
+  the fork, which stays valid because tapes only grow.
+
+Lookups walk at most :data:`MAX_LAYERS` frozen layers or segments.  Longer
+fork chains fold all but the oldest layer together, so that copy is paid
+once every few forks, and only for what the forks themselves changed.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+K = TypeVar("K")
+V = TypeVar("V")
+T = TypeVar("T")
+
+MAX_LAYERS = 8
+
+
+class LayeredDict(Mapping[K, V]):
+    """Dict that can be forked in O(1); entries are never removed."""
+
+    __slots__ = ("_own", "_layers")
+
+    def __init__(self, items: Union[Mapping[K, V], Iterable[Tuple[K, V]]] = ()) -> None:
+        self._own: Dict[K, V] = dict(items)
+        self._layers: Tuple[Dict[K, V], ...] = ()  # frozen, newest first
+
+    def __getitem__(self, key: K) -> V:
+        own = self._own
+        if key in own:
+            return own[key]
+        for layer in self._layers:
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._own[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._own or any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[K]:
+        """Keys in first-insertion order, as a dict would keep them."""
+
+        if not self._layers:
+            return iter(self._own)
+        return self._merged_keys()
+
+    def _merged_keys(self) -> Iterator[K]:
+        seen = set()
+        for layer in (*reversed(self._layers), self._own):
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        if not self._layers:
+            return len(self._own)
+        return sum(1 for _ in self._merged_keys())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def _freeze(self) -> None:
+        """Move this dict's own entries into a shared layer."""
+
+        if not self._own:
+            return
+        layers = (self._own, *self._layers)
+        if len(layers) > MAX_LAYERS:
+            folded: Dict[K, V] = {}
+            for layer in reversed(layers[:-1]):
+                folded.update(layer)
+            layers = (folded, layers[-1])
+        self._layers = layers
+        self._own = {}
+
+    def fork(self) -> LayeredDict[K, V]:
+        """Return a dict equal to this one; neither sees the other's later writes."""
+
+        self._freeze()
+        clone = type(self).__new__(type(self))
+        clone._own, clone._layers = {}, self._layers
+        return clone
+
+
+class SharedLog(Sequence[T]):
+    """Append-only log that can be forked in O(1).
+
+    Supports what the engine does to its logs: appending at the end, reading
+    by index or slice, iterating either way and dropping the oldest items
+    (``del log[:n]``).  Items are shared with forks, not copied.
+    """
+
+    __slots__ = ("_segments", "_frozen", "_tail")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self._segments: Tuple[Tuple[List[T], int, int], ...] = ()  # frozen (items, start, stop), oldest first
+        self._frozen = 0  # items held by the segments
+        self._tail: List[T] = list(items)
+
+    def __len__(self) -> int:
+        return self._frozen + len(self._tail)
+
+    def __bool__(self) -> bool:
+        return bool(self._frozen or self._tail)
+
+    def __iter__(self) -> Iterator[T]:
+        for items, start, stop in self._segments:
+            yield from islice(items, start, stop)
+        yield from self._tail
+
+    def __reversed__(self) -> Iterator[T]:
+        yield from reversed(self._tail)
+        for items, start, stop in reversed(self._segments):
+            for index in range(stop - 1, start - 1, -1):
+                yield items[index]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return list(islice(self, start, max(start, stop)))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("log index out of range")
+        if index >= self._frozen:
+            return self._tail[index - self._frozen]
+        for items, start, stop in self._segments:
+            if index < stop - start:
+                return items[start + index]
+            index -= stop - start
+        raise AssertionError("unreachable")
+
+    def __delitem__(self, index: slice) -> None:
+        """Drop the oldest items: only ``del log[:n]`` is supported."""
+
+        if not isinstance(index, slice):
+            raise TypeError("only the oldest items of a log can be dropped")
+        start, stop, step = index.indices(len(self))
+        if start or step != 1:
+            raise TypeError("only the oldest items of a log can be dropped")
+        count = stop
+        segments = list(self._segments)
+        while count and segments:
+            items, first, last = segments[0]
+            if count < last - first:
+                segments[0] = (items, first + count, last)
+                self._frozen -= count
+                count = 0
+            else:
+                del segments[0]
+                self._frozen -= last - first
+                count -= last - first
+        self._segments = tuple(segments)
+        del self._tail[:count]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (SharedLog, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SharedLog({list(self)!r})"
+
+    def append(self, item: T) -> None:
+        self._tail.append(item)
+
+    def extend(self, items: Iterable[T]) -> None:
+        self._tail.extend(items)
+
+    def fork(self, keep: int = 0, clone_item: Optional[Callable[[T], T]] = None) -> SharedLog[T]:
+        """Return a log equal to this one; neither sees the other's later appends.
+
+        All but the newest ``keep`` items are frozen and shared.  Those
+        newest items stay private to each log: this one keeps them and the
+        fork gets ``clone_item`` of each (the items themselves by default).
+        """
+
+        keep = min(keep, len(self._tail))
+        shared = len(self._tail) - keep
+        kept = self._tail[shared:]
+        if shared:
+            segments = (*self._segments, (self._tail, 0, shared))
+            if len(segments) > MAX_LAYERS:
+                folded = [item for items, start, stop in segments[1:] for item in islice(items, start, stop)]
+                segments = (segments[0], (folded, 0, len(folded)))
+            self._segments = segments
+            self._frozen += shared
+            self._tail = kept
+        clone = SharedLog.__new__(SharedLog)
+        clone._segments, clone._frozen = self._segments, self._frozen
+        clone._tail = [clone_item(item) for item in kept] if clone_item else list(kept)
+        return clone
+
+
+class DecisionTape:
+    """Append-only byte tape that can be forked in O(1).
+
+    A fork refers to its parent's tape and the length that tape had at the
+    fork; the parent only ever appends, so that prefix never changes.
+    """
+
+    __slots__ = ("_parent", "_prefix", "_own")
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._parent: Optional[DecisionTape] = None
+        self._prefix = 0
+        self._own = bytearray(data)
+
+    def __len__(self) -> int:
+        return self._prefix + len(self._own)
+
+    def __bytes__(self) -> bytes:
+        parts: List[Any] = []
+        tape: Optional[DecisionTape] = self
+        end = len(self)
+        while tape is not None:
+            parts.append(tape._own[: end - tape._prefix])
+            tape, end = tape._parent, tape._prefix
+        return b"".join(reversed(parts))
+
+    def extend(self, codes: Iterable[int]) -> None:
+        self._own.extend(codes)
+
+    def fork(self) -> DecisionTape:
+        clone = DecisionTape()
+        clone._parent, clone._prefix = self, len(self)
+        return clone
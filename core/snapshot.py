@@ -0,0 +1,103 @@
+"""Run snapshots for the Lazy God engine.
+
+:meth:`core.game.GameEngine.snapshot_run` captures a run as plain JSON-safe
+data and :meth:`~core.game.GameEngine.restore_run` rebuilds it, in another
+process if need be, so that the restored run continues exactly as the
+original would have: same events, same draws, same serialized state.
+
+Unlike the API dicts, snapshots keep narrative messages as codes (see
+:func:`core.narrative.dump_message`) rather than rendered text, and refer to
+shared content by key: an event's choices and tags come back from its
+template, a queued follow-up from its note code.  The codecs here are
+generated like the API ones (see :mod:`core.codec`).
+"""
+
+from __future__ import annotations
+
+from .blocs import AllianceBlocs
+from .codec import LIST, Codec, Conv, derived, each, enum_conv, nested
+from .content import TEMPLATES_BY_KEY
+from .history import StabilityHistory
+from .models import (
+    ASSISTANT_CODEC,
+    NATION_CODEC,
+    Event,
+    EventKind,
+    EventResolution,
+    GameState,
+    NationMap,
+    StabilityState,
+    shared_tuple,
+)
+from .narrative import dump_message, load_message
+from .scheduler import EventScheduler
+from .sharing import LayeredDict, SharedLog
+
+# Bumped whenever the layout changes; restore_run rejects other versions.
+SNAPSHOT_VERSION = 1
+
+_MESSAGES = {"_dump_message": dump_message, "_load_message": load_message}
+MESSAGE = Conv("_dump_message({v})", "_load_message({v})", names=_MESSAGES)
+MESSAGE_LIST = Conv("[_dump_message(m) for m in {v}]", "[_load_message(m) for m in {v}]", names=_MESSAGES)
+MESSAGE_LOG = Conv(
+    "[_dump_message(m) for m in {v}]",
+    "_SharedLog(_load_message(m) for m in {v})",
+    names={**_MESSAGES, "_SharedLog": SharedLog},
+)
+MESSAGE_DICT = Conv(
+    "{k: _dump_message(m) for k, m in {v}.items()}", "{k: _load_message(m) for k, m in {v}.items()}", names=_MESSAGES
+)
+
+
+def _snapshot_of(cls: type, optional: bool = False) -> Conv:
+    """A helper object written with its own ``snapshot`` / ``from_snapshot``."""
+
+    name = f"_{cls.__name__}"
+    if optional:
+        return Conv(
+            "None if {v} is None else {v}.snapshot()",
+            f"None if {{v}} is None else {name}.from_snapshot({{v}})",
+            names={name: cls},
+        )
+    return Conv("{v}.snapshot()", f"{name}.from_snapshot({{v}})", names={name: cls})
+
+
+def _by_id(codec: Codec, container: type = dict) -> Conv:
+    """A dict of models keyed by id, in order, rebuilt as ``container``."""
+
+    name = codec.cls.__name__
+    return Conv(
+        f"{{k: _dump_{name}(x) for k, x in {{v}}.items()}}",
+        f"_{container.__name__}({{k: _load_{name}(x) for k, x in {{v}}.items()}})",
+        names={f"_dump_{name}": codec.dump, f"_load_{name}": codec.load, f"_{container.__name__}": container},
+    )
+
+
+RESOLUTION_SNAPSHOT = Codec(
+    EventResolution,
+    relation_changes=Conv("[list(c) for c in {v}]", "[tuple(c) for c in {v}]"),
+    logs=MESSAGE_LIST,
+)
+EVENT_SNAPSHOT = Codec(
+    Event,
+    kind=enum_conv(EventKind),
+    nations=LIST,
+    summary=MESSAGE,
+    choices=derived("_TEMPLATES[data['template_key']].choices", _TEMPLATES=TEMPLATES_BY_KEY),
+    tags=derived("_TEMPLATES[data['template_key']].tags", _TEMPLATES=TEMPLATES_BY_KEY),
+    assistant_influence=Conv("list({v})", "_shared_tuple({v})", names={"_shared_tuple": shared_tuple}),
+    resolution=nested(RESOLUTION_SNAPSHOT, optional=True),
+)
+STATE_SNAPSHOT = Codec(
+    GameState,
+    stability_state=enum_conv(StabilityState),
+    nations=_by_id(NATION_CODEC, NationMap),
+    assistants=_by_id(ASSISTANT_CODEC),
+    events_log=each(EVENT_SNAPSHOT, SharedLog),
+    stability_history=_snapshot_of(StabilityHistory),
+    revealed_mask=Conv("dict({v})", "_LayeredDict({v})", names={"_LayeredDict": LayeredDict}),
+    god_quips=MESSAGE_LOG,
+    assistant_notes=MESSAGE_DICT,
+    blocs=_snapshot_of(AllianceBlocs, optional=True),
+    scheduler=_snapshot_of(EventScheduler, optional=True),
+)
@@ -0,0 +1,73 @@
+"""Hidden trait registry and bitset helpers.
+
+Trait names are interned once in :data:`TRAITS`, which maps each name to a
+bit position.  A nation's hidden traits and the traits the player has
+revealed are then plain ``int`` bitsets, so "which traits are still hidden"
+is ``hidden & ~revealed`` instead of building sets of strings, and a nation
+stores one small integer instead of a list of names.
+
+Content traits are registered at import in a fixed order so bit positions
+(and therefore seeded reveals) are identical in every process.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, Iterable, List, Optional
+
+
+class TraitRegistry:
+    """Bidirectional mapping between trait names and bit positions."""
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+        for name in names:
+            self.bit(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._bits
+
+    def bit(self, name: str) -> int:
+        """Return the bit position of ``name``, registering it if it is new."""
+
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = self._bits[name] = len(self._names)
+            self._names.append(name)
+        return bit
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bit(name)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Trait names set in ``mask``, in registration order."""
+
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self._names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def name(self, bit: int) -> str:
+        return self._names[bit]
+
+
+def pick_bit(mask: int, rng: random.Random) -> Optional[int]:
+    """Return the position of a uniformly chosen set bit of ``mask`` (``None`` if empty)."""
+
+    if not mask:
+        return None
+    for _ in range(rng.randrange(bin(mask).count("1"))):
+        mask &= mask - 1
+    return (mask & -mask).bit_length() - 1
+
+
+TRAITS = TraitRegistry()
@@ -56,6 +56,7 @@ export default function StatsPanel({ state }: StatsPanelProps) {
   const trendingNations = Object.values(state.nations)
     .sort((a, b) => b.prosperity - a.prosperity)
     .slice(0, 3);
+  const blocs = (state.blocs ?? []).slice(0, 3);
 
   return (
     <motion.section
@@ -113,6 +114,24 @@ export default function StatsPanel({ state }: StatsPanelProps) {
             ))}
           </div>
         </div>
+        {blocs.length > 0 && (
+          <div>
+            <p className="text-[0.6rem] uppercase tracking-[0.25em] text-white/50">Alliance Blocs</p>
+            <div className="mt-3 flex flex-col gap-2">
+              {blocs.map((bloc) => (
+                <div
+                  key={bloc.id}
+                  className="flex items-center justify-between gap-3 rounded-2xl border border-white/10 bg-night-900/60 px-4 py-3 text-sm text-white/80"
+                >
+                  <p className="min-w-0 truncate">
+                    {bloc.members.map((nid) => state.nations[nid]?.name ?? nid).join(' · ')}
+                  </p>
+                  <span className="shrink-0 text-[0.65rem] text-white/50">{bloc.size} nations</span>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
       </div>
     </motion.section>
   );
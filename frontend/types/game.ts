@@ -71,6 +71,12 @@ export interface GameEvent {
   rng_seed?: number;
 }
 
+export interface GameBloc {
+  id: string;
+  size: number;
+  members: string[];
+}
+
 export interface GameState {
   run_id: string;
   turn: number;
@@ -90,6 +96,11 @@ export interface GameState {
   revealed_traits: Record<string, string[]>;
   god_quips: string[];
   assistant_notes: Record<string, string>;
+  blocs?: GameBloc[];
+  events_per_turn?: number;
+  endless?: boolean;
+  event_window?: number;
+  version?: number;
 }
 
 export interface PlayerProfileSummary {
@@ -126,6 +137,7 @@ export interface NextEventResponse {
   run_id: string;
   session_id: string | null;
   event: GameEvent;
+  events: GameEvent[];
   state: GameState;
 }
 
@@ -1,14 +1,38 @@
+"""Command-line Lazy God.
+
+Interactive play::
+
+    python prototype/cli_game.py 1337
+
+Batch mode plays many runs back to back without prompts and writes JSONL
+(one record per run, plus one per turn with ``--per-turn``)::
+
+    python prototype/cli_game.py --batch --runs 100 --policy pacifist
+    python prototype/cli_game.py --batch --seeds seeds.txt --policy greedy -o runs.jsonl
+    printf '1337 pphtt\n42 tttq\n' | python prototype/cli_game.py --batch --script -
+
+Script lines are ``<seed> <decisions>`` where decisions are ``p``/``h``/``t``
+letters (one per event) and ``q`` quits; seed files hold one seed per line.
+Blank lines and ``#`` comments are ignored in both.
+"""
+
 from __future__ import annotations
 
+import argparse
+import json
 import sys
 from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from core.game import GameEngine
-from core.models import Decision
+from core.models import Decision, Event, GameState
+from core.narrative import render, render_all
+from core.policies import POLICIES, Policy, play_run, resolve_policy, scripted_policy
 
 PROMPT = "\nChoose [p]eace, [h]ostile, [t]rade or [q]uit: "
+DECISION_LETTERS = {Decision.peace: "p", Decision.hostile: "h", Decision.trade: "t"}
 
 def main(seed: int = 0) -> None:
     engine = GameEngine(seed=seed)
@@ -38,7 +62,7 @@ def main(seed: int = 0) -> None:
         print(
             f"\nTurn {state.turn} | Stability: {state.stability:.2f} ({state.stability_state.value}) | Score: {state.score}"
         )
-        print(f"Event: {event.summary}")
+        print(f"Event: {render(event.summary)}")
         involved = ", ".join(state.nations[nid].name for nid in event.nations)
         print(f"Involved nations: {involved}")
         if event.tags:
@@ -64,12 +88,12 @@ def main(seed: int = 0) -> None:
         resolution = updated_state.events_log[-1].resolution if updated_state.events_log else None
         if resolution:
             print("Outcome:")
-            for log in resolution.logs:
+            for log in render_all(resolution.logs):
                 print(f"  - {log}")
         print(f"Stability: {updated_state.stability:.2f} | Score: {updated_state.score}")
         print(f"Peace streak: {updated_state.peace_streak} | Chaos streak: {updated_state.chaos_streak}")
         if updated_state.god_quips:
-            print(f"Latest god quip: {updated_state.god_quips[-1]}")
+            print(f"Latest god quip: {render(updated_state.god_quips[-1])}")
         if updated_state.revealed_traits:
             reveals = {
                 state.nations[nid].name: traits for nid, traits in updated_state.revealed_traits.items() if traits
@@ -85,6 +109,144 @@ def main(seed: int = 0) -> None:
             print(f"\nRun ended. Reason: {updated_state.run_status}. Final score: {final['final_score']}")
             break
 
+
+def play_batch_run(
+    engine: GameEngine,
+    seed: int,
+    policy: Policy,
+    per_turn: bool = False,
+    verbose: bool = False,
+    turn_limit: int = 20,
+    world_size: int = 8,
+    events_per_turn: int = 1,
+) -> List[dict]:
+    """Play one run to the end under ``policy`` and return its JSONL records."""
+
+    records: List[dict] = []
+    letters: List[str] = []
+
+    def on_turn(state: GameState, events: Sequence[Event], decisions: List[Decision]) -> None:
+        letters.extend(DECISION_LETTERS[decision] for decision in decisions)
+        if per_turn:
+            records.append(
+                {
+                    "type": "turn",
+                    "seed": seed,
+                    "turn": state.turn - 1,
+                    "events": [event.template_key for event in events],
+                    "decisions": [decision.value for decision in decisions],
+                    "stability": state.stability,
+                    "stability_state": state.stability_state.value,
+                    "score": state.score,
+                }
+            )
+        if verbose:
+            print(
+                f"[seed {seed}] turn {state.turn - 1}: {''.join(letters[-len(decisions):])} -> "
+                f"stability {state.stability:.2f}, score {state.score}",
+                file=sys.stderr,
+            )
+
+    state = play_run(
+        engine,
+        policy,
+        seed,
+        on_turn=on_turn,
+        turn_limit=turn_limit,
+        world_size=world_size,
+        events_per_turn=events_per_turn,
+    )
+    records.append(
+        {
+            "type": "run",
+            "seed": seed,
+            "result": state.run_status,
+            "score": state.score,
+            "stability": state.stability,
+            "turns": state.turn - 1,
+            "decisions": "".join(letters),
+        }
+    )
+    engine.discard_run(state.run_id)
+    return records
+
+
+def run_batch(jobs: Iterable[Tuple[int, Policy]], out: IO[str], **options) -> int:
+    """Play every ``(seed, policy)`` job, writing JSONL to ``out``; return the run count."""
+
+    engine = GameEngine(seed=0)
+    runs = 0
+    for seed, policy in jobs:
+        records = play_batch_run(engine, seed, policy, **options)
+        out.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+        runs += 1
+    out.flush()
+    return runs
+
+
+def _lines(source: str) -> Iterator[str]:
+    handle = sys.stdin if source == "-" else open(source)
+    try:
+        for line in handle:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _batch_jobs(args: argparse.Namespace) -> Iterator[Tuple[int, Policy]]:
+    if args.script:
+        for line in _lines(args.script):
+            seed, _, script = line.partition(" ")
+            yield int(seed), scripted_policy(script)
+        return
+    policy = resolve_policy(args.policy)
+    seeds: Iterable[int] = (
+        (int(line) for line in _lines(args.seeds)) if args.seeds else range(args.start_seed, args.start_seed + args.runs)
+    )
+    for seed in seeds:
+        yield seed, policy
+
+
+def cli(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Play Lazy God interactively or in batch mode.")
+    parser.add_argument("seed", nargs="?", type=int, default=0, help="seed for an interactive run")
+    parser.add_argument("--batch", action="store_true", help="play without prompts and write JSONL")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--script", help="file of '<seed> <decisions>' lines ('-' for stdin)")
+    source.add_argument("--seeds", help="file of seeds, one per line ('-' for stdin)")
+    parser.add_argument("--runs", type=int, default=10, help="runs to play when no seed file is given")
+    parser.add_argument("--start-seed", type=int, default=1)
+    parser.add_argument(
+        "--policy", default="balanced", help=f"one of {', '.join(sorted(POLICIES))}, or module:function"
+    )
+    parser.add_argument("--turn-limit", type=int, default=20)
+    parser.add_argument("--world-size", type=int, default=8)
+    parser.add_argument("--events-per-turn", type=int, default=1)
+    parser.add_argument("--per-turn", action="store_true", help="also write one record per turn")
+    parser.add_argument("--verbose", action="store_true", help="print a line per turn to stderr")
+    parser.add_argument("-o", "--output", default="-", help="JSONL destination ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if not args.batch:
+        main(args.seed)
+        return
+    out = sys.stdout if args.output == "-" else open(args.output, "w", buffering=1 << 20)
+    try:
+        run_batch(
+            _batch_jobs(args),
+            out,
+            per_turn=args.per_turn,
+            verbose=args.verbose,
+            turn_limit=args.turn_limit,
+            world_size=args.world_size,
+            events_per_turn=args.events_per_turn,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
 if __name__ == "__main__":
-    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
-    main(seed)
+    cli()
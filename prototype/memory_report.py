@@ -0,0 +1,78 @@
+"""Memory report: how much a resident run costs, by category.
+
+Plays ``--runs`` runs to the end with one policy and keeps them all in
+memory, the way a server holds finished runs until they are archived, then
+prints the mean bytes per run from :meth:`core.game.GameEngine.memory_usage`
+next to the resident set growth per run::
+
+    python prototype/memory_report.py --runs 500
+    python prototype/memory_report.py --runs 200 --world-size 32 --turn-limit 60
+
+Objects shared by every run (templates, choices, interned strings) are not
+charged to any run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.game import GameEngine
+from core.memory import RunMemory, rss_mb
+from core.policies import POLICIES, play_run
+
+CATEGORIES = ("nations", "events_log", "history", "quips", "other")
+
+
+def measure(runs: int, policy: str, seed: int = 0, **start_options) -> Tuple[List[RunMemory], float]:
+    """Play ``runs`` runs under ``policy`` and keep them resident.
+
+    Returns each run's memory usage and the process RSS growth per run.
+    """
+
+    engine = GameEngine(seed=seed)
+    gc.collect()
+    before = rss_mb()
+    for offset in range(runs):
+        play_run(engine, POLICIES[policy], seed + offset + 1, **start_options)
+    gc.collect()
+    rss_per_run = (rss_mb() - before) * 2**20 / runs if runs else 0.0
+    return engine.memory_by_run(), rss_per_run
+
+
+def report(usages: Sequence[RunMemory], rss_per_run: float, out=sys.stdout) -> None:
+    count = len(usages) or 1
+    print(f"{len(usages)} resident runs, mean turn {sum(u.turn for u in usages) / count:.1f}", file=out)
+    for category in CATEGORIES + ("total",):
+        mean = sum(getattr(usage, category) for usage in usages) / count
+        print(f"  {category:<11} {mean:>10,.0f} bytes/run", file=out)
+    print(f"  {'RSS growth':<11} {rss_per_run:>10,.0f} bytes/run", file=out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report the resident memory of finished runs.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--world-size", type=int, default=8)
+    parser.add_argument("--turn-limit", type=int, default=20)
+    parser.add_argument("--events-per-turn", type=int, default=1)
+    args = parser.parse_args(argv)
+    usages, rss_per_run = measure(
+        args.runs,
+        args.policy,
+        args.seed,
+        world_size=args.world_size,
+        turn_limit=args.turn_limit,
+        events_per_turn=args.events_per_turn,
+    )
+    report(usages, rss_per_run)
+
+
+if __name__ == "__main__":
+    main()
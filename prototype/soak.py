@@ -0,0 +1,192 @@
+"""Soak test: drive the engine for millions of turns and check invariants.
+
+Runs cycle through seeds, turn limits, world sizes, events per turn, endless
+mode and the built-in policies.  After every resolved turn the state is
+checked against the engine's invariants; violations are counted by name
+with the first offending (seed, turn) kept for reproduction.  Throughput and
+the memory high-water mark are printed periodically::
+
+    python prototype/soak.py --turns 2000000
+    python prototype/soak.py --turns 50000 --fail-fast
+
+The exit status is non-zero when any invariant was violated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.game import GameEngine
+from core.models import Decision, Event, GameState
+from core.policies import POLICIES, Policy, play_run
+
+TURN_LIMITS = (5, 20, 60, 200)
+WORLD_SIZES = (2, 8, 32)
+EVENTS_PER_TURN = (1, 1, 2, 4)
+ENDLESS_EVERY = 5  # every fifth run is endless, capped by --endless-turns
+
+
+def max_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (0.0 where unsupported)."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-Unix
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def check_invariants(state: GameState, events: Sequence[Event]) -> List[str]:
+    """Return the names of every invariant ``state`` violates after resolving ``events``."""
+
+    violations = []
+    if not 0.0 <= state.stability <= 1.0:
+        violations.append("stability_in_unit_interval")
+    if state.score < 0:
+        violations.append("score_non_negative")
+    if state.stability_history[-1] != state.stability_milli:
+        violations.append("history_tracks_stability")
+    if any(not event.resolved for event in events) or (state.events_log and not state.events_log[-1].resolved):
+        violations.append("no_pending_after_decision")
+    if any(assistant.cooldown_remaining < 0 for assistant in state.assistants.values()):
+        violations.append("cooldowns_non_negative")
+    if state.endless and len(state.events_log) > state.event_window:
+        violations.append("endless_window_bounded")
+    return violations
+
+
+@dataclass
+class SoakReport:
+    turns: int = 0
+    runs: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    violations: Counter = field(default_factory=Counter)
+    first_violation: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    _mark: Optional[Tuple[float, int]] = None
+
+    def line(self) -> str:
+        """Progress line with overall and since-last-line throughput."""
+
+        now = time.perf_counter()
+        elapsed = now - self.started
+        mark_time, mark_turns = self._mark or (self.started, 0)
+        recent = (self.turns - mark_turns) / (now - mark_time) if now > mark_time else 0.0
+        self._mark = (now, self.turns)
+        rate = self.turns / elapsed if elapsed else 0.0
+        return (
+            f"{elapsed:8.1f}s  {self.turns:>10} turns  {self.runs:>7} runs  {rate:>7.0f} turns/s "
+            f"(recent {recent:>7.0f})  peak RSS {max_rss_mb():7.1f} MB  violations {sum(self.violations.values())}"
+        )
+
+
+def _capped(policy: Policy, max_turns: int) -> Policy:
+    """Wrap ``policy`` so the run quits after ``max_turns`` turns."""
+
+    turns = itertools.count()
+
+    def choose(state: GameState, events: Sequence[Event], rng: random.Random) -> List[Decision]:
+        return policy(state, events, rng) if next(turns) < max_turns else []
+
+    return choose
+
+
+def _run_configs(seed: int) -> Iterator[Tuple[int, str, dict]]:
+    rng = random.Random(seed)
+    policies = sorted(POLICIES)
+    for index in itertools.count():
+        options = {
+            "turn_limit": rng.choice(TURN_LIMITS),
+            "world_size": rng.choice(WORLD_SIZES),
+            "events_per_turn": rng.choice(EVENTS_PER_TURN),
+        }
+        if index % ENDLESS_EVERY == ENDLESS_EVERY - 1:
+            options.update(endless=True, event_window=rng.choice((1, 10, 50)))
+        yield rng.randrange(1, 2**31), policies[index % len(policies)], options
+
+
+def soak(
+    total_turns: int,
+    seed: int = 0,
+    endless_turns: int = 2_000,
+    report_every: float = 10.0,
+    fail_fast: bool = False,
+    out=sys.stdout,
+) -> SoakReport:
+    """Play runs until ``total_turns`` turns have been checked."""
+
+    with tempfile.TemporaryDirectory(prefix="lazy_god_soak_") as archive_dir:
+        engine = GameEngine(seed=seed, archive_dir=Path(archive_dir))
+        return _soak(engine, total_turns, seed, endless_turns, report_every, fail_fast, out)
+
+
+def _soak(
+    engine: GameEngine,
+    total_turns: int,
+    seed: int,
+    endless_turns: int,
+    report_every: float,
+    fail_fast: bool,
+    out,
+) -> SoakReport:
+    report = SoakReport()
+    next_report = report.started + report_every
+    for run_seed, policy_name, options in _run_configs(seed):
+        policy = POLICIES[policy_name]
+        if options.get("endless"):
+            policy = _capped(policy, endless_turns)
+        remaining = total_turns - report.turns
+        policy = _capped(policy, remaining)
+
+        def on_turn(state: GameState, events: Sequence[Event], decisions: List[Decision]) -> None:
+            nonlocal next_report
+            report.turns += 1
+            for violation in check_invariants(state, events):
+                report.violations[violation] += 1
+                report.first_violation.setdefault(violation, (run_seed, state.turn - 1))
+                if fail_fast:
+                    raise AssertionError(f"{violation} violated: seed {run_seed}, turn {state.turn - 1}")
+            if report_every and time.perf_counter() >= next_report:
+                print(report.line(), file=out, flush=True)
+                next_report += report_every
+
+        state = play_run(engine, policy, run_seed, **options, on_turn=on_turn)
+        report.runs += 1
+        report.outcomes[state.run_status] += 1
+        engine.discard_run(state.run_id)
+        if report.turns >= total_turns:
+            break
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Soak-test the engine and check invariants after every turn.")
+    parser.add_argument("--turns", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0, help="seed for the run configuration sequence")
+    parser.add_argument("--endless-turns", type=int, default=2_000, help="turns before an endless run quits")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress lines")
+    parser.add_argument("--fail-fast", action="store_true", help="stop at the first violation")
+    args = parser.parse_args(argv)
+    report = soak(args.turns, args.seed, args.endless_turns, args.report_every, args.fail_fast)
+    print(report.line())
+    print("outcomes: " + ", ".join(f"{status} {count}" for status, count in report.outcomes.most_common()))
+    for violation, count in report.violations.most_common():
+        run_seed, turn = report.first_violation[violation]
+        print(f"VIOLATION {violation}: {count} times, first at seed {run_seed} turn {turn}")
+    sys.exit(1 if report.violations else 0)
+
+
+if __name__ == "__main__":
+    main()
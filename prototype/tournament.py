@@ -0,0 +1,208 @@
+"""Policy tournament: compare decision strategies on a shared set of seeds.
+
+Every policy plays the same seeds with the same policy random numbers
+(common random numbers), so differences between policies come from the
+decisions rather than from luck of the draw.  Besides per-policy win rates
+and mean scores, the report gives each policy's paired score difference
+against the first one, whose confidence interval is much tighter than
+comparing the two means independently.
+
+    python prototype/tournament.py greedy trade_first always_peace random --seeds 500
+    python prototype/tournament.py greedy mypolicies:cautious --seeds 2000 --workers 8
+
+Policies are built-in names from ``core.policies`` or ``module:function``
+specs importable by the worker processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from core.game import GameEngine
+from core.policies import POLICIES, play_run, resolve_policy
+
+Z_95 = 1.959963984540054
+OUTCOMES = ("won", "collapsed", "turn_limit")
+
+# (seed, run_status, score, stability)
+RunOutcome = Tuple[int, str, int, float]
+
+
+def _play_chunk(policy_spec: str, seeds: Sequence[int], start_options: dict) -> List[RunOutcome]:
+    """Worker entry point: play ``seeds`` under one policy."""
+
+    policy = resolve_policy(policy_spec)
+    engine = GameEngine(seed=0)
+    outcomes: List[RunOutcome] = []
+    for seed in seeds:
+        state = play_run(engine, policy, seed, **start_options)
+        outcomes.append((seed, state.run_status, state.score, state.stability))
+        engine.discard_run(state.run_id)
+    return outcomes
+
+
+def mean_interval(values: Sequence[float]) -> Tuple[float, float]:
+    """Return the mean of ``values`` and the half-width of its 95% normal interval."""
+
+    count = len(values)
+    if not count:
+        return 0.0, 0.0
+    mean = sum(values) / count
+    if count < 2:
+        return mean, math.inf
+    variance = sum((value - mean) ** 2 for value in values) / (count - 1)
+    return mean, Z_95 * math.sqrt(variance / count)
+
+
+def wilson_interval(successes: int, trials: int) -> Tuple[float, float]:
+    """95% Wilson score interval for a binomial proportion."""
+
+    if not trials:
+        return 0.0, 0.0
+    p = successes / trials
+    denominator = 1 + Z_95**2 / trials
+    centre = (p + Z_95**2 / (2 * trials)) / denominator
+    spread = Z_95 * math.sqrt(p * (1 - p) / trials + Z_95**2 / (4 * trials**2)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+@dataclass
+class PolicyResult:
+    """Aggregated tournament results for one policy."""
+
+    policy: str
+    outcomes: List[RunOutcome]
+
+    @property
+    def scores(self) -> List[float]:
+        return [score for _, _, score, _ in self.outcomes]
+
+    def rate(self, status: str) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for _, result, _, _ in self.outcomes if result == status) / len(self.outcomes)
+
+    def summary(self, baseline: Optional[PolicyResult] = None) -> dict:
+        wins = sum(1 for _, result, _, _ in self.outcomes if result == "won")
+        mean, half_width = mean_interval(self.scores)
+        summary = {
+            "policy": self.policy,
+            "runs": len(self.outcomes),
+            "win_rate": wins / len(self.outcomes) if self.outcomes else 0.0,
+            "win_rate_ci": wilson_interval(wins, len(self.outcomes)),
+            "rates": {status: self.rate(status) for status in OUTCOMES},
+            "mean_score": mean,
+            "mean_score_ci": (mean - half_width, mean + half_width),
+        }
+        if baseline is not None and baseline is not self:
+            # Outcomes are sorted by seed, so entries pair up run for run.
+            diffs = [a - b for a, b in zip(self.scores, baseline.scores)]
+            diff, diff_half_width = mean_interval(diffs)
+            summary["score_vs_baseline"] = diff
+            summary["score_vs_baseline_ci"] = (diff - diff_half_width, diff + diff_half_width)
+        return summary
+
+
+def run_tournament(
+    policies: Sequence[str],
+    seeds: Sequence[int],
+    workers: Optional[int] = None,
+    chunk_size: int = 50,
+    **start_options,
+) -> Dict[str, PolicyResult]:
+    """Play every seed under every policy, spreading chunks over a process pool.
+
+    ``workers=1`` plays everything in-process, which also allows policies that
+    cannot be imported by name in a child process.  Results are keyed by
+    policy, so each may only be listed once.
+    """
+
+    if len(set(policies)) != len(policies):
+        raise ValueError("each policy may only be listed once")
+    chunks = [list(seeds[i : i + chunk_size]) for i in range(0, len(seeds), chunk_size)]
+    outcomes: Dict[str, List[RunOutcome]] = {policy: [] for policy in policies}
+    if workers == 1:
+        for policy in policies:
+            for chunk in chunks:
+                outcomes[policy].extend(_play_chunk(policy, chunk, start_options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (policy, pool.submit(_play_chunk, policy, chunk, start_options))
+                for policy in policies
+                for chunk in chunks
+            ]
+            for policy, future in futures:
+                outcomes[policy].extend(future.result())
+    return {policy: PolicyResult(policy, sorted(results)) for policy, results in outcomes.items()}
+
+
+def _print_report(summaries: List[dict]) -> None:
+    print(f"{'policy':<16}{'runs':>6}{'win rate':>20}{'collapse':>10}{'mean score':>24}{'vs baseline':>24}")
+    for summary in summaries:
+        low, high = summary["win_rate_ci"]
+        score_low, score_high = summary["mean_score_ci"]
+        line = (
+            f"{summary['policy']:<16}{summary['runs']:>6}"
+            f"{summary['win_rate']:>8.1%} [{low:.1%}, {high:.1%}]"
+            f"{summary['rates']['collapsed']:>10.1%}"
+            f"{summary['mean_score']:>10.0f} [{score_low:.0f}, {score_high:.0f}]"
+        )
+        if "score_vs_baseline" in summary:
+            diff_low, diff_high = summary["score_vs_baseline_ci"]
+            line += f"{summary['score_vs_baseline']:>+10.0f} [{diff_low:+.0f}, {diff_high:+.0f}]"
+        print(line)
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare decision policies on common seeds.")
+    parser.add_argument("policies", nargs="+", help=f"built-ins ({', '.join(sorted(POLICIES))}) or module:function")
+    parser.add_argument("--seeds", type=_positive_int, default=200, help="number of seeds every policy plays")
+    parser.add_argument("--start-seed", type=int, default=1)
+    parser.add_argument("--workers", type=_positive_int, default=os.cpu_count(), help="processes (1 = in-process)")
+    parser.add_argument("--chunk-size", type=_positive_int, default=50)
+    parser.add_argument("--turn-limit", type=int, default=20)
+    parser.add_argument("--world-size", type=int, default=8)
+    parser.add_argument("--events-per-turn", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    if len(set(args.policies)) != len(args.policies):
+        parser.error("each policy may only be listed once")
+    for policy in args.policies:
+        resolve_policy(policy)  # fail fast on typos before spawning workers
+    results = run_tournament(
+        args.policies,
+        range(args.start_seed, args.start_seed + args.seeds),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        turn_limit=args.turn_limit,
+        world_size=args.world_size,
+        events_per_turn=args.events_per_turn,
+    )
+    baseline = results[args.policies[0]]
+    summaries = [result.summary(baseline) for result in results.values()]
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        _print_report(summaries)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,27 @@
+import asyncio
+import os
+import random
 import sys
+import tempfile
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 PROFILE_PATH = ROOT / "backend" / "player_profile.json"
 if PROFILE_PATH.exists():
     PROFILE_PATH.unlink()
+os.environ["LAZY_GOD_RUN_ARCHIVE_DIR"] = tempfile.mkdtemp(prefix="lazy_god_runs_")
 
 from fastapi.testclient import TestClient
 
-from backend.main import app
+from backend.loadtest import percentile, run_load_test
+from backend import main, run_archive, wire
+from backend.main import app, engine
+from backend.run_archive import RunArchive
+from core.game import GameEngine
 
 
 client = TestClient(app)
@@ -59,3 +70,295 @@ def test_next_and_decision_cycle():
     assert "state" in outcome
     assert "outcome_summary" in outcome
     assert "profile_summary" in outcome
+
+
+def test_multi_event_turn_batch_decision():
+    response = client.post("/runs/start", json={"world_size": 10, "events_per_turn": 3})
+    run_id = response.json()["run_id"]
+
+    next_resp = client.post(f"/runs/{run_id}/next", json={})
+    assert next_resp.status_code == 200
+    events = next_resp.json()["events"]
+    assert len(events) == 3
+
+    body = {"decisions": [{"event_id": event["id"], "choice": "trade"} for event in events]}
+    decision_resp = client.post(f"/runs/{run_id}/decisions", json=body)
+    assert decision_resp.status_code == 200
+    outcome = decision_resp.json()
+    assert len(outcome["resolved_events"]) == 3
+    assert all(event["resolved"] for event in outcome["resolved_events"])
+    assert outcome["state"]["turn"] == 2
+
+    # A window smaller than a turn archives most of the batch on resolution.
+    response = client.post(
+        "/runs/start", json={"endless": True, "event_window": 1, "events_per_turn": 3, "world_size": 10, "seed": 6}
+    )
+    run_id = response.json()["run_id"]
+    events = client.post(f"/runs/{run_id}/next", json={}).json()["events"]
+    body = {"decisions": [{"event_id": event["id"], "choice": "trade"} for event in events]}
+    outcome = client.post(f"/runs/{run_id}/decisions", json=body).json()
+    assert [event["id"] for event in outcome["resolved_events"]] == [event["id"] for event in events]
+    assert all(event["resolved"] for event in outcome["resolved_events"])
+
+
+def test_endless_run_archive_paging():
+    response = client.post("/runs/start", json={"endless": True, "event_window": 2, "seed": 5})
+    run_id = response.json()["run_id"]
+    for _ in range(5):
+        event = client.post(f"/runs/{run_id}/next", json={}).json()["event"]
+        client.post(f"/runs/{run_id}/decision", json={"event_id": event["id"], "choice": "trade"})
+
+    page = client.get(f"/runs/{run_id}/archive", params={"offset": 1, "limit": 2}).json()
+    assert page["total"] == 3
+    assert [event["turn"] for event in page["events"]] == [2, 3]
+    assert client.get("/runs/run_missing/archive").status_code == 404
+
+
+def test_finished_run_lands_on_leaderboard():
+    response = client.post("/runs/start", json={"turn_limit": 2, "seed": 77})
+    run_id = response.json()["run_id"]
+    for _ in range(2):
+        event = client.post(f"/runs/{run_id}/next", json={}).json()["event"]
+        outcome = client.post(f"/runs/{run_id}/decision", json={"event_id": event["id"], "choice": "peace"}).json()
+    assert outcome["state"]["run_status"] != "active"
+
+    board = client.get("/leaderboard").json()
+    assert board["total_runs"] >= 1
+    assert run_id in [entry["run_id"] for entry in board["entries"]]
+    by_seed = client.get("/leaderboard", params={"by": "seed", "seed": 77}).json()["entries"]
+    assert [entry["run_id"] for entry in by_seed] == [run_id]
+    assert by_seed[0]["turns"] == 2
+    today = client.get("/leaderboard", params={"by": "day"}).json()["entries"]
+    assert run_id in [entry["run_id"] for entry in today]
+    assert client.get("/leaderboard", params={"by": "seed"}).status_code == 400
+
+
+def test_archive_failures_never_undo_an_applied_decision(monkeypatch):
+    assert client.post("/runs/start", json={"seed": 2**64 + 5, "turn_limit": 3}).status_code == 422
+
+    def broken_append(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(main.RUN_ARCHIVE, "append", broken_append)
+    run_id = client.post("/runs/start", json={"seed": 2**63 - 1, "turn_limit": 1}).json()["run_id"]
+    event = client.post(f"/runs/{run_id}/next", json={}).json()["event"]
+    outcome = client.post(f"/runs/{run_id}/decision", json={"event_id": event["id"], "choice": "peace"})
+    assert outcome.status_code == 200
+    assert outcome.json()["state"]["run_status"] != "active"
+    assert outcome.json()["profile_summary"]
+
+
+def test_run_archive_queries_survive_reopen(tmp_path):
+    engine = GameEngine(seed=3)
+    archive = RunArchive(tmp_path)
+    for score in (40, 90, 10, 90):
+        state = engine.start_run(seed=score % 3)
+        state.score = score
+        state.run_status = "won"
+        archive.append(state, b"\x00\x01\x02" * 10, started_at=0.0, ended_at=86_400.0 * 2)
+
+    reopened = RunArchive(tmp_path)
+    assert len(reopened) == 4
+    assert [run.score for run in reopened.top_scores(3)] == [90, 90, 40]
+    assert [run.score for run in reopened.top_for_seed(0, 5)] == [90, 90]
+    assert [run.score for run in reopened.top_for_day(2)] == [90, 90, 40, 10]
+    assert reopened.top_for_day(3) == []
+    assert reopened.get(0, with_tape=True).decision_tape == b"\x00\x01\x02" * 10
+
+
+def test_run_archive_merges_seed_tails_and_reopens_from_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_archive, "TAIL_LIMIT", 4)
+    engine = GameEngine(seed=3)
+    archive = RunArchive(tmp_path)
+    rng = random.Random(7)
+    runs = []
+    for _ in range(23):
+        state = engine.start_run(seed=rng.randrange(4))
+        state.score = rng.randrange(50)
+        state.run_status = "won"
+        runs.append((state.seed, state.score, archive.append(state, b"", started_at=0.0, ended_at=0.0)))
+
+    def expected(seed):
+        return [score for _, _, score in sorted((-score, recno, score) for s, score, recno in runs if s == seed)]
+
+    reads = []
+    entry = RunArchive._entry
+    monkeypatch.setattr(RunArchive, "_entry", lambda self, recno: reads.append(recno) or entry(self, recno))
+    reopened = RunArchive(tmp_path)
+    # Only the entries appended after the last checkpoint are read back.
+    assert len(reads) <= 4
+    for candidate in (archive, reopened):
+        for seed in range(4):
+            assert [run.score for run in candidate.top_for_seed(seed, 50)] == expected(seed)
+        top = sorted((score for _, score, _ in runs), reverse=True)[:5]
+        assert [run.score for run in candidate.top_scores(5)] == top
+
+
+def test_state_etag_conditional_get():
+    run_id = client.post("/runs/start", json={}).json()["run_id"]
+    first = client.get(f"/runs/{run_id}/state")
+    etag = first.headers["etag"]
+    assert first.json()["state"]["version"] >= 0
+
+    cached = client.get(f"/runs/{run_id}/state", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    client.post(f"/runs/{run_id}/next", json={})
+    fresh = client.get(f"/runs/{run_id}/state", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+
+
+def test_state_field_projection_and_event_cursor_paging():
+    run_id = client.post("/runs/start", json={"endless": True, "event_window": 2}).json()["run_id"]
+    for _ in range(4):
+        event = client.post(f"/runs/{run_id}/next", json={}).json()["event"]
+        client.post(f"/runs/{run_id}/decision", json={"event_id": event["id"], "choice": "trade"})
+    client.post(f"/runs/{run_id}/next", json={})
+
+    slim = client.get(f"/runs/{run_id}/state", params={"fields": "stability,score"}).json()
+    assert list(slim["state"]) == ["stability", "score"]
+    assert slim["pending_event"]["turn"] == 5
+    assert client.get(f"/runs/{run_id}/state", params={"fields": "score,nope"}).status_code == 400
+
+    turns, cursor = [], 0
+    while cursor is not None:
+        page = client.get(f"/runs/{run_id}/events", params={"cursor": cursor, "limit": 2}).json()
+        turns.extend(event["turn"] for event in page["events"])
+        cursor = page["next_cursor"]
+    assert turns == [1, 2, 3, 4, 5]
+
+
+def test_load_test_harness_reports_latency_percentiles():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+
+    report = asyncio.run(run_load_test(players=4, runs=1, turn_limit=3, events_per_turn=2, world_size=6))
+    summary = report.summary()
+    assert summary["runs_finished"] == 4
+    assert summary["error_rate"] == 0.0
+    turns = summary["routes"]["POST /runs/{id}/decisions"]["count"]
+    assert 4 <= turns <= 12
+    assert summary["routes"]["POST /runs/{id}/next"]["count"] == turns
+    assert summary["routes"]["POST /runs/start"]["p99_ms"] >= summary["routes"]["POST /runs/start"]["p50_ms"]
+    assert summary["memory_mb"]
+
+
+def test_fork_run_endpoint_creates_independent_branch():
+    start = client.post("/runs/start", json={}).json()
+    run_id, session_id = start["run_id"], start["session_id"]
+    event = client.post(f"/runs/{run_id}/next", json={"session_id": session_id}).json()["event"]
+
+    fork = client.post(f"/runs/{run_id}/fork", json={}).json()
+    assert fork["parent_run_id"] == run_id
+    assert fork["pending_event"]["id"] == event["id"]
+    branch_id = fork["run_id"]
+
+    resolved = client.post(f"/runs/{branch_id}/decision", json={"event_id": event["id"], "choice": "hostile"})
+    assert resolved.status_code == 200
+    parent_state = client.get(f"/runs/{run_id}/state").json()
+    assert parent_state["pending_event"]["id"] == event["id"]
+    assert client.post("/runs/run_missing/fork", json={}).status_code == 404
+
+
+def test_fork_mid_turn_lists_every_pending_event():
+    run_id = client.post("/runs/start", json={"world_size": 10, "events_per_turn": 3}).json()["run_id"]
+    events = client.post(f"/runs/{run_id}/next", json={}).json()["events"]
+
+    fork = client.post(f"/runs/{run_id}/fork", json={}).json()
+    assert [event["id"] for event in fork["pending_events"]] == [event["id"] for event in events]
+    assert fork["pending_event"]["id"] == events[-1]["id"]
+    body = {"decisions": [{"event_id": event["id"], "choice": "peace"} for event in fork["pending_events"]]}
+    assert client.post(f"/runs/{fork['run_id']}/decisions", json=body).status_code == 200
+    assert client.get(f"/runs/{fork['run_id']}/state").json()["pending_events"] == []
+
+    packed = client.get(f"/runs/{run_id}/state", headers={"accept": wire.MEDIA_TYPE})
+    assert len(wire.decode(packed.content)["pending_events"]) == 3
+
+
+def test_admin_memory_report_and_tracemalloc_diff(monkeypatch):
+    run_id = client.post("/runs/start", json={"seed": 41}).json()["run_id"]
+    client.post(f"/runs/{run_id}/next")
+
+    # Hidden unless an admin token is configured, and then only for its holder.
+    assert client.get("/admin/memory").status_code == 404
+    monkeypatch.setenv("LAZY_GOD_ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/memory").status_code == 403
+    assert client.get("/admin/memory", headers={"X-Admin-Token": "guess"}).status_code == 403
+    admin = {"X-Admin-Token": "s3cret"}
+
+    usage = client.get(f"/admin/memory/runs/{run_id}", headers=admin).json()
+    assert usage["run_id"] == run_id
+    assert usage["nations"] > 0 and usage["events_log"] > 0 and usage["history"] > 0
+    assert usage["total"] == sum(usage[key] for key in ("nations", "events_log", "history", "quips", "other"))
+    assert client.get("/admin/memory/runs/missing", headers=admin).status_code == 404
+
+    report = client.get("/admin/memory", params={"top": 3}, headers=admin).json()
+    assert report["runs"] >= 1 and report["sessions"] >= 1
+    assert len(report["top_runs"]) <= 3
+    assert report["top_runs"][0]["total"] >= report["top_runs"][-1]["total"]
+
+    assert client.post("/admin/tracemalloc", json={"action": "snapshot"}, headers=admin).status_code == 409
+    assert client.post("/admin/tracemalloc", json={"action": "start"}, headers=admin).json()["tracing"] is True
+    try:
+        client.post("/runs/start", json={"seed": 42})
+        diff = client.post("/admin/tracemalloc", json={"action": "snapshot", "top": 5}, headers=admin).json()["diff"]
+        assert 0 < len(diff) <= 5
+        assert {"location", "size_diff", "count_diff"} <= set(diff[0])
+    finally:
+        assert client.post("/admin/tracemalloc", json={"action": "stop"}, headers=admin).json()["tracing"] is False
+
+
+def test_snapshots_are_not_exposed_over_http():
+    # Snapshots carry archive paths and raw scores, so restore stays engine-only.
+    run_id = client.post("/runs/start", json={}).json()["run_id"]
+    assert client.get(f"/runs/{run_id}/snapshot").status_code in (404, 405)
+    snapshot, _ = engine.snapshot_run(run_id)
+    assert client.post("/runs/restore", json={"snapshot": snapshot}).status_code in (404, 405)
+
+
+def test_binary_responses_are_negotiated_and_decode_to_the_json_payload():
+    binary = {"accept": wire.MEDIA_TYPE}
+    start = client.post("/runs/start", json={"world_size": 16, "seed": 9}, headers=binary)
+    assert start.headers["content-type"] == wire.MEDIA_TYPE
+    run_id = wire.decode(start.content)["run_id"]
+    for choice in ("peace", "hostile", "trade"):
+        event = wire.decode(client.post(f"/runs/{run_id}/next", json={}, headers=binary).content)["event"]
+        assert event["kind"] in wire.ENUMS["event_kind"]
+        resolved = client.post(f"/runs/{run_id}/decision", json={"event_id": event["id"], "choice": choice}, headers=binary)
+        assert wire.decode(resolved.content)["resolved_event"]["resolution"]["chosen_key"] == choice
+
+    as_json = client.get(f"/runs/{run_id}/state")
+    packed = client.get(f"/runs/{run_id}/state", headers=binary)
+    assert packed.headers["vary"] == "Accept" and packed.headers["etag"] != as_json.headers["etag"]
+    assert wire.decode(packed.content) == as_json.json()
+    assert len(packed.content) < len(as_json.content) / 2
+
+    nation_ids = list(as_json.json()["state"]["nations"])
+    projected = client.get(f"/runs/{run_id}/state?fields=blocs,events_log", headers=binary)
+    assert wire.decode(projected.content, nation_ids) == client.get(f"/runs/{run_id}/state?fields=blocs,events_log").json()
+
+    prefers_json = {"accept": f"application/json, {wire.MEDIA_TYPE};q=0.5"}
+    assert client.get(f"/runs/{run_id}/state", headers=prefers_json).headers["content-type"] == "application/json"
+    assert client.get(f"/runs/{run_id}/state", headers={"accept": "*/*"}).headers["content-type"] == "application/json"
+    for path in ("state", "events", "archive"):
+        for headers in ({}, binary):
+            assert client.get(f"/runs/{run_id}/{path}", headers=headers).headers["vary"] == "Accept"
+
+
+def test_messagepack_codec_uses_the_smallest_encodings():
+    def pack(obj):
+        out = bytearray()
+        wire._pack_into(out, obj)
+        return bytes(out)
+
+    assert pack({"a": [1, -1, 200, -200, 70000]}) == bytes.fromhex("81a1619501ffccc8d1ff38ce00011170")
+    assert pack("x" * 40)[:2] == bytes.fromhex("d928") and pack(0.5) == bytes.fromhex("cb3fe0000000000000")
+    value = {"nested": [None, True, False, "é", 2**40, -(2**40), [[]] * 20, {str(i): i for i in range(20)}]}
+    packed = pack(value)
+    assert wire._unpack_from(packed + b"\xc0", 0) == (value, len(packed))
+    assert wire.unpackb(wire.packb(value)) == value
+    with pytest.raises(ValueError):
+        wire.unpackb(packed + b"\xc0")